@@ -1 +1,4 @@
+from statefarm.modeling.scorer import Scorer
+
+__all__ = ["Scorer"]
 __version__ = "0.0.1"
@@ -0,0 +1,160 @@
+__all__ = ["AdmissionController", "AdmissionRejected"]
+
+import asyncio
+import collections
+from contextlib import asynccontextmanager
+
+from prometheus_client import Counter, Gauge
+
+
+admission_rejections_counter = Counter(
+    "admission_rejections",
+    "Requests rejected by admission control",
+    ["lane", "reason"],
+)
+admission_queue_depth_gauge = Gauge(
+    "admission_queue_depth", "Requests waiting for admission", ["lane"]
+)
+admission_inflight_rows_gauge = Gauge(
+    "admission_inflight_rows", "Rows currently admitted for scoring", ["lane"]
+)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted; ``reason`` is ``queue_full`` or ``timeout``."""
+
+    def __init__(self, reason, retry_after):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Caps the number of rows being scored at once and bounds the queue of waiting requests.
+
+    A request costs as many rows as it scores (at most ``max_inflight_rows``, so a single oversized
+    batch can still run alone). Requests that do not fit wait in FIFO order; when the queue is full
+    or the wait exceeds ``queue_timeout`` they are rejected with ``AdmissionRejected``. All methods
+    must be called from the event loop thread.
+
+    Attributes:
+        name (str): Label of the metrics reported by this controller.
+        max_inflight_rows (int): Maximum rows admitted at the same time.
+        max_queue (int): Maximum number of requests waiting for admission.
+        queue_timeout (float): Seconds a request may wait before it is rejected.
+        retry_after (int): Seconds suggested to rejected clients through ``Retry-After``.
+        inflight_rows (int): Rows currently admitted.
+    """
+
+    def __init__(
+        self, max_inflight_rows, max_queue, queue_timeout, retry_after, name="default"
+    ):
+        self.name = name
+        self.max_inflight_rows = max_inflight_rows
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.inflight_rows = 0
+        self._waiters = collections.deque()
+
+    @property
+    def queue_depth(self):
+        """Number of requests waiting for admission."""
+        return len(self._waiters)
+
+    def queue_full(self):
+        """Whether a request that cannot be admitted immediately would be rejected."""
+        return len(self._waiters) >= self.max_queue
+
+    def record_rejection(self, reason):
+        """Counts a rejection made outside ``acquire``, e.g. by a load-shedding middleware."""
+        admission_rejections_counter.labels(lane=self.name, reason=reason).inc()
+
+    def _reject(self, reason):
+        self.record_rejection(reason)
+        raise AdmissionRejected(reason, self.retry_after)
+
+    def _admit(self, cost):
+        self.inflight_rows += cost
+        admission_inflight_rows_gauge.labels(lane=self.name).set(self.inflight_rows)
+
+    def _wake(self):
+        while self._waiters:
+            cost, future = self._waiters[0]
+            if future.done():
+                self._waiters.popleft()
+                continue
+            if self.inflight_rows + cost > self.max_inflight_rows:
+                break
+            self._waiters.popleft()
+            self._admit(cost)
+            future.set_result(None)
+        admission_queue_depth_gauge.labels(lane=self.name).set(len(self._waiters))
+
+    async def acquire(self, rows, timeout=None):
+        """
+        Waits until ``rows`` can be admitted.
+
+        Args:
+            rows (int): Number of rows the request scores.
+            timeout (float, optional): Shorter wait than ``queue_timeout`` for this request.
+
+        Returns:
+            int: The admitted cost, to be passed to ``release``.
+
+        Raises:
+            AdmissionRejected: If the queue is full or the wait times out.
+        """
+        cost = max(1, min(rows, self.max_inflight_rows))
+        if not self._waiters and self.inflight_rows + cost <= self.max_inflight_rows:
+            self._admit(cost)
+            return cost
+        if self.queue_full():
+            self._reject("queue_full")
+
+        entry = (cost, asyncio.get_running_loop().create_future())
+        self._waiters.append(entry)
+        admission_queue_depth_gauge.labels(lane=self.name).set(len(self._waiters))
+        try:
+            wait = (
+                self.queue_timeout
+                if timeout is None
+                else min(timeout, self.queue_timeout)
+            )
+            await asyncio.wait_for(entry[1], max(wait, 0))
+        except asyncio.TimeoutError:
+            self._discard(entry)
+            self._reject("timeout")
+        except asyncio.CancelledError:
+            # The client went away: give back capacity if it was granted meanwhile.
+            if entry[1].done() and not entry[1].cancelled():
+                self.release(cost)
+            self._discard(entry)
+            raise
+        return cost
+
+    def _discard(self, entry):
+        if entry in self._waiters:
+            self._waiters.remove(entry)
+        self._wake()
+
+    def release(self, cost):
+        """
+        Returns admitted rows and admits waiting requests that now fit.
+
+        Args:
+            cost (int): The value returned by ``acquire``.
+        """
+        self.inflight_rows -= cost
+        admission_inflight_rows_gauge.labels(lane=self.name).set(self.inflight_rows)
+        self._wake()
+
+    @asynccontextmanager
+    async def admit(self, rows, timeout=None):
+        """Async context manager holding ``rows`` of capacity for the duration of the block."""
+        cost = await self.acquire(rows, timeout)
+        try:
+            yield
+        finally:
+            self.release(cost)
@@ -0,0 +1,249 @@
+__all__ = ["CompressionMiddleware", "negotiate_encoding"]
+
+import json
+import zlib
+
+from anyio import to_thread
+from fastapi import HTTPException
+from prometheus_client import Counter
+from starlette.datastructures import Headers, MutableHeaders
+
+
+body_bytes_counter = Counter(
+    "body_compression_bytes",
+    "Bytes of compressible bodies before and after compression",
+    ["direction", "form"],
+)
+
+# zlib window bits of each supported encoding: gzip header or zlib header ("deflate").
+WBITS = {"gzip": 16 + zlib.MAX_WBITS, "deflate": zlib.MAX_WBITS}
+# Decompressed request bytes handed to the application per message.
+INFLATE_CHUNK_BYTES = 1 << 20
+# Chunks at least this large are (de)compressed on a worker thread, off the event loop.
+OFFLOAD_BYTES = 256 << 10
+
+
+def negotiate_encoding(accept_encoding):
+    """
+    Picks the response encoding from an ``Accept-Encoding`` header.
+
+    Args:
+        accept_encoding (str): The header value, e.g. ``"gzip, deflate;q=0.5"``.
+
+    Returns:
+        str or None: ``gzip`` or ``deflate``, whichever the client weights higher (gzip on a
+        tie), or None when it accepts neither.
+    """
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name.strip().lower()] = weight
+    best = None
+    for encoding in WBITS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > 0 and (best is None or weight > best[1]):
+            best = encoding, weight
+    return best[0] if best else None
+
+
+async def _run(func, data):
+    """Runs ``func(data)``, on a worker thread when ``data`` is large (zlib releases the GIL)."""
+    if len(data) >= OFFLOAD_BYTES:
+        return await to_thread.run_sync(func, data)
+    return func(data)
+
+
+class _InflatingReceive:
+    """
+    ``receive`` that decompresses a request body as it arrives.
+
+    Each compressed message is inflated in steps of at most ``INFLATE_CHUNK_BYTES``, so memory
+    held here is bounded by one compressed message plus one decompressed chunk, whatever the
+    compression ratio.
+    """
+
+    def __init__(self, receive, encoding, max_bytes):
+        self.receive = receive
+        self.encoding = encoding
+        self.max_bytes = max_bytes
+        self.decompressor = zlib.decompressobj(WBITS[encoding])
+        self.pending = b""
+        self.more_body = True
+        self.finished = False
+        self.total = 0
+
+    def _inflate(self, data):
+        try:
+            chunk = self.decompressor.decompress(data, INFLATE_CHUNK_BYTES)
+        except zlib.error as e:
+            raise HTTPException(
+                status_code=400, detail=f"Invalid {self.encoding} body: {e}"
+            )
+        self.pending = self.decompressor.unconsumed_tail
+        # Concatenated gzip members decompress into one body.
+        if self.decompressor.eof and self.decompressor.unused_data:
+            self.pending = self.decompressor.unused_data
+            self.decompressor = zlib.decompressobj(WBITS[self.encoding])
+        return chunk
+
+    async def __call__(self):
+        if self.finished:
+            # Only http.disconnect is left to receive.
+            return await self.receive()
+        while self.pending or self.more_body:
+            if self.pending:
+                chunk = await _run(self._inflate, self.pending)
+            else:
+                message = await self.receive()
+                if message["type"] != "http.request":
+                    return message
+                self.more_body = message.get("more_body", False)
+                body = message.get("body", b"")
+                body_bytes_counter.labels("request", "compressed").inc(len(body))
+                chunk = await _run(self._inflate, body)
+            self.total += len(chunk)
+            if self.total > self.max_bytes:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Decompressed body exceeds {self.max_bytes} bytes",
+                )
+            if chunk:
+                body_bytes_counter.labels("request", "uncompressed").inc(len(chunk))
+                return {"type": "http.request", "body": chunk, "more_body": True}
+        if not self.decompressor.eof:
+            raise HTTPException(
+                status_code=400, detail=f"Truncated {self.encoding} body"
+            )
+        self.finished = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+
+class _DeflatingSend:
+    """
+    ``send`` that compresses a response body chunk by chunk.
+
+    A complete body smaller than ``min_bytes`` is sent as is, as is a body that already has a
+    ``Content-Encoding``. Streaming bodies are compressed as they are produced.
+    """
+
+    def __init__(self, send, encoding, level, min_bytes):
+        self.send = send
+        self.encoding = encoding
+        self.level = level
+        self.min_bytes = min_bytes
+        self.start = None
+        self.compressor = None
+        self.passthrough = False
+
+    def _deflate(self, body, final):
+        data = self.compressor.compress(body)
+        return data + self.compressor.flush() if final else data
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+        body = message.get("body", b"")
+        final = not message.get("more_body", False)
+        if self.start is not None:
+            start, self.start = self.start, None
+            headers = MutableHeaders(scope=start)
+            if "content-encoding" in headers or (final and len(body) < self.min_bytes):
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+            self.compressor = zlib.compressobj(
+                self.level, zlib.DEFLATED, WBITS[self.encoding]
+            )
+            data = await _run(lambda chunk: self._deflate(chunk, final), body)
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if final:
+                headers["Content-Length"] = str(len(data))
+            elif "content-length" in headers:
+                del headers["Content-Length"]
+            await self.send(start)
+        else:
+            data = await _run(lambda chunk: self._deflate(chunk, final), body)
+        body_bytes_counter.labels("response", "uncompressed").inc(len(body))
+        body_bytes_counter.labels("response", "compressed").inc(len(data))
+        await self.send(
+            {"type": "http.response.body", "body": data, "more_body": not final}
+        )
+
+
+class CompressionMiddleware:
+    """
+    gzip and deflate request and response bodies on the bulk endpoints.
+
+    Request bodies sent with ``Content-Encoding: gzip`` or ``deflate`` are decompressed
+    incrementally as they are received, and the application sees the plain body. Responses are
+    compressed with the encoding the client prefers in ``Accept-Encoding``, unless the whole body
+    is smaller than ``min_bytes``. Other paths pass through untouched.
+
+    Attributes:
+        app: The wrapped ASGI application.
+        paths (tuple of str): Path prefixes whose bodies may be compressed.
+        level (int): zlib compression level of responses.
+        min_bytes (int): Smallest complete response body worth compressing.
+        max_bytes (int): Largest decompressed request body accepted; larger ones get ``413``.
+    """
+
+    def __init__(self, app, paths, level=6, min_bytes=1024, max_bytes=256 << 20):
+        self.app = app
+        self.paths = tuple(paths)
+        self.level = level
+        self.min_bytes = min_bytes
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.paths):
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        content_encoding = headers.get("content-encoding", "identity").strip().lower()
+        if content_encoding in WBITS:
+            receive = _InflatingReceive(receive, content_encoding, self.max_bytes)
+            # The application sees a plain body of unknown length.
+            scope = dict(scope)
+            scope["headers"] = [
+                (key, value)
+                for key, value in scope["headers"]
+                if key not in (b"content-encoding", b"content-length")
+            ]
+        elif content_encoding != "identity":
+            await self._unsupported(content_encoding, send)
+            return
+        encoding = negotiate_encoding(headers.get("accept-encoding", ""))
+        if encoding is not None:
+            send = _DeflatingSend(send, encoding, self.level, self.min_bytes)
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    async def _unsupported(content_encoding, send):
+        body = json.dumps(
+            {"detail": f"Unsupported Content-Encoding {content_encoding}"}
+        ).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 415,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
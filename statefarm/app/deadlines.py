@@ -0,0 +1,81 @@
+__all__ = [
+    "DeadlineExceeded",
+    "check_deadline",
+    "deadline_passed",
+    "earliest_deadline",
+    "expire",
+    "time_left",
+]
+
+import time
+
+from prometheus_client import Counter
+
+
+deadline_expired_counter = Counter(
+    "deadline_expired",
+    "Requests dropped because their deadline passed",
+    ["stage"],
+)
+deadline_rows_skipped_counter = Counter(
+    "deadline_rows_skipped", "Rows not scored because their deadline passed"
+)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request's deadline passes before its work is done."""
+
+    def __init__(self, stage, rows_skipped):
+        super().__init__(f"Deadline exceeded ({stage})")
+        self.stage = stage
+        self.rows_skipped = rows_skipped
+
+
+def earliest_deadline(*deadlines):
+    """
+    Combines the deadlines a caller may send (header and body) into the earliest one.
+
+    Args:
+        *deadlines (float or None): Absolute UNIX timestamps in seconds.
+
+    Returns:
+        float or None: The earliest deadline, or None when no deadline was given.
+    """
+    given = [deadline for deadline in deadlines if deadline is not None]
+    return min(given) if given else None
+
+
+def time_left(deadline):
+    """Seconds until ``deadline`` (None for no deadline)."""
+    return None if deadline is None else deadline - time.time()
+
+
+def deadline_passed(deadline):
+    """Whether ``deadline`` (None for no deadline) has passed."""
+    return deadline is not None and time.time() >= deadline
+
+
+def expire(stage, rows):
+    """
+    Counts an expired request and raises ``DeadlineExceeded``.
+
+    Args:
+        stage (str): Where the request expired, ``queue`` or ``chunk``.
+        rows (int): Rows that will not be scored because the request is dropped.
+    """
+    deadline_expired_counter.labels(stage=stage).inc()
+    deadline_rows_skipped_counter.inc(rows)
+    raise DeadlineExceeded(stage, rows)
+
+
+def check_deadline(deadline, stage, rows):
+    """
+    Raises ``DeadlineExceeded`` if ``deadline`` has passed, counting the rows that are skipped.
+
+    Args:
+        deadline (float or None): Absolute UNIX timestamp in seconds.
+        stage (str): Where the check happens, ``queue`` or ``chunk``.
+        rows (int): Rows that will not be scored if the request is dropped now.
+    """
+    if deadline_passed(deadline):
+        expire(stage, rows)
@@ -0,0 +1,355 @@
+__all__ = [
+    "DriftMonitor",
+    "build_profile",
+    "expose_drift",
+    "ks_statistic",
+    "load_profile",
+    "population_stability_index",
+    "save_profile",
+]
+
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+from prometheus_client import Gauge
+
+
+drift_psi_gauge = Gauge(
+    "drift_psi",
+    "Population stability index of live traffic versus the training profile",
+    ["feature"],
+)
+drift_ks_gauge = Gauge(
+    "drift_ks",
+    "Largest CDF gap (binned Kolmogorov-Smirnov) of live traffic versus the training profile",
+    ["feature"],
+)
+drift_score_quantile_gauge = Gauge(
+    "drift_score_quantile", "Quantiles of recent phats", ["quantile"]
+)
+drift_rows_gauge = Gauge(
+    "drift_rows", "Decayed number of rows in the live drift sketches"
+)
+
+PROFILE_VERSION = 1
+SCORE_FEATURE = "phat"
+# Interior edges of the score sketch: 20 equal-width bins over [0, 1].
+SCORE_EDGES = np.linspace(0, 1, 21)[1:-1]
+PSI_FLOOR = 1e-4
+
+
+def population_stability_index(expected, actual):
+    """
+    PSI of two count vectors over the same buckets; 0.1 is commonly read as a shift and 0.25 as
+    a major one.
+
+    Returns:
+        float: The index, NaN when either vector is empty.
+    """
+    expected, actual = np.asarray(expected, float), np.asarray(actual, float)
+    if expected.sum() <= 0 or actual.sum() <= 0:
+        return np.nan
+    e = np.maximum(expected / expected.sum(), PSI_FLOOR)
+    a = np.maximum(actual / actual.sum(), PSI_FLOOR)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+def ks_statistic(expected, actual):
+    """
+    Largest gap between the cumulative distributions of two count vectors over ordered buckets.
+
+    Returns:
+        float: The statistic, NaN when either vector is empty.
+    """
+    expected, actual = np.asarray(expected, float), np.asarray(actual, float)
+    if expected.sum() <= 0 or actual.sum() <= 0:
+        return np.nan
+    gap = np.cumsum(expected) / expected.sum() - np.cumsum(actual) / actual.sum()
+    return float(np.abs(gap).max())
+
+
+def _bin(values, edges):
+    """Bucket of each value: ``len(edges) + 1`` value buckets, then one for missing."""
+    buckets = np.searchsorted(edges, values, side="right")
+    buckets[np.isnan(values)] = len(edges) + 1
+    return buckets
+
+
+def build_profile(frame, numeric_columns, categorical_columns, phat, bins=10):
+    """
+    Summarises the training distribution that live traffic is compared with.
+
+    Numeric columns get ``bins`` buckets at their quantiles plus a missing bucket, categorical
+    columns their category counts plus a missing count, and the scores a fixed 20-bucket
+    histogram.
+
+    Args:
+        frame (pandas.DataFrame): Training inputs, with ``x12``/``x63``-style strings already
+            converted to numbers.
+        numeric_columns (list of str): Columns profiled by quantile buckets.
+        categorical_columns (list of str): Columns profiled by category counts.
+        phat (numpy.ndarray): Model scores of the rows.
+        bins (int): Quantile buckets per numeric column.
+
+    Returns:
+        dict: A JSON-serialisable profile.
+    """
+    profile = {"version": PROFILE_VERSION, "rows": len(frame)}
+    profile["numeric"] = {}
+    for column in numeric_columns:
+        values = frame[column].to_numpy(dtype=np.float64)
+        present = values[~np.isnan(values)]
+        edges = np.array([])
+        if len(present):
+            edges = np.unique(np.quantile(present, np.linspace(0, 1, bins + 1)[1:-1]))
+        counts = np.bincount(_bin(values, edges), minlength=len(edges) + 2)
+        profile["numeric"][column] = {
+            "edges": edges.tolist(),
+            "counts": counts.tolist(),
+        }
+    profile["categorical"] = {}
+    for column in categorical_columns:
+        values = pd.Series(frame[column]).astype(object)
+        counts = values.value_counts(dropna=True).sort_index()
+        profile["categorical"][column] = {
+            "categories": [str(category) for category in counts.index],
+            # Known categories, unseen categories, missing.
+            "counts": counts.tolist() + [0, int(values.isna().sum())],
+        }
+    profile["score"] = {
+        "edges": SCORE_EDGES.tolist(),
+        "counts": np.bincount(
+            _bin(np.asarray(phat, dtype=np.float64), SCORE_EDGES),
+            minlength=len(SCORE_EDGES) + 2,
+        ).tolist(),
+    }
+    return profile
+
+
+def save_profile(profile, path):
+    """Writes a profile as JSON."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as handle:
+        json.dump(profile, handle)
+
+
+def load_profile(path):
+    """Reads a profile written by ``save_profile``."""
+    with open(path) as handle:
+        return json.load(handle)
+
+
+class DriftMonitor:
+    """
+    Constant-memory sketches of live inputs and scores, compared with a training profile.
+
+    Every sketch uses the buckets of the profile: numeric columns are counted in the profile's
+    quantile buckets, categorical columns per known category (plus unseen and missing), and
+    scores in the fixed score buckets. A batch updates all numeric columns at once with one
+    comparison against a padded edge matrix and one ``bincount``, so the cost per row is constant
+    and memory does not grow with traffic. Counts are halved every ``decay_rows`` rows, so the
+    sketches follow recent traffic.
+
+    Attributes:
+        profile (dict): The reference profile from ``build_profile``.
+        decay_rows (float): Rows between halvings of the live counts.
+        rows (float): Decayed number of rows observed.
+    """
+
+    def __init__(self, profile, decay_rows=50000):
+        self.profile = profile
+        self.decay_rows = decay_rows
+        self.rows = 0.0
+        self._since_decay = 0.0
+        self._lock = threading.Lock()
+
+        self.numeric_columns = list(profile["numeric"])
+        edges = [profile["numeric"][column]["edges"] for column in self.numeric_columns]
+        width = max((len(column) for column in edges), default=0)
+        self._edges = np.full((len(edges), width), np.inf)
+        for row, column in zip(self._edges, edges):
+            count = len(column)
+            row[:count] = column
+        self._edge_counts = np.array([len(column) for column in edges])
+        # Buckets of column j start at offset j * (width + 2) of the flat count vector.
+        self._stride = width + 2
+        self._numeric = np.zeros(len(edges) * self._stride)
+
+        self.categorical_columns = list(profile["categorical"])
+        self._categories = {
+            column: {
+                category: code
+                for code, category in enumerate(
+                    profile["categorical"][column]["categories"]
+                )
+            }
+            for column in self.categorical_columns
+        }
+        self._categorical = {
+            column: np.zeros(len(self._categories[column]) + 2)
+            for column in self.categorical_columns
+        }
+        self._score = np.zeros(len(SCORE_EDGES) + 2)
+
+    def _numeric_buckets(self, frame):
+        values = frame[self.numeric_columns].to_numpy(np.float64, na_value=np.nan)
+        buckets = (values[:, :, None] >= self._edges[None, :, :]).sum(axis=2)
+        # +inf passes the padding too; keep it in the column's top bucket.
+        buckets = np.minimum(buckets, self._edge_counts)
+        missing = np.isnan(values)
+        buckets[missing] = (self._edge_counts + 1)[np.nonzero(missing)[1]]
+        return buckets + np.arange(len(self.numeric_columns)) * self._stride
+
+    def observe(self, frame, phat, weights=None):
+        """
+        Adds a batch of scored rows to the sketches.
+
+        Args:
+            frame (pandas.DataFrame): The rows' inputs, converted to numbers where the
+                preprocessor converts them; columns outside the profile are ignored.
+            phat (numpy.ndarray): The rows' scores.
+            weights (numpy.ndarray, optional): How many requests each row stands for, e.g.
+                duplicates that were scored once.
+        """
+        rows = len(phat)
+        if not rows:
+            return
+        weights = np.ones(rows) if weights is None else np.asarray(weights, float)
+        numeric = None
+        if self.numeric_columns:
+            buckets = self._numeric_buckets(frame)
+            numeric = np.bincount(
+                buckets.ravel(),
+                weights=np.repeat(weights, len(self.numeric_columns)),
+                minlength=len(self._numeric),
+            )
+        categorical = {}
+        for column, categories in self._categories.items():
+            # A dict lookup per value is cheaper than building a hash table per batch.
+            values = frame[column].to_numpy(dtype=object)
+            unseen = len(categories)
+            codes = np.fromiter(
+                (categories.get(value, unseen) for value in values), np.intp, rows
+            )
+            codes[pd.isna(values)] = unseen + 1
+            categorical[column] = np.bincount(
+                codes, weights=weights, minlength=len(categories) + 2
+            )
+        score = np.bincount(
+            _bin(np.asarray(phat, dtype=np.float64), SCORE_EDGES),
+            weights=weights,
+            minlength=len(self._score),
+        )
+
+        with self._lock:
+            if numeric is not None:
+                self._numeric += numeric
+            for column, counts in categorical.items():
+                self._categorical[column] += counts
+            self._score += score
+            self.rows += weights.sum()
+            self._since_decay += weights.sum()
+            if self._since_decay >= self.decay_rows:
+                self._decay()
+
+    def _decay(self):
+        self._numeric *= 0.5
+        for counts in self._categorical.values():
+            counts *= 0.5
+        self._score *= 0.5
+        self.rows *= 0.5
+        self._since_decay = 0.0
+
+    def counts(self, feature):
+        """
+        Live and reference counts of a feature's buckets.
+
+        Args:
+            feature (str): A profiled column, or ``phat`` for the scores.
+
+        Returns:
+            tuple: Live counts and reference counts, as arrays over the same buckets.
+        """
+        if feature == SCORE_FEATURE:
+            return self._score.copy(), np.asarray(self.profile["score"]["counts"])
+        if feature in self._categorical:
+            reference = self.profile["categorical"][feature]["counts"]
+            return self._categorical[feature].copy(), np.asarray(reference)
+        j = self.numeric_columns.index(feature)
+        n = self._edge_counts[j]
+        start = j * self._stride
+        stop = start + n + 2
+        live = self._numeric[start:stop]
+        return live.copy(), np.asarray(self.profile["numeric"][feature]["counts"])
+
+    def psi(self, feature):
+        """Population stability index of a feature's live counts versus the profile."""
+        return population_stability_index(*self.counts(feature)[::-1])
+
+    def ks(self, feature):
+        """Binned KS statistic of a numeric feature or the scores (missing values excluded)."""
+        live, reference = self.counts(feature)
+        return ks_statistic(reference[:-1], live[:-1])
+
+    def score_quantile(self, q):
+        """
+        Approximate quantile of recent phats, interpolated within the score buckets.
+
+        Returns:
+            float: The quantile, NaN before any row was observed.
+        """
+        counts = self._score[:-1]
+        if counts.sum() <= 0:
+            return np.nan
+        cumulative = np.cumsum(counts) / counts.sum()
+        bucket = int(np.searchsorted(cumulative, q))
+        edges = np.concatenate([[0.0], SCORE_EDGES, [1.0]])
+        below = cumulative[bucket - 1] if bucket else 0.0
+        share = (q - below) / max(cumulative[bucket] - below, 1e-12)
+        return float(edges[bucket] + share * (edges[bucket + 1] - edges[bucket]))
+
+    def report(self):
+        """
+        PSI and KS of every profiled feature.
+
+        Returns:
+            pandas.DataFrame: ``psi`` and ``ks`` (NaN for categorical columns) per feature.
+        """
+        features = self.numeric_columns + self.categorical_columns + [SCORE_FEATURE]
+        return pd.DataFrame(
+            {
+                "psi": [self.psi(feature) for feature in features],
+                "ks": [
+                    np.nan if feature in self._categorical else self.ks(feature)
+                    for feature in features
+                ],
+            },
+            index=pd.Index(features, name="feature"),
+        )
+
+
+def expose_drift(monitor, quantiles=(0.1, 0.5, 0.9)):
+    """
+    Publishes a monitor's drift on ``/metrics``: ``drift_psi`` and ``drift_ks`` per feature,
+    ``drift_score_quantile`` and ``drift_rows``. Values are computed when metrics are scraped,
+    never in the scoring path.
+    """
+    features = monitor.numeric_columns + monitor.categorical_columns
+    for feature in features + [SCORE_FEATURE]:
+        drift_psi_gauge.labels(feature=feature).set_function(
+            lambda feature=feature: monitor.psi(feature)
+        )
+    for feature in monitor.numeric_columns + [SCORE_FEATURE]:
+        drift_ks_gauge.labels(feature=feature).set_function(
+            lambda feature=feature: monitor.ks(feature)
+        )
+    for q in quantiles:
+        drift_score_quantile_gauge.labels(quantile=str(q)).set_function(
+            lambda q=q: monitor.score_quantile(q)
+        )
+    drift_rows_gauge.set_function(lambda: monitor.rows)
@@ -0,0 +1,266 @@
+__all__ = ["Job", "JobManager", "JobQueueFull"]
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from prometheus_client import Counter, Gauge
+
+
+logger = logging.getLogger("fastapi")
+
+jobs_counter = Counter("scoring_jobs", "Scoring jobs by final status", ["status"])
+jobs_active_gauge = Gauge("scoring_jobs_active", "Scoring jobs queued or running")
+job_rows_counter = Counter("scoring_job_rows", "Rows scored by background jobs")
+
+
+class JobQueueFull(Exception):
+    """Raised when too many jobs are already queued or running."""
+
+
+class Job:
+    """
+    A background scoring job and its progress.
+
+    Results are spilled to ``<directory>/part-<page>.npy`` (one float64 phat array per chunk)
+    and the job's status is mirrored to ``<directory>/status.json`` after every chunk.
+
+    Attributes:
+        job_id (str): Identifier returned to the client.
+        directory (str): Where the job's status and result parts are written.
+        source (str): ``inline`` or the path of the scored CSV file.
+        status (str): ``queued``, ``running``, ``completed``, ``failed`` or ``cancelled``.
+        rows_done (int): Rows scored so far.
+        rows_total (int or None): Rows to score, when known up front.
+        pages (int): Result parts written so far.
+        error (str or None): Failure reason.
+    """
+
+    def __init__(self, job_id, directory, source, rows_total=None):
+        self.job_id = job_id
+        self.directory = directory
+        self.source = source
+        self.status = "queued"
+        self.rows_done = 0
+        self.rows_total = rows_total
+        self.pages = 0
+        self.error = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.cancelled = threading.Event()
+
+    def to_dict(self):
+        """Returns the job's status and progress as a JSON-serialisable dict."""
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "source": self.source,
+            "rows_done": self.rows_done,
+            "rows_total": self.rows_total,
+            "pages": self.pages,
+            "error": self.error,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+    def part_path(self, page):
+        return os.path.join(self.directory, f"part-{page:05d}.npy")
+
+    def save(self):
+        """Atomically writes ``status.json``."""
+        self.updated_at = time.time()
+        path = os.path.join(self.directory, "status.json")
+        with open(f"{path}.tmp", "w") as handle:
+            json.dump(self.to_dict(), handle)
+        os.replace(f"{path}.tmp", path)
+
+    @classmethod
+    def load(cls, directory):
+        """Restores a job from its ``status.json``."""
+        with open(os.path.join(directory, "status.json")) as handle:
+            state = json.load(handle)
+        job = cls(state["job_id"], directory, state["source"], state["rows_total"])
+        for key in (
+            "status",
+            "rows_done",
+            "pages",
+            "error",
+            "created_at",
+            "updated_at",
+        ):
+            setattr(job, key, state[key])
+        return job
+
+
+class JobManager:
+    """
+    Runs large scoring requests as background jobs with bounded concurrency.
+
+    Jobs outlive the HTTP request that submitted them: each is processed chunk by chunk on a
+    dedicated worker pool, every chunk's scores are written to disk as soon as they are ready,
+    and clients poll the status and fetch results page by page (one page per chunk) or as a
+    single stream.
+
+    Attributes:
+        root (str): Directory holding one sub-directory per job.
+        score (callable): Maps a dataframe of raw inputs to an array of phats.
+        input_root (str): Directory that file references must resolve into.
+        chunk_rows (int): Rows per chunk, and therefore per result page.
+        max_pending (int): Maximum jobs queued or running at once.
+    """
+
+    def __init__(
+        self, root, score, input_root, max_workers=1, max_pending=16, chunk_rows=50000
+    ):
+        self.root = root
+        self.score = score
+        self.input_root = os.path.realpath(input_root)
+        self.chunk_rows = chunk_rows
+        self.max_pending = max_pending
+        self.jobs = {}
+        self._lock = threading.RLock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="job"
+        )
+
+    def recover(self):
+        """
+        Reloads jobs left on disk by a previous process.
+
+        Finished jobs stay downloadable; jobs that were interrupted are marked as failed.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        for name in os.listdir(self.root):
+            directory = os.path.join(self.root, name)
+            if not os.path.exists(os.path.join(directory, "status.json")):
+                continue
+            job = Job.load(directory)
+            if job.status in ("queued", "running"):
+                job.status, job.error = "failed", "interrupted by a restart"
+                job.save()
+            self.jobs[job.job_id] = job
+
+    def _active(self):
+        # Snapshot under the lock, as request threads add and remove jobs concurrently.
+        with self._lock:
+            jobs = list(self.jobs.values())
+        return sum(job.status in ("queued", "running") for job in jobs)
+
+    def _create(self, source, rows_total):
+        with self._lock:
+            if self._active() >= self.max_pending:
+                raise JobQueueFull()
+            job_id = uuid.uuid4().hex
+            job = Job(job_id, os.path.join(self.root, job_id), source, rows_total)
+            os.makedirs(job.directory)
+            job.save()
+            self.jobs[job_id] = job
+        jobs_active_gauge.set(self._active())
+        return job
+
+    def resolve_input(self, path):
+        """
+        Resolves a client supplied file reference inside ``input_root``.
+
+        Raises:
+            ValueError: If the path escapes ``input_root`` or does not exist.
+        """
+        resolved = os.path.realpath(os.path.join(self.input_root, path))
+        if os.path.commonpath([resolved, self.input_root]) != self.input_root:
+            raise ValueError("path must be inside the job input directory")
+        if not os.path.isfile(resolved):
+            raise ValueError(f"input file {path} not found")
+        return resolved
+
+    def submit_frame(self, df):
+        """Queues a job scoring the rows of an in-memory dataframe."""
+        job = self._create("inline", len(df))
+        self._executor.submit(self._run, job, self._slices(df))
+        return job
+
+    def _slices(self, df):
+        for start in range(0, len(df), self.chunk_rows):
+            stop = start + self.chunk_rows
+            yield df.iloc[start:stop].copy()
+
+    def submit_csv(self, path):
+        """Queues a job scoring a CSV file under ``input_root``, read in chunks."""
+        resolved = self.resolve_input(path)
+        job = self._create(path, None)
+        self._executor.submit(
+            self._run, job, pd.read_csv(resolved, chunksize=self.chunk_rows)
+        )
+        return job
+
+    def _run(self, job, chunks):
+        if job.cancelled.is_set():
+            return
+        job.status = "running"
+        job.save()
+        try:
+            for chunk in chunks:
+                if job.cancelled.is_set():
+                    return
+                phat = np.asarray(self.score(chunk), dtype=np.float64)
+                np.save(job.part_path(job.pages), phat)
+                job.pages += 1
+                job.rows_done += len(phat)
+                job_rows_counter.inc(len(phat))
+                job.save()
+            job.status = "completed"
+        except Exception as e:
+            logger.error(f"Job {job.job_id} failed: {str(e)}")
+            job.status, job.error = "failed", str(e)
+        finally:
+            if hasattr(chunks, "close"):
+                chunks.close()
+            if not job.cancelled.is_set():
+                job.save()
+                jobs_counter.labels(status=job.status).inc()
+            jobs_active_gauge.set(self._active())
+
+    def get(self, job_id):
+        """Returns a job, raising ``KeyError`` for unknown ids."""
+        return self.jobs[job_id]
+
+    def read_page(self, job_id, page):
+        """
+        Loads the phats of one result page.
+
+        Raises:
+            KeyError: If the job does not exist.
+            IndexError: If the page has not been written (yet).
+        """
+        job = self.get(job_id)
+        if not 0 <= page < job.pages:
+            raise IndexError(page)
+        return np.load(job.part_path(page))
+
+    def iter_csv(self, job_id, threshold):
+        """Yields the results of a job as CSV text, one page at a time."""
+        job = self.get(job_id)
+        yield "phat,business_outcome\n"
+        for page in range(job.pages):
+            phat = np.load(job.part_path(page))
+            outcome = (phat >= threshold).astype(int)
+            yield "".join(f"{p!r},{o}\n" for p, o in zip(phat.tolist(), outcome))
+
+    def delete(self, job_id):
+        """Cancels a job if it is still running and removes its files."""
+        with self._lock:
+            job = self.jobs.pop(job_id)
+        job.cancelled.set()
+        job.status = "cancelled"
+        shutil.rmtree(job.directory, ignore_errors=True)
+        jobs_active_gauge.set(self._active())
+
+    def shutdown(self):
+        """Stops accepting jobs; running jobs are recovered as failed on the next start."""
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,143 @@
+__all__ = ["Lane"]
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from prometheus_client import Gauge, Histogram
+
+from .admission import AdmissionController, AdmissionRejected
+from .deadlines import check_deadline, time_left
+
+
+lane_busy_workers_gauge = Gauge(
+    "lane_busy_workers", "Worker threads currently scoring", ["lane"]
+)
+lane_task_seconds_histogram = Histogram(
+    "lane_task_seconds",
+    "Time spent scoring one task in a lane worker",
+    ["lane"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+
+class Lane:
+    """
+    An execution lane: a dedicated worker pool guarded by its own admission budget.
+
+    Interactive and bulk traffic each get a lane so that a burst of large batches queues (or is
+    shed) in the bulk lane while single-row requests keep their own reserved workers and row
+    budget. Work still shares the interpreter, so the bulk pool should be sized to leave CPU
+    for the interactive one.
+
+    Attributes:
+        name (str): Lane label used in metrics and thread names.
+        max_workers (int): Size of the lane's thread pool.
+        admission (AdmissionController): Row budget and wait queue of the lane.
+        executor (ThreadPoolExecutor): Pool running the lane's scoring work.
+    """
+
+    def __init__(
+        self,
+        name,
+        max_workers,
+        max_inflight_rows,
+        max_queue,
+        queue_timeout,
+        retry_after,
+    ):
+        self.name = name
+        self.max_workers = max_workers
+        self.admission = AdmissionController(
+            max_inflight_rows, max_queue, queue_timeout, retry_after, name=name
+        )
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"{name}-lane"
+        )
+
+    @classmethod
+    def from_env(
+        cls,
+        name,
+        max_workers,
+        max_inflight_rows,
+        max_queue,
+        queue_timeout=2.0,
+        retry_after=1,
+    ):
+        """
+        Builds a lane whose defaults can be overridden by ``<NAME>_WORKERS``,
+        ``<NAME>_MAX_INFLIGHT_ROWS``, ``<NAME>_MAX_QUEUED_REQUESTS``,
+        ``<NAME>_QUEUE_TIMEOUT_SECONDS`` and ``<NAME>_RETRY_AFTER_SECONDS``.
+        """
+        prefix = name.upper()
+        return cls(
+            name,
+            int(os.environ.get(f"{prefix}_WORKERS", max_workers)),
+            int(os.environ.get(f"{prefix}_MAX_INFLIGHT_ROWS", max_inflight_rows)),
+            int(os.environ.get(f"{prefix}_MAX_QUEUED_REQUESTS", max_queue)),
+            float(os.environ.get(f"{prefix}_QUEUE_TIMEOUT_SECONDS", queue_timeout)),
+            int(os.environ.get(f"{prefix}_RETRY_AFTER_SECONDS", retry_after)),
+        )
+
+    def _timed(self, func, *args):
+        lane_busy_workers_gauge.labels(lane=self.name).inc()
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            lane_task_seconds_histogram.labels(lane=self.name).observe(
+                time.perf_counter() - start
+            )
+            lane_busy_workers_gauge.labels(lane=self.name).dec()
+
+    async def submit(self, func, *args):
+        """Runs ``func(*args)`` on the lane's pool without taking admission capacity."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._timed, func, *args)
+
+    @asynccontextmanager
+    async def admit(self, rows, deadline=None):
+        """
+        Holds ``rows`` of the lane's capacity for the duration of the block.
+
+        A request whose deadline has already passed is dropped before it is queued, its wait in
+        the queue never outlasts the deadline, and it is checked once more after admission.
+
+        Args:
+            rows (int): Number of rows the request scores.
+            deadline (float, optional): Absolute UNIX timestamp after which the result is useless.
+
+        Raises:
+            AdmissionRejected: If the lane's queue is full or the wait times out.
+            DeadlineExceeded: If the deadline passes before the work starts.
+        """
+        check_deadline(deadline, "queue", rows)
+        try:
+            cost = await self.admission.acquire(rows, time_left(deadline))
+        except AdmissionRejected as rejected:
+            if rejected.reason == "timeout":
+                check_deadline(deadline, "queue", rows)
+            raise
+        try:
+            check_deadline(deadline, "queue", rows)
+            yield
+        finally:
+            self.admission.release(cost)
+
+    async def run(self, rows, func, *args, deadline=None):
+        """
+        Admits ``rows`` into the lane and runs ``func(*args)`` on its pool.
+
+        Raises:
+            AdmissionRejected: If the lane's queue is full or the wait times out.
+            DeadlineExceeded: If the deadline passes before the work starts.
+        """
+        async with self.admit(rows, deadline):
+            return await self.submit(func, *args)
+
+    def shutdown(self):
+        """Stops accepting work and lets running tasks finish in the background."""
+        self.executor.shutdown(wait=False)
@@ -1,27 +1,70 @@
 import pandas as pd
-import joblib
 import numpy as np
 import asyncio
+import functools
 import os
 import logging
 import logging.handlers
 import time
-import json
 
-from concurrent.futures import ThreadPoolExecutor
+from typing import Literal, Optional
 from fastapi import FastAPI
 from fastapi import HTTPException
-from .models import PredictionRequest, BatchPredictionRequest
+from fastapi import Header
+from fastapi import Query
+from fastapi import Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from .admission import AdmissionRejected
+from .compression import CompressionMiddleware
+from .drift import DriftMonitor, expose_drift, load_profile
+from .deadlines import (
+    DeadlineExceeded,
+    check_deadline,
+    deadline_passed,
+    earliest_deadline,
+    expire,
+)
+from .lanes import Lane
+from .jobs import JobManager, JobQueueFull
+from .models import (
+    PredictionRequest,
+    BatchPredictionRequest,
+    JobRequest,
+    RowsBatchPredictionRequest,
+)
+from .prediction_log import PredictionLog
+from .responses import ColumnarJSONResponse, explanation_records
+from .shadow import ShadowPool, expose_shadows, parse_shadow_models
+from .socket_transport import NUMERIC_FIELDS, ScoringSocketServer
+from .validation import validate_rows
+from .warmup import run_warmup, warmup_plan
+from statefarm.modeling.scorer import Scorer
 from prometheus_fastapi_instrumentator import Instrumentator
-from prometheus_client import Histogram, Counter
+from prometheus_client import Histogram, Counter, Gauge
 
 
 logger = logging.getLogger("fastapi")
 logger.setLevel(logging.INFO)
+# uvicorn only configures its own loggers; without a handler INFO records such as the warmup
+# report would never reach the container log. The handler prints the records itself, so they
+# must not also propagate to a root handler and show up twice.
+if not logger.handlers:
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(levelname)s:     %(message)s"))
+    logger.addHandler(handler)
+    logger.propagate = False
 
 
 app = FastAPI()
 Instrumentator().instrument(app).expose(app)
+# Bulk request and response bodies may be gzip or deflate compressed, see compression.py.
+app.add_middleware(
+    CompressionMiddleware,
+    paths=("/batch_predict", "/jobs"),
+    level=int(os.environ.get("COMPRESSION_LEVEL", "6")),
+    min_bytes=int(os.environ.get("COMPRESSION_MIN_BYTES", "1024")),
+    max_bytes=int(os.environ.get("MAX_DECOMPRESSED_BYTES", str(256 << 20))),
+)
 # TODO: Was working through getting this for elastic search
 phat_histogram = Histogram(
     "prediction_phats",
@@ -29,58 +72,345 @@ phat_histogram = Histogram(
     buckets=(0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1),
 )
 api_calls_counter = Counter("api_calls", "API Calls Counter")
+failed_rows_counter = Counter(
+    "batch_failed_rows", "Batch rows rejected by validation or conversion"
+)
+ready_gauge = Gauge("ready", "1 once the model is loaded and warmed up")
+dedup_ratio_histogram = Histogram(
+    "batch_dedup_ratio",
+    "Share of batch rows answered from a duplicate row",
+    buckets=(0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1),
+)
 
 current_dir = os.getcwd()
 MODEL_PATH = os.path.join(current_dir, "files/models/logistic_regression_model.pkl")
 PREPROCESSOR_PATH = os.path.join(current_dir, "files/models/preprocessor.pkl")
+# Live inputs and scores are compared with the profile train_model saves next to the model;
+# drift monitoring is off when the file is missing.
+REFERENCE_PROFILE_PATH = os.environ.get(
+    "REFERENCE_PROFILE_PATH",
+    os.path.join(current_dir, "files/models/reference_profile.json"),
+)
+DRIFT_DECAY_ROWS = int(os.environ.get("DRIFT_DECAY_ROWS", "50000"))
+
+# Execution lanes: /predict keeps reserved workers and its own row budget so bulk batches
+# cannot starve it. Each lane is configured through <LANE>_WORKERS, <LANE>_MAX_INFLIGHT_ROWS,
+# <LANE>_MAX_QUEUED_REQUESTS, <LANE>_QUEUE_TIMEOUT_SECONDS and <LANE>_RETRY_AFTER_SECONDS.
+num_cpus = os.cpu_count() or 4
+interactive_lane = Lane.from_env(
+    "interactive", max_workers=2, max_inflight_rows=64, max_queue=256, queue_timeout=0.5
+)
+bulk_lane = Lane.from_env(
+    "bulk", max_workers=max(1, num_cpus - 2), max_inflight_rows=20000, max_queue=64
+)
+# Batches are preprocessed and scored in chunks of this many distinct rows; a request's
+# deadline is checked before each chunk.
+BATCH_CHUNK_ROWS = int(os.environ.get("BATCH_CHUNK_ROWS", "1000"))
+RETRY_AFTER_JOBS_SECONDS = 30
+jobs = JobManager(
+    os.environ.get("JOB_DIR", os.path.join(current_dir, "files/jobs")),
+    lambda chunk: scorer.score_batch(chunk, copy=False)[0],
+    os.environ.get("JOB_INPUT_DIR", os.path.join(current_dir, "files/data")),
+    max_workers=int(os.environ.get("JOB_WORKERS", "1")),
+    max_pending=int(os.environ.get("JOB_MAX_PENDING", "16")),
+    chunk_rows=int(os.environ.get("JOB_CHUNK_ROWS", "50000")),
+)
+# Scored rows are kept in a columnar prediction log (see prediction_log.py) when
+# PREDICTION_LOG_DIR is set, e.g. to files/predictions (git-ignored under statefarm/).
+PREDICTION_LOG_DIR = os.environ.get("PREDICTION_LOG_DIR", "")
+prediction_log = (
+    PredictionLog(
+        PREDICTION_LOG_DIR,
+        max_segment_rows=int(os.environ.get("PREDICTION_LOG_SEGMENT_ROWS", "100000")),
+        max_segment_seconds=float(
+            os.environ.get("PREDICTION_LOG_SEGMENT_SECONDS", "60")
+        ),
+        max_segments=int(os.environ.get("PREDICTION_LOG_MAX_SEGMENTS", "0")) or None,
+        numeric_columns=NUMERIC_FIELDS,
+    )
+    if PREDICTION_LOG_DIR
+    else None
+)
+# Optional second listener for callers on the same host, see socket_transport.py.
+SCORING_SOCKET_PATH = os.environ.get("SCORING_SOCKET_PATH", "")
+socket_server = None
+# Synthetic rows are scored through every endpoint's code path at these batch sizes before
+# /readyz reports ready; an empty WARMUP_BATCH_SIZES skips the warmup.
+WARMUP_BATCH_SIZES = [
+    int(size)
+    for size in os.environ.get("WARMUP_BATCH_SIZES", "1,10,100,1000").split(",")
+    if size
+]
+WARMUP_REPEATS = int(os.environ.get("WARMUP_REPEATS", "3"))
+ready = False
+warmup_task = None
+# Candidate models scored on the same validated inputs in the background, see shadow.py.
+# SHADOW_MODELS lists name=model_path:preprocessor_path entries separated by commas; shadow
+# work is dropped while a lane has queued requests or SHADOW_MAX_PENDING_ROWS rows wait.
+SHADOW_MODELS = parse_shadow_models(os.environ.get("SHADOW_MODELS", ""), current_dir)
+SHADOW_WORKERS = int(os.environ.get("SHADOW_WORKERS", "1"))
+SHADOW_MAX_PENDING_ROWS = int(os.environ.get("SHADOW_MAX_PENDING_ROWS", "20000"))
+shadow_pool = None
+LANES_BY_PATH = {
+    "/predict": interactive_lane,
+    "/batch_predict": bulk_lane,
+    "/batch_predict_simple": bulk_lane,
+}
+
+
+def overloaded_response(reason, retry_after):
+    """503 telling the client when to retry."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": f"Server overloaded ({reason}), retry later"},
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    return overloaded_response(exc.reason, exc.retry_after)
 
 
-async def load_model_async(model_path):
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, joblib.load, model_path)
+@app.exception_handler(DeadlineExceeded)
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceeded):
+    return JSONResponse(
+        status_code=504,
+        content={"detail": f"Request deadline exceeded ({exc.stage})"},
+    )
+
+
+@app.middleware("http")
+async def shed_load(request: Request, call_next):
+    # Reject before the body is read and validated when nothing more can be queued.
+    lane = LANES_BY_PATH.get(request.url.path)
+    if lane is not None and lane.admission.queue_full():
+        lane.admission.record_rejection("queue_full")
+        return overloaded_response("queue_full", lane.admission.retry_after)
+    return await call_next(request)
+
+
+def load_scorer():
+    """Loads the model and preprocessor into the ``Scorer`` every endpoint scores with."""
+    drift_monitor = None
+    if REFERENCE_PROFILE_PATH and os.path.exists(REFERENCE_PROFILE_PATH):
+        drift_monitor = DriftMonitor(
+            load_profile(REFERENCE_PROFILE_PATH), DRIFT_DECAY_ROWS
+        )
+        expose_drift(drift_monitor)
+    else:
+        logger.warning(
+            f"No reference profile at {REFERENCE_PROFILE_PATH}, drift monitoring is off"
+        )
+    return Scorer.from_paths(
+        MODEL_PATH,
+        PREPROCESSOR_PATH,
+        model_version=os.environ.get("MODEL_VERSION"),
+        chunk_rows=BATCH_CHUNK_ROWS,
+        dedup_observer=dedup_ratio_histogram.observe,
+        drift_monitor=drift_monitor,
+    )
+
+
+def primary_busy():
+    """Whether requests are waiting for a lane, in which case shadow work is dropped."""
+    return any(lane.admission.queue_depth > 0 for lane in (interactive_lane, bulk_lane))
+
+
+def load_shadows():
+    """Loads the shadow models of ``SHADOW_MODELS``; a failure only disables shadow scoring."""
+    try:
+        pool = ShadowPool.from_paths(
+            SHADOW_MODELS,
+            threshold=scorer.threshold,
+            max_workers=SHADOW_WORKERS,
+            max_pending_rows=SHADOW_MAX_PENDING_ROWS,
+            busy=primary_busy,
+        )
+    except Exception as e:
+        logger.error(
+            f"Failed to load the shadow models, shadow scoring is off: {str(e)}"
+        )
+        return None
+    expose_shadows(pool)
+    logger.info(f"Shadow scoring with {', '.join(pool.shadows)}")
+    return pool
 
 
 @app.on_event("startup")
 async def startup_event():
-    global model, preprocessor
-    model = await load_model_async(MODEL_PATH)
-    preprocessor = await load_model_async(PREPROCESSOR_PATH)
+    global scorer, shadow_pool, socket_server, warmup_task
+    scorer = await asyncio.get_running_loop().run_in_executor(None, load_scorer)
 
-    if model is None or preprocessor is None:
+    if scorer.model is None or scorer.preprocessor is None:
         logger.error("Failed to load the model or preprocessor. Stopping application.")
         raise Exception("Critical resource loading failed")
+    if SHADOW_MODELS:
+        shadow_pool = await asyncio.get_running_loop().run_in_executor(
+            None, load_shadows
+        )
+    jobs.recover()
+    if SCORING_SOCKET_PATH:
+        socket_server = ScoringSocketServer(SCORING_SOCKET_PATH, score_socket_rows)
+        await socket_server.start()
+    # Runs in the background so /healthz answers while the worker warms up.
+    warmup_task = asyncio.create_task(warm_up())
+
+
+async def warm_up():
+    """Scores synthetic rows on the lanes of every endpoint, then marks the worker ready."""
+    global ready
+
+    def submit(path, rows, call):
+        lane = LANES_BY_PATH.get(path) or (interactive_lane if rows == 1 else bulk_lane)
+        return lane.submit(call)
+
+    if WARMUP_BATCH_SIZES:
+        start = time.perf_counter()
+        try:
+            plan = warmup_plan(scorer, WARMUP_BATCH_SIZES)
+            await run_warmup(plan, submit, WARMUP_REPEATS)
+        except Exception as e:
+            logger.error(f"Warmup failed, the worker stays unready: {str(e)}")
+            return
+        logger.info(f"Warmup finished in {time.perf_counter() - start:.2f}s")
+    ready = True
+    ready_gauge.set(1)
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if warmup_task is not None:
+        warmup_task.cancel()
+    if socket_server is not None:
+        await socket_server.close()
+    for lane in (interactive_lane, bulk_lane):
+        lane.shutdown()
+    if shadow_pool is not None:
+        shadow_pool.shutdown()
+    jobs.shutdown()
+    if prediction_log is not None:
+        prediction_log.close()
+
+
+@app.get("/healthz")
+async def healthz():
+    """Liveness: the process is up and serving the event loop."""
+    return {"status": "alive"}
+
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness: 200 once the model is loaded and warmed up, 503 until then."""
+    if not ready:
+        return JSONResponse(status_code=503, content={"status": "warming_up"})
+    return {"status": "ready", "model_version": scorer.model_version}
+
+
+@app.get("/shadow")
+async def shadow_report():
+    """
+    How each shadow model's scores compare with the primary's so far.
+
+    Returns:
+        dict: ``model_version`` of the primary and, per shadow, its ``model_version``, rows
+        compared, delta statistics and disagreements at the decision threshold.
+    """
+    if shadow_pool is None:
+        raise HTTPException(status_code=404, detail="Shadow scoring is off")
+    report = shadow_pool.report().astype(object)
+    report = report.where(report.notna(), None)
+    return {
+        "model_version": scorer.model_version,
+        "shadows": report.to_dict(orient="index"),
+    }
+
+
+async def score_socket_rows(input_df):
+    """
+    Scores rows received on the scoring socket with the same lanes, metrics and prediction log
+    as the HTTP endpoints: single rows run in the interactive lane, batches in the bulk lane.
+
+    Returns:
+        tuple: ``phat`` and ``business_outcome`` arrays in row order.
+    """
+    lane = interactive_lane if len(input_df) == 1 else bulk_lane
+    async with lane.admit(len(input_df)):
+        api_calls_counter.inc()
+        raw_columns = {column: input_df[column].to_numpy() for column in input_df}
+        phat, business_outcomes = await lane.submit(
+            scorer.score_batch, input_df, None, False
+        )
+    if len(phat) == 1:
+        phat_histogram.observe(phat[0])
+    if prediction_log is not None:
+        prediction_log.append(
+            raw_columns, phat, business_outcomes, scorer.model_version
+        )
+    if shadow_pool is not None:
+        shadow_pool.submit(raw_columns, phat)
+    return phat, business_outcomes
 
 
 @app.post("/predict")
-async def predict(request: PredictionRequest):
+async def predict(
+    request: PredictionRequest,
+    explain: bool = False,
+    top_k: int = Query(3, ge=1),
+    x_request_deadline: Optional[float] = Header(None),
+):
     """
     Perform a single prediction asynchronously.
 
     Args:
         request (PredictionRequest): Prediction request containing data for a single prediction.
+        explain (bool): Also return ``explanation``, the ``top_k`` variables contributing most
+            to the score (coefficient times transformed value), largest absolute value first.
+        top_k (int): Contributions returned with ``explain``.
+        x_request_deadline (float, optional): ``X-Request-Deadline`` header, an absolute UNIX
+            timestamp; the earlier of it and ``request.deadline`` applies.
 
     Returns:
         dict: Prediction response.
     """
+    deadline = earliest_deadline(request.deadline, x_request_deadline)
+    response = await interactive_lane.run(
+        1,
+        predict_single,
+        request,
+        deadline,
+        top_k if explain else None,
+        deadline=deadline,
+    )
+    if response is None:
+        expire("chunk", 1)
+    return response
+
+
+def predict_single(request: PredictionRequest, deadline=None, top_k=None):
+    """
+    Scores one row on the calling lane worker; used by ``predict`` and the simple batch.
+
+    Returns None without scoring when ``deadline`` has already passed. With ``top_k`` the
+    response also holds the row's explanation, see ``Scorer.score_one``.
+    """
+    if deadline_passed(deadline):
+        return None
     try:
         api_calls_counter.inc()
         data_dict = {key: value for key, value in request.data.dict().items()}
-        input_df = pd.DataFrame([data_dict])
-        response = pd.DataFrame(
-            model.final_result.predict(
-                preprocessor.transform(input_df)[model.variables]
-            )
-        ).rename(columns={0: "phat"})
-        response["business_outcome"] = np.where(response["phat"] >= 0.75, 1, 0)
-        response = response.to_dict(orient="records")[0]
+        response = scorer.score_one(data_dict, top_k)
         phat_value = response["phat"]
         phat_histogram.observe(phat_value)
-        prediction_log = {
-            "timestamp": time.time(),
-            "phat": phat_value,
-            "business_outcome": response["business_outcome"],
-        }
-        logger.info(json.dumps(prediction_log))
+        if prediction_log is not None:
+            prediction_log.append_row(
+                data_dict,
+                phat_value,
+                response["business_outcome"],
+                scorer.model_version,
+            )
+        if shadow_pool is not None:
+            shadow_pool.submit_row(data_dict, phat_value)
     except Exception as e:
         logger.error(f"Prediction error: {str(e)}")
         raise HTTPException(status_code=500, detail="Error during prediction")
@@ -88,68 +418,291 @@ async def predict(request: PredictionRequest):
 
 
 @app.post("/batch_predict_simple")
-async def batch_predict_simple(request: BatchPredictionRequest):
+async def batch_predict_simple(
+    request: BatchPredictionRequest,
+    orient: Literal["records", "columns"] = "records",
+    x_request_deadline: Optional[float] = Header(None),
+):
     """
     Batch process prediction requests asynchronously.
 
     Args:
         request (BatchPredictionRequest): Batch prediction request containing a list of data items.
+        orient (str): ``records`` (default) for one object per row, ``columns`` for
+            ``{"phat": [...], "business_outcome": [...], "model_version": ...}``.
+        x_request_deadline (float, optional): ``X-Request-Deadline`` header, see ``predict``.
 
     Returns:
         List[dict]: List of prediction responses, ordered based on the input order.
     """
-    try:
-
-        async def process_single_request(item):
-            single_request = PredictionRequest(data=item)
-            single_response = await predict(single_request)
-            return single_response
-
-        loop = asyncio.get_event_loop()
-        responses = []
-
-        num_cpus = os.cpu_count()
-        max_workers = num_cpus if num_cpus is not None else 4
-
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            response_futures = await asyncio.gather(
+    deadline = earliest_deadline(request.deadline, x_request_deadline)
+    async with bulk_lane.admit(len(request.data), deadline):
+        try:
+            responses = await asyncio.gather(
                 *[
-                    loop.run_in_executor(executor, process_single_request, item)
+                    bulk_lane.submit(
+                        predict_single, PredictionRequest(data=item), deadline
+                    )
                     for item in request.data
                 ]
             )
+        except Exception as e:
+            logger.error(f"Batch prediction error: {str(e)}")
+            raise HTTPException(status_code=500, detail="Error during batch prediction")
 
-        responses = await asyncio.gather(*response_futures)
-    except Exception as e:
-        logger.error(f"Batch prediction error: {str(e)}")
-        raise HTTPException(status_code=500, detail="Error during batch prediction")
+        skipped = sum(response is None for response in responses)
+        if skipped:
+            expire("chunk", skipped)
+        if orient == "columns":
+            return ColumnarJSONResponse(
+                {
+                    "phat": np.array([item["phat"] for item in responses]),
+                    "business_outcome": np.array(
+                        [item["business_outcome"] for item in responses]
+                    ),
+                    "model_version": scorer.model_version,
+                }
+            )
+        return responses
+
+
+def scatter_valid(values, valid):
+    """Spreads the values of the valid rows back over every row, None at the failed ones."""
+    spread = np.full((len(valid),) + values.shape[1:], None, dtype=object)
+    spread[valid] = values
+    return spread
+
+
+def batch_response(phat, business_outcome, valid, row_errors, orient, explanation=None):
+    """
+    Builds the ``/batch_predict`` response from the scores of the valid rows.
+
+    Args:
+        phat (numpy.ndarray): Scores of the valid rows.
+        business_outcome (numpy.ndarray): Outcomes of the valid rows.
+        valid (numpy.ndarray): True for each request row that was scored.
+        row_errors (dict, optional): Errors by row index, reported with ``errors=rows``.
+        orient (str): ``records`` or ``columns``.
+        explanation (tuple, optional): Names and contributions from ``Scorer.explain_batch``.
+
+    Returns:
+        List[dict] or ColumnarJSONResponse: One entry per request row, in input order.
+    """
+    names, contributions = explanation if explanation is not None else (None, None)
+    if not valid.all():
+        phat = scatter_valid(phat, valid)
+        business_outcome = scatter_valid(business_outcome, valid)
 
+    if orient == "columns":
+        columns = {
+            "phat": phat,
+            "business_outcome": business_outcome,
+            "model_version": scorer.model_version,
+        }
+        if explanation is not None:
+            if not valid.all():
+                names = scatter_valid(names, valid)
+                contributions = scatter_valid(contributions, valid)
+            columns["explanation_variable"] = names
+            columns["explanation_contribution"] = contributions
+        if row_errors is not None:
+            columns["errors"] = [
+                {"index": index, **error}
+                for index, row_error in row_errors.items()
+                for error in row_error
+            ]
+        return ColumnarJSONResponse(columns)
+
+    responses = pd.DataFrame(
+        {"timestamp": time.time(), "phat": phat, "business_outcome": business_outcome}
+    ).to_dict(orient="records")
+    if explanation is not None:
+        for position, row_explanation in zip(
+            np.flatnonzero(valid), explanation_records(names, contributions)
+        ):
+            responses[position]["explanation"] = row_explanation
+    for index, row_error in (row_errors or {}).items():
+        responses[index]["errors"] = row_error
     return responses
 
 
 @app.post("/batch_predict")
-async def batch_predict(request: BatchPredictionRequest):
-    try:
+async def batch_predict(
+    request: RowsBatchPredictionRequest,
+    orient: Literal["records", "columns"] = "records",
+    errors: Literal["raise", "rows"] = "raise",
+    explain: bool = False,
+    top_k: int = Query(3, ge=1),
+    x_request_deadline: Optional[float] = Header(None),
+):
+    """
+    Score a batch of rows in a single vectorized pass.
+
+    Rows are validated column by column (see ``validate_rows``). By default any invalid row
+    rejects the batch with ``422`` and the errors of every invalid row; with ``errors=rows`` the
+    valid rows are scored and each invalid row gets ``null`` scores and its ``errors`` instead.
+
+    Args:
+        request (RowsBatchPredictionRequest): Batch prediction request containing a list of rows.
+        orient (str): ``records`` (default) for one object per row, ``columns`` for
+            ``{"phat": [...], "business_outcome": [...], "model_version": ...}``
+            encoded straight from the NumPy arrays, plus ``errors`` as a list of
+            ``{"index": ..., "field": ..., "message": ...}`` with ``errors=rows``.
+        errors (str): ``raise`` (default) to reject a batch with any invalid row, ``rows`` to
+            score the valid rows and report the invalid ones at their index.
+        explain (bool): Also explain every score by its ``top_k`` largest contributions, computed
+            in the scoring pass: an ``explanation`` mapping of variable to contribution per row,
+            or with ``orient=columns`` the ``explanation_variable`` and
+            ``explanation_contribution`` arrays, rows by ``top_k``.
+        top_k (int): Contributions returned per row with ``explain``.
+        x_request_deadline (float, optional): ``X-Request-Deadline`` header, see ``predict``.
+
+    Returns:
+        List[dict] or ColumnarJSONResponse: Predictions in input order.
+    """
+    deadline = earliest_deadline(request.deadline, x_request_deadline)
+    async with bulk_lane.admit(len(request.data), deadline):
         api_calls_counter.inc()
-        data_dict = [item.dict() for item in request.data]
-        input_df = pd.DataFrame(data_dict)
-        batch_predictions = model.final_result.predict(
-            preprocessor.transform(input_df)[model.variables]
-        )
-        business_outcomes = np.where(batch_predictions >= 0.75, 1, 0)
-
-        results_df = pd.DataFrame(
-            {
-                "timestamp": time.time(),
-                "phat": batch_predictions,
-                "business_outcome": business_outcomes,
-            }
+        input_df, valid, row_errors = validate_rows(
+            request.data, scorer.preprocessor.columns_to_convert
         )
+        if row_errors:
+            failed_rows_counter.inc(len(row_errors))
+            if errors == "raise":
+                raise HTTPException(
+                    status_code=422,
+                    detail=[
+                        {
+                            "loc": ["body", "data", index, error["field"]],
+                            "msg": error["message"],
+                            "type": "value_error",
+                        }
+                        for index, row_error in row_errors.items()
+                        for error in row_error
+                    ],
+                )
+            input_df = input_df[valid]
+        try:
+            # Taken before scoring: transform replaces the converted columns in place.
+            raw_columns = {column: input_df[column].to_numpy() for column in input_df}
+            checkpoint = functools.partial(check_deadline, deadline, "chunk")
+            if explain:
+                scored = await bulk_lane.submit(
+                    scorer.explain_batch, input_df, top_k, checkpoint, False
+                )
+                batch_predictions, business_outcomes, names, contributions = scored
+            else:
+                batch_predictions, business_outcomes = await bulk_lane.submit(
+                    scorer.score_batch, input_df, checkpoint, False
+                )
 
-        logger.info(results_df.to_json(orient="records"))
+            if prediction_log is not None and len(input_df):
+                prediction_log.append(
+                    raw_columns,
+                    batch_predictions,
+                    business_outcomes,
+                    scorer.model_version,
+                )
+            if shadow_pool is not None and len(input_df):
+                shadow_pool.submit(raw_columns, batch_predictions)
 
-        responses = results_df.to_dict(orient="records")
-        return responses
-    except Exception as e:
-        logger.error(f"Batch prediction error: {str(e)}")
-        raise HTTPException(status_code=500, detail="Error during batch prediction")
+            explanation = (names, contributions) if explain else None
+            return batch_response(
+                batch_predictions,
+                business_outcomes,
+                valid,
+                row_errors if errors == "rows" else None,
+                orient,
+                explanation,
+            )
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            logger.error(f"Batch prediction error: {str(e)}")
+            raise HTTPException(status_code=500, detail="Error during batch prediction")
+
+
+@app.post("/jobs", status_code=202)
+async def submit_job(request: JobRequest):
+    """
+    Submit a scoring job that runs in the background.
+
+    Args:
+        request (JobRequest): Inline rows in ``data`` or a CSV ``path`` relative to ``JOB_INPUT_DIR``.
+
+    Returns:
+        dict: The job's id and status; poll ``/jobs/{job_id}`` for progress.
+    """
+    try:
+        if request.path is not None:
+            job = jobs.submit_csv(request.path)
+        else:
+            job = jobs.submit_frame(
+                pd.DataFrame([item.dict() for item in request.data])
+            )
+    except JobQueueFull:
+        return overloaded_response("job_queue_full", RETRY_AFTER_JOBS_SECONDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return job.to_dict()
+
+
+def get_job(job_id):
+    try:
+        return jobs.get(job_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+
+
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    """Status and progress of a job."""
+    return get_job(job_id).to_dict()
+
+
+@app.get("/jobs/{job_id}/results")
+async def job_results(job_id: str, page: int = 0):
+    """
+    One page of a job's results; pages are written as the job progresses.
+
+    Args:
+        job_id (str): The job id.
+        page (int): Zero-based page, one per ``JOB_CHUNK_ROWS`` input rows.
+
+    Returns:
+        ColumnarJSONResponse: ``phat``, ``business_outcome``, ``page``, ``pages`` and ``status``.
+    """
+    job = get_job(job_id)
+    try:
+        phat = jobs.read_page(job_id, page)
+    except IndexError:
+        raise HTTPException(status_code=404, detail=f"Page {page} is not available")
+    return ColumnarJSONResponse(
+        {
+            "phat": phat,
+            "business_outcome": scorer.outcomes(phat),
+            "page": page,
+            "pages": job.pages,
+            "status": job.status,
+            "model_version": scorer.model_version,
+        }
+    )
+
+
+@app.get("/jobs/{job_id}/results.csv")
+async def job_results_csv(job_id: str):
+    """Streams all results of a completed job as CSV."""
+    job = get_job(job_id)
+    if job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    return StreamingResponse(
+        jobs.iter_csv(job_id, scorer.threshold), media_type="text/csv"
+    )
+
+
+@app.delete("/jobs/{job_id}")
+async def delete_job(job_id: str):
+    """Cancels a job and deletes its results."""
+    get_job(job_id)
+    jobs.delete(job_id)
+    return {"job_id": job_id, "status": "cancelled"}
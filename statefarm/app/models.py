@@ -1,5 +1,16 @@
-from typing import List, Optional
-from pydantic import BaseModel, validator
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, root_validator, validator
+
+
+X5_VALUES = [
+    "monday",
+    "tuesday",
+    "friday",
+    "saturday",
+    "sunday",
+    "thursday",
+    "wednesday",
+]
 
 
 class PredictionData(BaseModel):
@@ -107,23 +118,36 @@ class PredictionData(BaseModel):
     # This is great we can do things to the data or write it for all the columns this is a take home showing I know
     @validator("x5")
     def validate_x5(cls, value):
-        allowed_values = [
-            "monday",
-            "tuesday",
-            "friday",
-            "saturday",
-            "sunday",
-            "thursday",
-            "wednesday",
-        ]
-        if value is not None and value not in allowed_values:
-            raise ValueError(f"x5 must be one of {', '.join(allowed_values)}")
+        if value is not None and value not in X5_VALUES:
+            raise ValueError(f"x5 must be one of {', '.join(X5_VALUES)}")
         return value
 
 
 class PredictionRequest(BaseModel):
     data: PredictionData
+    # Absolute UNIX timestamp (seconds) after which the caller no longer needs the result
+    deadline: Optional[float] = None
 
 
 class BatchPredictionRequest(BaseModel):
     data: List[PredictionData]
+    deadline: Optional[float] = None
+
+
+class RowsBatchPredictionRequest(BaseModel):
+    # Rows with the fields of PredictionData, validated column by column in validation.py so
+    # one bad row does not reject the whole batch
+    data: List[Dict[str, Any]]
+    deadline: Optional[float] = None
+
+
+class JobRequest(BaseModel):
+    # Either inline rows or a CSV file relative to the job input directory
+    data: Optional[List[PredictionData]] = None
+    path: Optional[str] = None
+
+    @root_validator(skip_on_failure=True)
+    def validate_source(cls, values):
+        if (values.get("data") is None) == (values.get("path") is None):
+            raise ValueError("Provide exactly one of data or path")
+        return values
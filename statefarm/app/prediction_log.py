@@ -0,0 +1,284 @@
+__all__ = ["PredictionLog", "iter_predictions", "read_predictions"]
+
+import glob
+import logging
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from prometheus_client import Counter
+
+
+logger = logging.getLogger("fastapi")
+
+log_rows_counter = Counter(
+    "prediction_log_rows", "Prediction rows written to the prediction log"
+)
+log_dropped_rows_counter = Counter(
+    "prediction_log_dropped_rows",
+    "Prediction rows dropped because the prediction log writer fell behind",
+)
+log_segments_counter = Counter(
+    "prediction_log_segments", "Segments written to the prediction log"
+)
+
+SEGMENT_PATTERN = "segment-*.npz"
+META_COLUMNS = ["timestamp", "phat", "business_outcome", "model_version"]
+_STOP = object()
+
+
+class PredictionLog:
+    """
+    Append-only store of scored rows, written by a background thread.
+
+    Requests hand their raw inputs and scores to ``append``/``append_row``, which only enqueue
+    them. The writer thread buffers rows and rolls them into an immutable, zlib compressed
+    segment ``segment-<first ms>-<last ms>-<written ns>-<pid>.npz`` once ``max_segment_rows`` rows are
+    buffered or the oldest buffered row is ``max_segment_seconds`` old. Every column is stored as
+    its own array, string inputs with a null mask, so readers load only the columns they need and
+    skip whole segments by the time range in their file name. The write time orders segments
+    within the same millisecond and the process id lets several workers share a directory.
+
+    Attributes:
+        directory (str): Where segments are written.
+        max_segment_rows (int): Rows per segment before it is rolled over.
+        max_segment_seconds (float): Age of the oldest buffered row that forces a rollover.
+        max_segments (int or None): Segments kept on disk; the oldest are deleted beyond it.
+        numeric_columns (list of str): Input columns always stored as numbers, even when every
+            value in a segment is missing.
+    """
+
+    def __init__(
+        self,
+        directory,
+        max_segment_rows=100000,
+        max_segment_seconds=60.0,
+        max_segments=None,
+        max_pending=10000,
+        numeric_columns=(),
+    ):
+        self.directory = directory
+        self.max_segment_rows = max_segment_rows
+        self.max_segment_seconds = max_segment_seconds
+        self.max_segments = max_segments
+        self.numeric_columns = list(numeric_columns)
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._frames = []
+        self._rows = []
+        self._buffered = 0
+        self._opened_at = None
+        os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(
+            target=self._write_loop, name="prediction-log", daemon=True
+        )
+        self._thread.start()
+
+    def _put(self, item, rows):
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            log_dropped_rows_counter.inc(rows)
+
+    def append(self, inputs, phat, business_outcome, model_version):
+        """
+        Queues a scored batch; never blocks the caller.
+
+        Args:
+            inputs (dict): Input column name to an array of raw values. Arrays must not be modified
+                afterwards, so take them before the frame is transformed in place.
+            phat (numpy.ndarray): Scores of the rows.
+            business_outcome (numpy.ndarray): Decisions of the rows.
+            model_version (str): Version of the model that scored them.
+        """
+        self._put(
+            ("batch", time.time(), inputs, phat, business_outcome, model_version),
+            len(phat),
+        )
+
+    def append_row(self, row, phat, business_outcome, model_version):
+        """Queues a single scored row given as a dict of raw input values."""
+        self._put(("row", time.time(), row, phat, business_outcome, model_version), 1)
+
+    def _add(self, item):
+        kind, timestamp, inputs, phat, business_outcome, model_version = item
+        if self._opened_at is None:
+            self._opened_at = time.monotonic()
+        if kind == "row":
+            self._rows.append(
+                {
+                    **inputs,
+                    "timestamp": timestamp,
+                    "phat": phat,
+                    "business_outcome": business_outcome,
+                    "model_version": model_version,
+                }
+            )
+            self._buffered += 1
+            return
+        frame = pd.DataFrame(inputs)
+        frame["timestamp"] = timestamp
+        frame["phat"] = phat
+        frame["business_outcome"] = business_outcome
+        frame["model_version"] = model_version
+        self._frames.append(frame)
+        self._buffered += len(frame)
+
+    def _write_loop(self):
+        while True:
+            timeout = None
+            if self._opened_at is not None:
+                age = time.monotonic() - self._opened_at
+                timeout = max(self.max_segment_seconds - age, 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is not None and item is not _STOP:
+                self._add(item)
+                if self._buffered < self.max_segment_rows:
+                    continue
+            try:
+                self._roll()
+            except Exception as e:
+                logger.error(f"Prediction log write failed: {str(e)}")
+            if item is _STOP:
+                return
+
+    def _roll(self):
+        if not self._buffered:
+            return
+        frames = self._frames + ([pd.DataFrame(self._rows)] if self._rows else [])
+        self._frames, self._rows, self._buffered, self._opened_at = [], [], 0, None
+        segment = frames[0]
+        if len(frames) > 1:
+            segment = pd.concat(frames, ignore_index=True).sort_values(
+                "timestamp", kind="stable", ignore_index=True
+            )
+        write_segment(self.directory, segment, self.numeric_columns)
+        log_rows_counter.inc(len(segment))
+        log_segments_counter.inc()
+        if self.max_segments:
+            for path in segment_paths(self.directory)[: -self.max_segments]:
+                os.remove(path)
+
+    def close(self, timeout=10):
+        """Writes the buffered rows as a last segment and stops the writer thread."""
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+
+def write_segment(directory, segment, numeric_columns=()):
+    """
+    Writes a dataframe of logged rows as one compressed columnar segment.
+
+    Numeric columns keep their dtype; other columns are stored as unicode arrays plus a null
+    mask, so the file loads without pickle. The ``numeric_columns`` are converted to numbers
+    first: rows whose values are all None arrive as ``object`` columns and would otherwise be
+    stored as strings.
+    """
+    arrays = {}
+    for column in segment.columns:
+        values = segment[column]
+        if column in numeric_columns:
+            values = pd.to_numeric(values)
+        if column in META_COLUMNS:
+            name = column
+        else:
+            name = f"input.{column}"
+        if pd.api.types.is_numeric_dtype(values.dtype):
+            arrays[name] = values.to_numpy()
+        else:
+            missing = values.isna().to_numpy()
+            strings = np.where(missing, "", values.to_numpy(dtype=object))
+            arrays[name] = strings.astype(str)
+            arrays[f"null.{column}"] = missing
+    first, last = segment["timestamp"].min(), segment["timestamp"].max()
+    suffix = f"{time.time_ns():019d}-{os.getpid()}"
+    path = os.path.join(
+        directory,
+        f"segment-{int(first * 1000):013d}-{int(last * 1000):013d}-{suffix}.npz",
+    )
+    with open(f"{path}.tmp", "wb") as handle:
+        np.savez_compressed(handle, **arrays)
+    os.replace(f"{path}.tmp", path)
+    return path
+
+
+def segment_paths(directory, start=None, end=None):
+    """
+    Lists segment files in time order, keeping those that may hold rows in ``[start, end]``.
+
+    Args:
+        directory (str): The prediction log directory.
+        start (float, optional): Earliest UNIX timestamp of interest.
+        end (float, optional): Latest UNIX timestamp of interest.
+    """
+    paths = []
+    for path in sorted(glob.glob(os.path.join(directory, SEGMENT_PATTERN))):
+        _, first, last = os.path.basename(path).split("-")[:3]
+        first, last = int(first) / 1000, int(last) / 1000
+        if start is not None and last + 0.001 < start:
+            continue
+        if end is not None and first > end:
+            continue
+        paths.append(path)
+    return paths
+
+
+def iter_predictions(directory, start=None, end=None, columns=None):
+    """
+    Yields the logged rows of each segment overlapping a time range as a dataframe.
+
+    Args:
+        directory (str): The prediction log directory.
+        start (float, optional): Earliest UNIX timestamp to return.
+        end (float, optional): Latest UNIX timestamp to return.
+        columns (list of str, optional): Input columns to load; all of them by default. The
+            ``timestamp``, ``phat``, ``business_outcome`` and ``model_version`` columns are
+            always returned.
+
+    Yields:
+        pandas.DataFrame: Rows of one segment, in the order they were logged.
+    """
+    for path in segment_paths(directory, start, end):
+        with np.load(path, allow_pickle=False) as segment:
+            timestamp = segment["timestamp"]
+            keep = np.ones(len(timestamp), dtype=bool)
+            if start is not None:
+                keep &= timestamp >= start
+            if end is not None:
+                keep &= timestamp <= end
+            if not keep.any():
+                continue
+            names = [
+                name.split(".", 1)[1]
+                for name in segment.files
+                if name.startswith("input.")
+            ]
+            if columns is not None:
+                names = [name for name in names if name in columns]
+            data = {}
+            for column in names + META_COLUMNS:
+                key = column if column in META_COLUMNS else f"input.{column}"
+                values = segment[key][keep]
+                if f"null.{column}" in segment.files:
+                    values = values.astype(object)
+                    values[segment[f"null.{column}"][keep]] = None
+                data[column] = values
+        yield pd.DataFrame(data)
+
+
+def read_predictions(directory, start=None, end=None, columns=None):
+    """
+    Loads the logged rows in a time range into one dataframe; see ``iter_predictions``.
+
+    Returns:
+        pandas.DataFrame: The matching rows, oldest segment first.
+    """
+    frames = list(iter_predictions(directory, start, end, columns))
+    if not frames:
+        return pd.DataFrame(columns=META_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,53 @@
+__all__ = ["ColumnarJSONResponse", "explanation_records"]
+
+import json
+
+import numpy as np
+from fastapi.responses import Response
+
+
+class ColumnarJSONResponse(Response):
+    """
+    JSON response for column-oriented payloads built from NumPy arrays.
+
+    Each array is rendered with ``ndarray.tolist()`` and encoded in a single ``json.dumps`` call,
+    skipping ``jsonable_encoder`` and the per-row dictionaries of the records shape.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content):
+        """
+        Encodes a mapping of column names to arrays or scalars as compact JSON.
+
+        Args:
+            content (dict): Column name to ``numpy.ndarray``, ``pandas.Series`` or plain value.
+
+        Returns:
+            bytes: The UTF-8 encoded JSON body.
+        """
+        columns = {
+            key: np.asarray(value).tolist() if hasattr(value, "__array__") else value
+            for key, value in content.items()
+        }
+        return json.dumps(columns, separators=(",", ":")).encode("utf-8")
+
+
+def explanation_records(names, contributions):
+    """
+    Turns the arrays of ``Scorer.explain_batch`` into one mapping per row.
+
+    A mapping per row rather than an object per contribution keeps the number of Python objects
+    built for a large batch, and the size of its JSON, small.
+
+    Args:
+        names (numpy.ndarray): Variable names, rows by ``top_k``.
+        contributions (numpy.ndarray): Contributions, rows by ``top_k``.
+
+    Returns:
+        list of dict: Variable name to contribution per row, largest absolute value first.
+    """
+    return [
+        dict(zip(row_names, row_contributions))
+        for row_names, row_contributions in zip(names.tolist(), contributions.tolist())
+    ]
@@ -0,0 +1,396 @@
+__all__ = [
+    "ShadowComparison",
+    "ShadowPool",
+    "expose_shadows",
+    "parse_shadow_models",
+]
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import joblib
+import numpy as np
+import pandas as pd
+from prometheus_client import Counter, Gauge, Histogram
+
+from statefarm.modeling.scorer import Scorer
+
+
+logger = logging.getLogger("fastapi")
+
+shadow_rows_counter = Counter(
+    "shadow_rows", "Rows scored by a shadow model", ["shadow"]
+)
+shadow_dropped_rows_counter = Counter(
+    "shadow_dropped_rows",
+    "Rows not shadow scored because the primary was busy, the backlog was full or the pool stopped",
+    ["reason"],
+)
+shadow_disagreements_counter = Counter(
+    "shadow_disagreements",
+    "Rows whose business_outcome differs between the primary and a shadow model",
+    ["shadow", "direction"],
+)
+shadow_errors_counter = Counter(
+    "shadow_errors", "Shadow scoring calls that failed", ["shadow"]
+)
+shadow_seconds_histogram = Histogram(
+    "shadow_batch_seconds",
+    "Time spent shadow scoring one request with every shadow model",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+shadow_delta_mean_gauge = Gauge(
+    "shadow_delta_mean", "Mean of shadow minus primary phat", ["shadow"]
+)
+shadow_abs_delta_quantile_gauge = Gauge(
+    "shadow_abs_delta_quantile",
+    "Quantiles of the absolute difference between shadow and primary phats",
+    ["shadow", "quantile"],
+)
+shadow_disagreement_rate_gauge = Gauge(
+    "shadow_disagreement_rate",
+    "Share of rows whose business_outcome differs between the primary and a shadow",
+    ["shadow"],
+)
+
+# Interior edges of the absolute delta sketch; deltas of 0.5 and above share the last bucket.
+ABS_DELTA_EDGES = np.array([1e-4, 1e-3, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5])
+
+
+def parse_shadow_models(spec, base_dir=""):
+    """
+    Parses ``SHADOW_MODELS``: comma-separated ``name=model_path:preprocessor_path`` entries.
+
+    Args:
+        spec (str): The setting, e.g. ``"candidate=models/model.pkl:models/preprocessor.pkl"``.
+        base_dir (str): Directory relative paths are resolved against.
+
+    Returns:
+        list of tuple: ``(name, model_path, preprocessor_path)`` per shadow model.
+
+    Raises:
+        ValueError: If an entry is malformed or a name repeats.
+    """
+    models = []
+    for entry in filter(None, (entry.strip() for entry in spec.split(","))):
+        name, _, paths = entry.partition("=")
+        model_path, _, preprocessor_path = paths.partition(":")
+        if not (name.strip() and model_path and preprocessor_path):
+            raise ValueError(
+                f"Shadow model {entry!r} is not name=model_path:preprocessor_path"
+            )
+        models.append(
+            (
+                name.strip(),
+                os.path.join(base_dir, model_path.strip()),
+                os.path.join(base_dir, preprocessor_path.strip()),
+            )
+        )
+    names = [name for name, _, _ in models]
+    if len(set(names)) < len(names):
+        raise ValueError(f"Shadow model names repeat: {names}")
+    return models
+
+
+class ShadowComparison:
+    """
+    Running comparison of a shadow model's phats with the primary's on the same rows.
+
+    Memory is constant: sums of the deltas, a fixed-bucket sketch of the absolute deltas and the
+    disagreement counts at the decision threshold.
+
+    Attributes:
+        threshold (float): Decision threshold of ``business_outcome``.
+        rows (int): Rows compared.
+        disagreements (dict): Rows the shadow alone calls positive (``shadow_positive``) and the
+            primary alone calls positive (``shadow_negative``).
+    """
+
+    def __init__(self, threshold=0.75):
+        self.threshold = threshold
+        self.rows = 0
+        self.disagreements = {"shadow_positive": 0, "shadow_negative": 0}
+        self._delta_sum = 0.0
+        self._abs_delta_sum = 0.0
+        self._abs_delta_counts = np.zeros(len(ABS_DELTA_EDGES) + 1)
+        self._abs_delta_max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, primary, shadow):
+        """
+        Adds a batch of rows scored by both models.
+
+        Returns:
+            dict: The batch's disagreements, keyed like ``disagreements``.
+        """
+        delta = shadow - primary
+        abs_delta = np.abs(delta)
+        counts = np.bincount(
+            np.searchsorted(ABS_DELTA_EDGES, abs_delta, side="right"),
+            minlength=len(self._abs_delta_counts),
+        )
+        before, after = primary >= self.threshold, shadow >= self.threshold
+        batch = {
+            "shadow_positive": int(np.sum(after & ~before)),
+            "shadow_negative": int(np.sum(before & ~after)),
+        }
+        with self._lock:
+            self.rows += len(delta)
+            self._delta_sum += float(delta.sum())
+            self._abs_delta_sum += float(abs_delta.sum())
+            self._abs_delta_counts += counts
+            self._abs_delta_max = max(self._abs_delta_max, float(abs_delta.max()))
+            for direction, count in batch.items():
+                self.disagreements[direction] += count
+        return batch
+
+    def delta_mean(self):
+        """Mean of shadow minus primary phat, NaN before any row was compared."""
+        return self._delta_sum / self.rows if self.rows else np.nan
+
+    def abs_delta_quantile(self, q):
+        """
+        Approximate quantile of the absolute deltas, interpolated within the sketch's buckets
+        (capped at the largest delta seen, so identical scores give 0).
+
+        Returns:
+            float: The quantile, NaN before any row was compared.
+        """
+        counts = self._abs_delta_counts.copy()
+        if counts.sum() <= 0:
+            return np.nan
+        cumulative = np.cumsum(counts) / counts.sum()
+        bucket = int(np.searchsorted(cumulative, q))
+        edges = np.concatenate([[0.0], ABS_DELTA_EDGES, [1.0]])
+        edges = np.minimum(edges, self._abs_delta_max)
+        below = cumulative[bucket - 1] if bucket else 0.0
+        share = (q - below) / max(cumulative[bucket] - below, 1e-12)
+        return float(edges[bucket] + share * (edges[bucket + 1] - edges[bucket]))
+
+    def disagreement_rate(self):
+        """Share of compared rows whose ``business_outcome`` differs, NaN before any row."""
+        return sum(self.disagreements.values()) / self.rows if self.rows else np.nan
+
+    def report(self):
+        """
+        Summary of the comparison so far.
+
+        Returns:
+            dict: Rows, mean delta and absolute delta, absolute delta quantiles and
+            disagreements.
+        """
+        return {
+            "rows": self.rows,
+            "delta_mean": self.delta_mean(),
+            "abs_delta_mean": (
+                self._abs_delta_sum / self.rows if self.rows else np.nan
+            ),
+            "abs_delta_p50": self.abs_delta_quantile(0.5),
+            "abs_delta_p99": self.abs_delta_quantile(0.99),
+            "disagreement_rate": self.disagreement_rate(),
+            **self.disagreements,
+        }
+
+
+class ShadowPool:
+    """
+    Scores the primary model's inputs with shadow models in the background.
+
+    ``submit`` is called after the primary has scored a request, with the request's validated
+    raw inputs and the primary's phats, and returns at once: the shadow models score the rows
+    on the pool's own threads and only update ``comparisons`` and the ``shadow_*`` metrics, so
+    a slow or failing shadow never touches the response. Shadows whose preprocessors are
+    identical (same ``joblib.hash``) are grouped, so each group transforms the rows once and
+    every model in it scores the shared transformed frame.
+
+    Shadow work is best effort: rows are dropped instead of queued when ``busy`` reports that
+    the primary is under load, or when more than ``max_pending_rows`` rows already wait for the
+    shadows. The pool's threads share the interpreter with the primary, so it should stay small.
+
+    Attributes:
+        shadows (dict): Shadow name to its ``Scorer``.
+        groups (list of list): Names of the shadows sharing one preprocessor.
+        comparisons (dict): Shadow name to its ``ShadowComparison`` with the primary.
+        max_pending_rows (int): Most rows submitted but not yet shadow scored.
+        busy (callable, optional): Returns True while the primary is under load.
+        pending_rows (int): Rows submitted but not yet shadow scored.
+    """
+
+    def __init__(
+        self, shadows, threshold=0.75, max_workers=1, max_pending_rows=20000, busy=None
+    ):
+        self.shadows = dict(shadows)
+        groups = {}
+        for name, scorer in self.shadows.items():
+            groups.setdefault(joblib.hash(scorer.preprocessor), []).append(name)
+        self.groups = list(groups.values())
+        self.comparisons = {name: ShadowComparison(threshold) for name in self.shadows}
+        self.max_pending_rows = max_pending_rows
+        self.busy = busy
+        self.pending_rows = 0
+        self._lock = threading.Lock()
+        self._futures = set()
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="shadow"
+        )
+
+    @classmethod
+    def from_paths(cls, models, **kwargs):
+        """
+        Loads every shadow model and preprocessor.
+
+        Args:
+            models (list of tuple): ``(name, model_path, preprocessor_path)``, e.g. from
+                ``parse_shadow_models``.
+            **kwargs: Passed to ``ShadowPool``.
+
+        Returns:
+            ShadowPool: The pool.
+        """
+        return cls(
+            {
+                name: Scorer.from_paths(model_path, preprocessor_path)
+                for name, model_path, preprocessor_path in models
+            },
+            **kwargs,
+        )
+
+    def submit(self, columns, phat):
+        """
+        Queues rows the primary scored for the shadows, or drops them under load.
+
+        Args:
+            columns (dict): Raw input column name to array of values, taken before the primary
+                converted them.
+            phat (numpy.ndarray): The primary's phats of the rows.
+
+        Returns:
+            bool: Whether the rows were queued.
+        """
+        rows = len(phat)
+        reason = "busy" if self.busy is not None and self.busy() else None
+        if reason is None:
+            with self._lock:
+                if self.pending_rows + rows > self.max_pending_rows:
+                    reason = "backlog"
+                else:
+                    self.pending_rows += rows
+        if reason is not None:
+            shadow_dropped_rows_counter.labels(reason=reason).inc(rows)
+            return False
+        try:
+            future = self.executor.submit(
+                self.score, columns, np.asarray(phat, dtype=np.float64)
+            )
+        except RuntimeError:
+            # The pool is shutting down; the primary's response must not notice.
+            with self._lock:
+                self.pending_rows -= rows
+            shadow_dropped_rows_counter.labels(reason="shutdown").inc(rows)
+            return False
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(lambda future: self._release(future, rows))
+        return True
+
+    def submit_row(self, row, phat):
+        """Queues one row, field name to value, with the primary's phat; see ``submit``."""
+        return self.submit({key: [value] for key, value in row.items()}, [phat])
+
+    def _release(self, future, rows):
+        # Runs when the rows were scored, failed, or were cancelled by ``shutdown``.
+        with self._lock:
+            self.pending_rows -= rows
+            self._futures.discard(future)
+        if future.cancelled():
+            shadow_dropped_rows_counter.labels(reason="shutdown").inc(rows)
+
+    def score(self, columns, phat):
+        """
+        Scores rows with every shadow and compares them with the primary's phats.
+
+        Args:
+            columns (dict): Raw input column name to array of values.
+            phat (numpy.ndarray): The primary's phats of the rows.
+
+        Returns:
+            dict: Shadow name to its phats, for the shadows that scored without error.
+        """
+        start = time.perf_counter()
+        frame = pd.DataFrame(columns)
+        scores = {}
+        for names in self.groups:
+            try:
+                # The preprocessor converts its input in place.
+                chunk = frame.copy() if len(self.groups) > 1 else frame
+                transformed = self.shadows[names[0]].preprocessor.transform(chunk)
+            except Exception as e:
+                logger.error(f"Shadow preprocessing error ({', '.join(names)}): {e}")
+                for name in names:
+                    shadow_errors_counter.labels(shadow=name).inc()
+                continue
+            for name in names:
+                try:
+                    scores[name] = self.shadows[name].score_transformed(transformed)
+                except Exception as e:
+                    logger.error(f"Shadow scoring error ({name}): {e}")
+                    shadow_errors_counter.labels(shadow=name).inc()
+                    continue
+                shadow_rows_counter.labels(shadow=name).inc(len(phat))
+                batch = self.comparisons[name].observe(phat, scores[name])
+                for direction, count in batch.items():
+                    if count:
+                        shadow_disagreements_counter.labels(
+                            shadow=name, direction=direction
+                        ).inc(count)
+        shadow_seconds_histogram.observe(time.perf_counter() - start)
+        return scores
+
+    def report(self):
+        """
+        Comparison of every shadow with the primary.
+
+        Returns:
+            pandas.DataFrame: ``ShadowComparison.report`` and ``model_version`` per shadow.
+        """
+        return pd.DataFrame(
+            [
+                {
+                    "shadow": name,
+                    "model_version": self.shadows[name].model_version,
+                    **comparison.report(),
+                }
+                for name, comparison in self.comparisons.items()
+            ]
+        ).set_index("shadow")
+
+    def shutdown(self):
+        """Drops queued shadow work and lets running calls finish in the background."""
+        # ``shutdown(cancel_futures=True)`` needs Python 3.9: refuse new work first, then cancel
+        # what is still queued; running calls cannot be cancelled and finish on their own.
+        self.executor.shutdown(wait=False)
+        with self._lock:
+            futures = list(self._futures)
+        for future in futures:
+            future.cancel()
+
+
+def expose_shadows(pool, quantiles=(0.5, 0.9, 0.99)):
+    """
+    Publishes each shadow's ``shadow_delta_mean``, ``shadow_abs_delta_quantile`` and
+    ``shadow_disagreement_rate`` on ``/metrics``, computed when metrics are scraped.
+    """
+    for name, comparison in pool.comparisons.items():
+        shadow_delta_mean_gauge.labels(shadow=name).set_function(comparison.delta_mean)
+        shadow_disagreement_rate_gauge.labels(shadow=name).set_function(
+            comparison.disagreement_rate
+        )
+        for q in quantiles:
+            shadow_abs_delta_quantile_gauge.labels(
+                shadow=name, quantile=str(q)
+            ).set_function(
+                lambda comparison=comparison, q=q: comparison.abs_delta_quantile(q)
+            )
@@ -0,0 +1,380 @@
+__all__ = [
+    "FIELDS",
+    "NUMERIC_FIELDS",
+    "STRING_FIELDS",
+    "ScoringSocketClient",
+    "ScoringSocketServer",
+    "SocketScoringError",
+    "decode_rows",
+    "decode_scores",
+    "encode_rows",
+    "encode_scores",
+]
+
+import asyncio
+import logging
+import os
+import socket
+import struct
+import time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from prometheus_client import Counter, Histogram
+
+from .admission import AdmissionRejected
+from .models import PredictionData
+
+
+logger = logging.getLogger("fastapi")
+
+socket_frames_counter = Counter(
+    "socket_frames", "Frames answered on the scoring socket", ["status"]
+)
+socket_frame_seconds_histogram = Histogram(
+    "socket_frame_seconds",
+    "Time from reading a scoring socket frame to writing its answer",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+)
+
+# Column order of the binary framing: the fields of PredictionData, numeric ones packed as a
+# float64 matrix and string ones as length-prefixed UTF-8.
+FIELDS = list(PredictionData.model_fields)
+STRING_FIELDS = [
+    name
+    for name, field in PredictionData.model_fields.items()
+    if field.annotation == Optional[str]
+]
+NUMERIC_FIELDS = [name for name in FIELDS if name not in STRING_FIELDS]
+
+STATUS_OK = 0
+STATUS_BAD_REQUEST = 1
+STATUS_OVERLOADED = 2
+STATUS_ERROR = 3
+STATUS_NAMES = {
+    STATUS_OK: "ok",
+    STATUS_BAD_REQUEST: "bad_request",
+    STATUS_OVERLOADED: "overloaded",
+    STATUS_ERROR: "error",
+}
+
+_LENGTH = struct.Struct("<I")
+_STATUS = struct.Struct("<B")
+NULL_LENGTH = -1
+
+
+def encode_rows(frame):
+    """
+    Packs raw input rows into a request payload (without the frame's length prefix).
+
+    Layout, little-endian: ``uint32`` row count; the ``NUMERIC_FIELDS`` as a row-major
+    ``float64`` matrix, NaN for missing; then per ``STRING_FIELDS`` column, ``int32`` byte lengths
+    of every row (``-1`` for null) followed by the concatenated UTF-8 bytes.
+
+    Args:
+        frame (pandas.DataFrame or dict): Raw input rows, or a single row as a dict; absent
+            fields are sent as missing.
+
+    Returns:
+        bytes: The payload.
+    """
+    if isinstance(frame, dict):
+        rows = 1
+        numeric = np.array([frame.get(name) for name in NUMERIC_FIELDS], dtype="<f8")
+        strings = {name: [frame.get(name)] for name in STRING_FIELDS}
+    else:
+        rows = len(frame)
+        frame = frame.reindex(columns=FIELDS)
+        numeric = frame[NUMERIC_FIELDS].to_numpy(dtype="<f8", na_value=np.nan)
+        strings = {name: frame[name].to_numpy(dtype=object) for name in STRING_FIELDS}
+    parts = [_LENGTH.pack(rows), numeric.tobytes()]
+    for column in STRING_FIELDS:
+        encoded = [
+            None if pd.isna(value) else str(value).encode() for value in strings[column]
+        ]
+        lengths = [NULL_LENGTH if value is None else len(value) for value in encoded]
+        parts.append(np.array(lengths, dtype="<i4").tobytes())
+        parts.append(b"".join(value for value in encoded if value))
+    return b"".join(parts)
+
+
+def decode_rows(payload):
+    """
+    Unpacks a request payload written by ``encode_rows``.
+
+    Returns:
+        pandas.DataFrame: The rows with every field of ``PredictionData``, in ``FIELDS`` order.
+
+    Raises:
+        ValueError: If the payload does not match the layout.
+    """
+    view = memoryview(payload)
+    if len(view) < _LENGTH.size:
+        raise ValueError("Payload is shorter than its row count")
+    (rows,) = _LENGTH.unpack_from(view)
+    offset = _LENGTH.size
+    numeric_bytes = rows * len(NUMERIC_FIELDS) * 8
+    if len(view) < offset + numeric_bytes:
+        raise ValueError("Payload is shorter than its numeric block")
+    numeric = np.frombuffer(
+        view, dtype="<f8", count=rows * len(NUMERIC_FIELDS), offset=offset
+    )
+    offset += numeric_bytes
+    # Copied into one writable block, so the preprocessor never writes to the payload's buffer.
+    frame = pd.DataFrame(
+        numeric.reshape(rows, len(NUMERIC_FIELDS)), columns=NUMERIC_FIELDS, copy=True
+    )
+
+    for column in STRING_FIELDS:
+        if len(view) < offset + rows * 4:
+            raise ValueError(f"Payload is shorter than the lengths of {column}")
+        lengths = np.frombuffer(view, dtype="<i4", count=rows, offset=offset)
+        offset += rows * 4
+        sizes = np.maximum(lengths, 0)
+        ends = offset + np.cumsum(sizes)
+        if rows and ends[-1] > len(view):
+            raise ValueError(f"Payload is shorter than the strings of {column}")
+        starts = ends - sizes
+        values = np.empty(rows, dtype=object)
+        for i in np.flatnonzero(lengths != NULL_LENGTH):
+            start, stop = starts[i], ends[i]
+            values[i] = bytes(view[start:stop]).decode()
+        frame.insert(FIELDS.index(column), column, values)
+        offset = int(ends[-1]) if rows else offset
+    if offset != len(view):
+        raise ValueError("Payload has trailing bytes")
+    return frame
+
+
+def encode_scores(phat, business_outcome):
+    """Packs scores into a success payload: status, ``uint32`` rows, ``float64`` phats, ``uint8`` outcomes."""
+    phat = np.asarray(phat, dtype="<f8")
+    return b"".join(
+        [
+            _STATUS.pack(STATUS_OK),
+            _LENGTH.pack(len(phat)),
+            phat.tobytes(),
+            np.asarray(business_outcome, dtype=np.uint8).tobytes(),
+        ]
+    )
+
+
+def encode_error(status, message):
+    """Packs a failure payload: status followed by a UTF-8 message."""
+    return _STATUS.pack(status) + message.encode()
+
+
+def decode_scores(payload):
+    """
+    Unpacks a response payload.
+
+    Returns:
+        tuple: ``phat`` (float64 array) and ``business_outcome`` (uint8 array).
+
+    Raises:
+        SocketScoringError: If the server answered with an error.
+    """
+    (status,) = _STATUS.unpack_from(payload)
+    if status != STATUS_OK:
+        message = bytes(payload[1:]).decode()
+        raise SocketScoringError(status, message)
+    (rows,) = _LENGTH.unpack_from(payload, _STATUS.size)
+    offset = _STATUS.size + _LENGTH.size
+    phat = np.frombuffer(payload, dtype="<f8", count=rows, offset=offset)
+    outcome = np.frombuffer(
+        payload, dtype=np.uint8, count=rows, offset=offset + rows * 8
+    )
+    return phat, outcome
+
+
+class SocketScoringError(Exception):
+    """The scoring socket answered a frame with an error status."""
+
+    def __init__(self, status, message):
+        super().__init__(f"{STATUS_NAMES.get(status, status)}: {message}")
+        self.status = status
+        self.message = message
+
+
+async def _accepts_connections(path):
+    """Whether a process is listening on the Unix socket at ``path``."""
+    try:
+        _, writer = await asyncio.open_unix_connection(path)
+    except OSError:
+        return False
+    writer.close()
+    await writer.wait_closed()
+    return True
+
+
+class ScoringSocketServer:
+    """
+    Second listener of the API on a Unix domain socket, for callers on the same host.
+
+    Each request is a frame: a ``uint32`` little-endian payload length followed by an
+    ``encode_rows`` payload. Each answer is a frame holding an ``encode_scores`` payload or an
+    error status. A connection may send any number of frames and gets their answers in order.
+    There is no HTTP, JSON or pydantic on this path, so field values are not validated beyond
+    the framing; the preprocessor handles them as it handles ``/batch_predict`` rows.
+
+    Attributes:
+        path (str): The socket file.
+        score (callable): Coroutine function taking a dataframe of raw rows and returning
+            ``(phat, business_outcome)``; the API passes one that runs on its lanes.
+        max_frame_bytes (int): Larger frames are rejected and the connection is closed.
+    """
+
+    def __init__(self, path, score, max_frame_bytes=64 << 20):
+        self.path = path
+        self.score = score
+        self.max_frame_bytes = max_frame_bytes
+        self._server = None
+        self._inode = None
+
+    async def start(self):
+        """
+        Starts listening, replacing a stale socket file left by a process that exited.
+
+        With several API workers the first one to start serves the socket; the others find it
+        live, leave it alone and serve HTTP only.
+
+        Returns:
+            bool: Whether this process listens on the socket.
+        """
+        if os.path.exists(self.path):
+            if await _accepts_connections(self.path):
+                logger.warning(
+                    f"Scoring socket {self.path} is served by another process, not listening"
+                )
+                return False
+            os.remove(self.path)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+        self._inode = os.stat(self.path).st_ino
+        logger.info(f"Scoring socket listening on {self.path}")
+        return True
+
+    async def close(self):
+        """Stops listening and removes the socket file, if this process created it."""
+        if self._server is None:
+            return
+        self._server.close()
+        await self._server.wait_closed()
+        self._server = None
+        try:
+            if os.stat(self.path).st_ino == self._inode:
+                os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    async def _answer(self, payload):
+        try:
+            frame = decode_rows(payload)
+        except ValueError as e:
+            return STATUS_BAD_REQUEST, encode_error(STATUS_BAD_REQUEST, str(e))
+        try:
+            phat, business_outcome = await self.score(frame)
+        except AdmissionRejected as e:
+            message = f"Server overloaded ({e.reason}), retry after {e.retry_after}s"
+            return STATUS_OVERLOADED, encode_error(STATUS_OVERLOADED, message)
+        except Exception as e:
+            logger.error(f"Socket prediction error: {str(e)}")
+            return STATUS_ERROR, encode_error(STATUS_ERROR, "Error during prediction")
+        return STATUS_OK, encode_scores(phat, business_outcome)
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(_LENGTH.size)
+                except asyncio.IncompleteReadError:
+                    break
+                (length,) = _LENGTH.unpack(header)
+                if length > self.max_frame_bytes:
+                    answer = encode_error(
+                        STATUS_BAD_REQUEST,
+                        f"Frame of {length} bytes exceeds {self.max_frame_bytes}",
+                    )
+                    writer.write(_LENGTH.pack(len(answer)) + answer)
+                    socket_frames_counter.labels(status="bad_request").inc()
+                    break
+                payload = await reader.readexactly(length)
+                start = time.perf_counter()
+                status, answer = await self._answer(payload)
+                writer.write(_LENGTH.pack(len(answer)) + answer)
+                await writer.drain()
+                socket_frame_seconds_histogram.observe(time.perf_counter() - start)
+                socket_frames_counter.labels(status=STATUS_NAMES[status]).inc()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+class ScoringSocketClient:
+    """
+    Blocking client of ``ScoringSocketServer`` that keeps one connection open.
+
+    Attributes:
+        path (str): The socket file.
+        timeout (float or None): Seconds to wait for an answer.
+    """
+
+    def __init__(self, path, timeout=30.0):
+        self.path = path
+        self.timeout = timeout
+        self._socket = None
+
+    def _connect(self):
+        if self._socket is None:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.settimeout(self.timeout)
+            self._socket.connect(self.path)
+        return self._socket
+
+    def _read_exactly(self, size):
+        buffer = bytearray(size)
+        view, received = memoryview(buffer), 0
+        while received < size:
+            count = self._socket.recv_into(view[received:])
+            if not count:
+                raise ConnectionError("Scoring socket closed the connection")
+            received += count
+        return buffer
+
+    def score(self, frame):
+        """
+        Scores raw input rows.
+
+        Args:
+            frame (pandas.DataFrame or dict): Rows, or a single row as a dict.
+
+        Returns:
+            tuple: ``phat`` (float64 array) and ``business_outcome`` (uint8 array), in row order.
+
+        Raises:
+            SocketScoringError: If the server answered with an error status.
+        """
+        payload = encode_rows(frame)
+        connection = self._connect()
+        try:
+            connection.sendall(_LENGTH.pack(len(payload)) + payload)
+            (length,) = _LENGTH.unpack(self._read_exactly(_LENGTH.size))
+            return decode_scores(self._read_exactly(length))
+        except (OSError, ConnectionError):
+            self.close()
+            raise
+
+    def close(self):
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
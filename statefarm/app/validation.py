@@ -0,0 +1,98 @@
+__all__ = ["validate_rows"]
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import infer_dtype, is_float_dtype
+
+from statefarm.data.data_preparation import parse_formatted_numbers
+
+from .models import X5_VALUES
+from .socket_transport import FIELDS, NUMERIC_FIELDS, STRING_FIELDS
+
+
+_FIELD_SET = frozenset(FIELDS)
+
+
+def _string_failures(column, field, convert_columns):
+    """Positions of the invalid values of a string field, with their message."""
+    present = column.notna().to_numpy()
+    usable = present
+    if infer_dtype(column, skipna=True) not in ("string", "empty"):
+        strings = np.fromiter(
+            (isinstance(value, str) for value in column), bool, len(column)
+        )
+        usable = present & strings
+        yield (
+            np.flatnonzero(present & ~strings),
+            field,
+            "Input should be a valid string",
+        )
+    if field == "x5":
+        yield (
+            np.flatnonzero(usable & ~column.isin(X5_VALUES).to_numpy()),
+            field,
+            f"x5 must be one of {', '.join(X5_VALUES)}",
+        )
+    elif field in convert_columns:
+        numbers = parse_formatted_numbers(column.where(usable))
+        yield (
+            np.flatnonzero(usable & numbers.isna().to_numpy()),
+            field,
+            "Input should be a formatted number such as $1,234.50 or 12.5%",
+        )
+
+
+def validate_rows(records, convert_columns=()):
+    """
+    Validates request rows column by column instead of one ``PredictionData`` at a time.
+
+    The checks are those of ``PredictionData`` (every field present, numbers or null for numeric
+    fields, strings or null for string fields, ``x5`` one of ``X5_VALUES``) plus the conversion
+    the preprocessor applies to ``convert_columns``. Each check runs once per column over the
+    whole batch, so a bad row is masked out instead of failing the batch.
+
+    Args:
+        records (list of dict): Request rows, field name to value.
+        convert_columns (list of str): Formatted number columns, e.g. the preprocessor's
+            ``columns_to_convert``.
+
+    Returns:
+        tuple: The rows as a frame with every field of ``PredictionData`` in order and numeric
+        fields parsed, a boolean array that is True for valid rows, and a dict from the index of
+        every invalid row to its errors, each ``{"field": ..., "message": ...}``.
+    """
+    frame = pd.DataFrame(records).reindex(columns=FIELDS)
+    failures = []
+    incomplete = [
+        index for index, record in enumerate(records) if not _FIELD_SET <= record.keys()
+    ]
+    for index in incomplete:
+        for field in sorted(_FIELD_SET - records[index].keys(), key=FIELDS.index):
+            failures.append(([index], field, "Field required"))
+
+    for field in NUMERIC_FIELDS:
+        column = frame[field]
+        if is_float_dtype(column.dtype):
+            continue
+        numbers = pd.to_numeric(column, errors="coerce").astype(np.float64)
+        failures.append(
+            (
+                np.flatnonzero(numbers.isna() & column.notna()),
+                field,
+                "Input should be a valid number",
+            )
+        )
+        frame[field] = numbers
+
+    for field in STRING_FIELDS:
+        failures.extend(_string_failures(frame[field], field, convert_columns))
+
+    errors = {}
+    for indices, field, message in failures:
+        for index in indices:
+            errors.setdefault(int(index), []).append(
+                {"field": field, "message": message}
+            )
+    valid = np.ones(len(frame), dtype=bool)
+    valid[list(errors)] = False
+    return frame, valid, dict(sorted(errors.items()))
@@ -0,0 +1,155 @@
+__all__ = ["run_warmup", "synthetic_rows", "warmup_plan"]
+
+import copy
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+
+from .models import PredictionData, PredictionRequest, RowsBatchPredictionRequest
+from .responses import ColumnarJSONResponse
+from .socket_transport import decode_rows, encode_rows
+from .validation import validate_rows
+
+
+logger = logging.getLogger("fastapi")
+
+MISSING_RATE = 0.02
+# Per-row endpoints score every row alone, so larger batches warm nothing new.
+SIMPLE_WARMUP_ROWS = 10
+
+
+def _money(value):
+    text = f"${abs(value):,.2f}"
+    return f"({text})" if value < 0 else text
+
+
+def synthetic_rows(preprocessor, rows, seed=13):
+    """
+    Builds distinct request rows shaped like real traffic from a fitted preprocessor.
+
+    Numeric fields are drawn around the scaler's training mean and scale, ``x12`` and ``x63``
+    are formatted as money and percentages, categorical fields take the categories seen in
+    training, and a few values are left missing, so every branch of the preprocessing runs.
+
+    Args:
+        preprocessor (DataPreprocessor): The fitted preprocessor.
+        rows (int): Number of rows.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        list of dict: One dict per row with every field of ``PredictionData``.
+    """
+    rng = np.random.default_rng(seed)
+    names = list(getattr(preprocessor.imputer, "feature_names_in_", []))
+    means = dict(zip(names, preprocessor.scaler.mean_))
+    scales = dict(zip(names, preprocessor.scaler.scale_))
+    columns = {}
+    for field in PredictionData.model_fields:
+        if field in preprocessor.dummy_lookup:
+            categories = np.asarray(preprocessor.dummy_lookup[field][0], dtype=object)
+            values = rng.choice(categories, rows) if len(categories) else [None] * rows
+        else:
+            values = rng.normal(means.get(field, 0.0), scales.get(field, 1.0), rows)
+            if field == "x12":
+                values = [_money(value) for value in values]
+            elif field == "x63":
+                values = [f"{value:.2f}%" for value in values]
+        values = pd.Series(values, dtype=object)
+        values[rng.random(rows) < MISSING_RATE] = None
+        columns[field] = values
+    records = pd.DataFrame(columns).to_dict(orient="records")
+    return [
+        {key: None if pd.isna(value) else value for key, value in record.items()}
+        for record in records
+    ]
+
+
+def warmup_plan(scorer, batch_sizes, seed=13):
+    """
+    Lists one call per endpoint code path and batch size, using synthetic rows.
+
+    Each call runs what its endpoint runs between the request body and the response body
+    (validation, frame construction, scoring, response encoding) without touching the request
+    metrics or the prediction log.
+
+    Args:
+        scorer (Scorer): The scorer the endpoints use.
+        batch_sizes (list of int): Batch sizes to warm; ``/predict`` is only warmed with one row.
+        seed (int): Seed of the synthetic rows.
+
+    Returns:
+        list of tuple: ``(path, rows, call)``, ``call`` taking no arguments.
+    """
+    rows = synthetic_rows(scorer.preprocessor, max(batch_sizes), seed)
+    scorer = copy.copy(scorer)
+    scorer.dedup_observer = scorer.drift_monitor = None
+
+    def predict(batch):
+        return [
+            scorer.score_one(PredictionRequest(data=row).data.dict()) for row in batch
+        ]
+
+    def batch_predict(batch):
+        request = RowsBatchPredictionRequest(data=batch)
+        input_df, _, _ = validate_rows(
+            request.data, scorer.preprocessor.columns_to_convert
+        )
+        phat, business_outcome = scorer.score_batch(input_df, copy=False)
+        ColumnarJSONResponse(
+            {"phat": phat, "business_outcome": business_outcome, "model_version": ""}
+        )
+        return jsonable_encoder(
+            pd.DataFrame({"phat": phat, "business_outcome": business_outcome}).to_dict(
+                orient="records"
+            )
+        )
+
+    def socket(batch):
+        return scorer.score_batch(
+            decode_rows(encode_rows(pd.DataFrame(batch))), copy=False
+        )
+
+    plan = [("/predict", 1, lambda: predict(rows[:1]))]
+    for size in batch_sizes:
+        batch = rows[:size]
+        if size <= SIMPLE_WARMUP_ROWS:
+            plan.append(("/batch_predict_simple", size, lambda b=batch: predict(b)))
+        plan.append(("/batch_predict", size, lambda b=batch: batch_predict(b)))
+        plan.append(("socket", size, lambda b=batch: socket(b)))
+    return plan
+
+
+async def run_warmup(plan, submit, repeats=3):
+    """
+    Runs every call of a warmup plan and reports its cold and warm latency.
+
+    Args:
+        plan (list of tuple): From ``warmup_plan``.
+        submit (callable): ``submit(path, rows, call)`` returning an awaitable of the call's
+            result, e.g. running it on the lane that serves ``path``.
+        repeats (int): Timed calls after the first one; their median is the warm latency.
+
+    Returns:
+        pandas.DataFrame: ``cold_ms`` and ``warm_ms`` per path and batch size.
+    """
+    report = []
+    for path, rows, call in plan:
+        latencies = []
+        for _ in range(1 + repeats):
+            start = time.perf_counter()
+            await submit(path, rows, call)
+            latencies.append((time.perf_counter() - start) * 1000)
+        report.append(
+            {
+                "path": path,
+                "rows": rows,
+                "cold_ms": latencies[0],
+                "warm_ms": float(np.median(latencies[1:])) if repeats else np.nan,
+            }
+        )
+    report = pd.DataFrame(report).set_index(["path", "rows"])
+    logger.info("Warmup latency (first call vs. warm median):\n%s", report.round(2))
+    return report
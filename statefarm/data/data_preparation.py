@@ -1,13 +1,50 @@
-__all__ = ["DataSplitter", "DataPreprocessor"]
+__all__ = [
+    "DataSplitter",
+    "DataPreprocessor",
+    "SparseDesign",
+    "parse_formatted_numbers",
+]
 
 import pandas as pd
 import logging
 import numpy as np
+import scipy.sparse as sp
 
 from sklearn.model_selection import train_test_split
 from sklearn.impute import SimpleImputer
 from sklearn.preprocessing import StandardScaler
 
+# Largest absolute difference in predicted probability between compact and default mode.
+COMPACT_PHAT_TOLERANCE = 1e-4
+# Money and percentage formatting stripped before parsing: "($1,234.50)" -> "-1234.50".
+_NUMBER_FORMAT = str.maketrans({"$": None, ",": None, "%": None, "(": "-", ")": None})
+
+
+def parse_formatted_numbers(values):
+    """
+    Parses monetary and percentage strings such as ``"($1,234.50)"`` or ``"12.5%"`` into floats.
+
+    The formatting characters are stripped with one ``str.translate`` per value and the rest is
+    parsed by ``pd.to_numeric``, so a whole column is converted without any regular expression.
+    Values that are numbers already are kept.
+
+    Parameters:
+        values (pandas.Series): The strings, possibly mixed with numbers and missing values.
+
+    Returns:
+        pandas.Series: float64 values, NaN where a value is missing or does not parse.
+    """
+    if values.dtype == object and values.notna().any():
+        try:
+            stripped = values.str.translate(_NUMBER_FORMAT)
+        except AttributeError:
+            # No strings at all, only numbers and missing values.
+            stripped = values
+        else:
+            stripped = stripped.where(stripped.notna(), values)
+        values = stripped
+    return pd.to_numeric(values, errors="coerce").astype(np.float64)
+
 
 class DataSplitter:
     """
@@ -106,6 +143,82 @@ class DataSplitter:
             logging.info("No test set created.")
 
 
+class SparseDesign:
+    """
+    Output of the sparse preprocessing mode: a dense numeric block next to a CSR dummy block.
+
+    Selecting columns (``design[columns]``) returns a dense dataframe, so code that scores a few
+    selected variables keeps working unchanged, while ``to_csr`` hands the whole design to
+    estimators that accept sparse input without ever densifying the dummies.
+
+    Attributes:
+        numeric (pandas.DataFrame): The imputed and scaled numeric columns, plus any joined column
+                                    such as the target.
+        dummies (scipy.sparse.csr_matrix): The dummy indicators, one column per ``dummy_names``.
+        dummy_names (list of str): Names of the dummy columns.
+    """
+
+    def __init__(self, numeric, dummies, dummy_names):
+        self.numeric = numeric
+        self.dummies = dummies
+        self.dummy_names = list(dummy_names)
+
+    @property
+    def columns(self):
+        """All column names, numeric first."""
+        return list(self.numeric.columns) + self.dummy_names
+
+    @property
+    def index(self):
+        return self.numeric.index
+
+    def __len__(self):
+        return len(self.numeric)
+
+    def __getitem__(self, key):
+        """Returns one column as a series, or a list of columns as a dense dataframe."""
+        if isinstance(key, str):
+            return self[[key]][key]
+        positions = {name: i for i, name in enumerate(self.dummy_names)}
+        wanted = [positions[name] for name in key if name in positions]
+        dense = dict(
+            zip(
+                [self.dummy_names[i] for i in wanted],
+                self.dummies[:, wanted].toarray().T,
+            )
+        )
+        return pd.DataFrame(
+            {
+                name: dense[name] if name in dense else self.numeric[name].to_numpy()
+                for name in key
+            },
+            index=self.index,
+        )
+
+    def join(self, other):
+        """Adds the columns of ``other`` (aligned on the index) to the numeric block."""
+        return SparseDesign(self.numeric.join(other), self.dummies, self.dummy_names)
+
+    def reset_index(self, drop=True):
+        return SparseDesign(
+            self.numeric.reset_index(drop=drop), self.dummies, self.dummy_names
+        )
+
+    def to_csr(self, exclude=()):
+        """
+        Stacks the numeric block, minus the ``exclude`` columns, and the dummies into one CSR matrix.
+
+        Returns:
+            tuple: The ``scipy.sparse.csr_matrix`` and its column names.
+        """
+        numeric = self.numeric.drop(columns=list(exclude))
+        matrix = sp.hstack(
+            [sp.csr_matrix(numeric.to_numpy(dtype=np.float64)), self.dummies],
+            format="csr",
+        )
+        return matrix, list(numeric.columns) + self.dummy_names
+
+
 class DataPreprocessor:
     """
     A class for preprocessing data for machine learning tasks.
@@ -123,9 +236,23 @@ class DataPreprocessor:
         imputer (SimpleImputer): The imputer object used for missing value imputation.
         scaler (StandardScaler): The scaler object used for feature scaling.
         dummy_columns (dict): A dictionary to store the columns created after dummy encoding.
+        dummy_lookup (dict): Per categorical column, the category to dummy column offset table
+                             and the offset of the NaN column, used to encode by direct indexing.
+        compact (bool): Whether to use the compact (float32/uint8/category) representation.
+        sparse (bool): Whether to return a ``SparseDesign`` (dense numeric block, CSR dummies).
+
+    Note:
+        In compact mode the categorical inputs are cast to ``category`` dtype, the dummies are
+        encoded as ``uint8`` indicators and every output column is written into one preallocated,
+        column-major ``float32`` matrix, so the result is a single contiguous block rather than the
+        product of repeated ``pd.concat`` calls. Imputation and scaling are applied in place in
+        ``float32``; predicted probabilities stay within ``COMPACT_PHAT_TOLERANCE`` (1e-4 absolute)
+        of the default ``float64`` path.
 
     Methods:
         fit_transform(df): Fits the preprocessor to the data and transforms the data.
+        partial_fit(df): Accumulates the fitting statistics of one chunk of training data.
+        finalize(): Fits the preprocessor from the statistics accumulated by ``partial_fit``.
         transform(df): Transforms a new dataset using the transformations fitted on the training data.
     """
 
@@ -135,6 +262,8 @@ class DataPreprocessor:
         columns_to_impute,
         columns_to_dummy,
         target_column=None,
+        compact=False,
+        sparse=False,
     ):
         """
         Initializes the DataPreprocessor with specified columns for conversion, imputation,
@@ -145,7 +274,11 @@ class DataPreprocessor:
             columns_to_impute (list of str): Columns for which missing values will be imputed.
             columns_to_dummy (list of str): Categorical columns to be converted into dummy variables.
             target_column (str, optional): The name of the target variable column. Default is None.
+            compact (bool, optional): Produce a single float32 matrix instead of float64 frames. Default is False.
+            sparse (bool, optional): Produce a ``SparseDesign`` with CSR dummies. Default is False.
         """
+        if compact and sparse:
+            raise ValueError("compact and sparse modes are mutually exclusive")
         self.columns_to_convert = columns_to_convert
         self.columns_to_impute = columns_to_impute
         self.columns_to_dummy = columns_to_dummy
@@ -153,6 +286,19 @@ class DataPreprocessor:
         self.imputer = SimpleImputer(missing_values=np.nan, strategy="mean")
         self.scaler = StandardScaler()
         self.dummy_columns = {}
+        self.dummy_lookup = {}
+        self.compact = compact
+        self.sparse = sparse
+        self._running = None
+
+    def __setstate__(self, state):
+        # Preprocessors pickled before compact mode and the lookup tables existed lack them.
+        state.setdefault("compact", False)
+        state.setdefault("sparse", False)
+        state.setdefault("_running", None)
+        self.__dict__.update(state)
+        if "dummy_lookup" not in state:
+            self.dummy_lookup = self._lookup_from_columns()
 
     def _convert_columns(self, df):
         """
@@ -163,23 +309,232 @@ class DataPreprocessor:
 
         Returns:
             pandas.DataFrame: The dataframe with converted columns.
+
+        Raises:
+            ValueError: If a value is neither missing nor a number once its formatting is removed.
         """
 
         for col in self.columns_to_convert:
             if df[col].dtype == object:
-                df[col] = (
-                    df[col]
-                    .replace(
-                        {r"\$": "", ",": "", "%": "", r"\(": "-", r"\)": ""}, regex=True
+                numbers = parse_formatted_numbers(df[col])
+                invalid = numbers.isna() & df[col].notna()
+                if invalid.any():
+                    raise ValueError(
+                        f"Column {col} has values that are not numbers: "
+                        f"{df[col][invalid].unique()[:5].tolist()}"
                     )
-                    .astype(float)
-                )
+                df[col] = numbers
             else:
                 logging.warning(
                     f"Column {col} is not of string type and will not be converted."
                 )
         return df
 
+    def _to_categories(self, df):
+        """
+        Casts the columns to be dummy encoded to ``category`` dtype (compact mode).
+
+        Parameters:
+            df (pandas.DataFrame): The dataframe to process.
+
+        Returns:
+            pandas.DataFrame: The dataframe with categorical dummy columns.
+        """
+        for col in self.columns_to_dummy:
+            if not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype("category")
+        return df
+
+    def _fit_dummies(self, df):
+        """
+        Records the dummy columns and the category lookup table for each categorical column.
+
+        The columns match ``pd.get_dummies(..., drop_first=True, dummy_na=True)``: the sorted
+        categories without the first one, followed by the ``<col>_nan`` column.
+
+        Parameters:
+            df (pandas.DataFrame): The training dataframe.
+        """
+        for col in self.columns_to_dummy:
+            self._set_dummies(col, self._categories_of(df[col]))
+
+    @staticmethod
+    def _categories_of(values):
+        """Returns the sorted categories of a column (its dtype's categories if categorical)."""
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            return values.cat.categories
+        return pd.Categorical(values).categories
+
+    def _set_dummies(self, col, categories):
+        """
+        Records the dummy columns and lookup table of one column from its sorted categories.
+
+        Parameters:
+            col (str): The categorical column.
+            categories (pandas.Index): Its sorted categories.
+        """
+        levels = list(categories) + [np.nan]
+        levels = levels[1:]
+        self.dummy_columns[col] = [f"{col}_{level}" for level in levels]
+        self.dummy_lookup[col] = self._build_lookup(
+            [level for level in levels if not pd.isna(level)],
+            has_nan=bool(levels) and pd.isna(levels[-1]),
+        )
+
+    @staticmethod
+    def _build_lookup(categories, has_nan):
+        """
+        Builds the category to column offset table of a single categorical column.
+
+        Parameters:
+            categories (list): The categories owning a dummy column, in column order.
+            has_nan (bool): Whether the last dummy column is the ``<col>_nan`` column.
+
+        Returns:
+            tuple: The categories as a ``pandas.Index`` and the offset of the NaN column (-1 if none).
+        """
+        return pd.Index(categories), len(categories) if has_nan else -1
+
+    def _lookup_from_columns(self):
+        """Rebuilds the lookup tables from ``dummy_columns`` for preprocessors pickled without them."""
+        lookup = {}
+        for col, columns in self.dummy_columns.items():
+            has_nan = bool(columns) and columns[-1] == f"{col}_nan"
+            names = columns[:-1] if has_nan else columns
+            prefix = len(col) + 1
+            lookup[col] = self._build_lookup([name[prefix:] for name in names], has_nan)
+        return lookup
+
+    def _dummy_coordinates(self, df):
+        """
+        Finds the row and column of every set dummy indicator by direct indexing.
+
+        Categories unseen during fitting and the dropped first category set nothing, missing
+        values set the ``<col>_nan`` column.
+
+        Parameters:
+            df (pandas.DataFrame): The dataframe holding the categorical columns.
+
+        Returns:
+            tuple: Row positions and dummy column positions of the indicators set to one.
+        """
+        all_rows, all_columns = [], []
+        start = 0
+        for col in self.columns_to_dummy:
+            categories, nan_position = self.dummy_lookup[col]
+            values = df[col]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                codes = values.cat.codes.to_numpy()
+                # Code -1 (missing) picks the appended NaN column offset.
+                table = categories.get_indexer(values.cat.categories)
+                offsets = np.append(table, nan_position)[codes]
+            else:
+                offsets = categories.get_indexer(values)
+                offsets[values.isna().to_numpy()] = nan_position
+            rows = np.flatnonzero(offsets >= 0)
+            all_rows.append(rows)
+            all_columns.append(start + offsets[rows])
+            start += len(self.dummy_columns[col])
+        if not all_rows:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        return np.concatenate(all_rows), np.concatenate(all_columns)
+
+    def _encode_dummies(self, df, out):
+        """
+        Sets the dummy indicators of ``df`` in a zero-initialised matrix.
+
+        Parameters:
+            df (pandas.DataFrame): The dataframe holding the categorical columns.
+            out (numpy.ndarray): Zeroed array of shape (len(df), number of dummy columns).
+        """
+        rows, columns = self._dummy_coordinates(df)
+        out[rows, columns] = 1
+
+    def _sparse_dummies(self, df):
+        """Encodes the categorical columns as a CSR matrix of float64 indicators."""
+        rows, columns = self._dummy_coordinates(df)
+        return sp.csr_matrix(
+            (np.ones(len(rows)), (rows, columns)),
+            shape=(len(df), len(self._dummy_names())),
+        )
+
+    def _dummy_names(self):
+        """Returns the dummy column names in output order."""
+        return [
+            name for col in self.columns_to_dummy for name in self.dummy_columns[col]
+        ]
+
+    def _dummies_frame(self, df):
+        """
+        Encodes the categorical columns as a uint8 dummy dataframe.
+
+        Parameters:
+            df (pandas.DataFrame): The dataframe holding the categorical columns.
+
+        Returns:
+            pandas.DataFrame: The dummy columns, in the order fitted on the training data.
+        """
+        names = self._dummy_names()
+        dummies = np.zeros((len(df), len(names)), dtype=np.uint8, order="F")
+        self._encode_dummies(df, dummies)
+        return pd.DataFrame(dummies, columns=names, index=df.index, copy=False)
+
+    def _compact_transform(self, df, numeric_columns):
+        """
+        Writes the imputed and scaled numeric block and the uint8 dummies into one
+        preallocated column-major float32 matrix.
+
+        Parameters:
+            df (pandas.DataFrame): The converted dataframe.
+            numeric_columns (pandas.Index): The columns to impute and scale.
+
+        Returns:
+            pandas.DataFrame: A single-block float32 dataframe.
+        """
+        names = self._dummy_names()
+        n_numeric = len(numeric_columns)
+        matrix = np.empty(
+            (len(df), n_numeric + len(names)), dtype=np.float32, order="F"
+        )
+        for j, col in enumerate(numeric_columns):
+            matrix[:, j] = df[col].to_numpy()
+
+        block = matrix[:, :n_numeric]
+        missing = np.isnan(block)
+        if missing.any():
+            statistics = self.imputer.statistics_.astype(np.float32)
+            block[missing] = statistics[np.nonzero(missing)[1]]
+        block -= self.scaler.mean_.astype(np.float32)
+        block /= self.scaler.scale_.astype(np.float32)
+
+        dummies = np.zeros((len(df), len(names)), dtype=np.uint8, order="F")
+        self._encode_dummies(df, dummies)
+        matrix[:, n_numeric:] = dummies
+
+        return pd.DataFrame(
+            matrix, columns=list(numeric_columns) + names, index=df.index, copy=False
+        )
+
+    def source_columns(self, variables):
+        """
+        Maps transformed variables back to the input columns they are computed from.
+
+        Parameters:
+            variables (list of str): Transformed column names, e.g. a model's selected variables.
+
+        Returns:
+            list of str: The input columns that determine those variables, in first-use order.
+        """
+        owners = {
+            name: col for col, names in self.dummy_columns.items() for name in names
+        }
+        columns = []
+        for variable in variables:
+            column = owners.get(variable, variable)
+            if column not in columns:
+                columns.append(column)
+        return columns
+
     def fit_transform(self, df):
         """
         Fits the preprocessor to the data and transforms the data.
@@ -190,12 +545,22 @@ class DataPreprocessor:
             df (pandas.DataFrame): The training dataset to fit and transform.
 
         Returns:
-            pandas.DataFrame: The transformed dataframe.
+            pandas.DataFrame or SparseDesign: The transformed data (a ``SparseDesign`` in sparse mode).
         """
+        if self.compact:
+            df = self._to_categories(df)
         df = self._convert_columns(df)
         columns_to_drop = self.columns_to_dummy[:]
         if self.target_column and self.target_column in df.columns:
             columns_to_drop.append(self.target_column)
+        self._fit_dummies(df)
+
+        if self.compact:
+            numeric_columns = df.columns.drop(columns_to_drop)
+            self.scaler.fit(
+                self.imputer.fit_transform(df[numeric_columns].astype(np.float32))
+            )
+            return self._compact_transform(df, numeric_columns)
 
         df_imputed = pd.DataFrame(
             self.imputer.fit_transform(df.drop(columns=columns_to_drop)),
@@ -208,15 +573,95 @@ class DataPreprocessor:
             index=df.index,
         )
 
-        for col in self.columns_to_dummy:
-            dummies = pd.get_dummies(
-                df[col], drop_first=True, prefix=col, prefix_sep="_", dummy_na=True
+        if self.sparse:
+            return SparseDesign(
+                df_imputed_std, self._sparse_dummies(df), self._dummy_names()
             )
-            dummies = dummies.reindex(df.index, fill_value=0)
-            self.dummy_columns[col] = dummies.columns.tolist()
-            df_imputed_std = pd.concat([df_imputed_std, dummies], axis=1, sort=False)
+        return pd.concat([df_imputed_std, self._dummies_frame(df)], axis=1, sort=False)
+
+    def partial_fit(self, df):
+        """
+        Accumulates the statistics needed to fit the preprocessor from one chunk of training data.
+
+        Per numeric column the count, mean and sum of squared deviations of the non-missing values
+        are merged into running totals with Chan's parallel update, which stays numerically stable
+        however many chunks there are; per categorical column the set of categories seen is
+        extended. Call ``finalize`` after the last chunk, e.g. over
+        ``pd.read_csv(path, chunksize=...)``, to fit on data that does not fit in memory.
 
-        return df_imputed_std
+        Parameters:
+            df (pandas.DataFrame): One chunk of the training dataset; its monetary and percentage
+                columns are converted in place.
+
+        Returns:
+            DataPreprocessor: self.
+        """
+        df = self._convert_columns(df)
+        columns_to_drop = self.columns_to_dummy[:]
+        if self.target_column and self.target_column in df.columns:
+            columns_to_drop.append(self.target_column)
+        numeric_columns = df.columns.drop(columns_to_drop)
+        values = df[numeric_columns].to_numpy(dtype=np.float64)
+
+        if self._running is None:
+            self._running = {
+                "columns": numeric_columns,
+                "rows": 0,
+                "count": np.zeros(len(numeric_columns)),
+                "mean": np.zeros(len(numeric_columns)),
+                "m2": np.zeros(len(numeric_columns)),
+                "categories": {col: set() for col in self.columns_to_dummy},
+            }
+        running = self._running
+        if not numeric_columns.equals(running["columns"]):
+            raise ValueError("partial_fit chunks must have the same columns")
+
+        present = ~np.isnan(values)
+        count = present.sum(axis=0)
+        total = np.where(present, values, 0).sum(axis=0)
+        mean = np.divide(total, count, out=np.zeros_like(total), where=count > 0)
+        m2 = (np.where(present, values - mean, 0) ** 2).sum(axis=0)
+
+        merged = running["count"] + count
+        delta = mean - running["mean"]
+        share = np.divide(count, merged, out=np.zeros_like(total), where=merged > 0)
+        running["mean"] = running["mean"] + delta * share
+        running["m2"] = running["m2"] + m2 + delta**2 * running["count"] * share
+        running["count"] = merged
+        running["rows"] += len(df)
+        for col in self.columns_to_dummy:
+            running["categories"][col].update(self._categories_of(df[col]))
+        return self
+
+    def finalize(self):
+        """
+        Fits the imputer, scaler and dummy columns from the statistics gathered by ``partial_fit``.
+
+        The result matches ``fit_transform`` on the concatenated chunks: imputation uses the mean
+        of the non-missing values, and since imputed values sit at that mean the scaler's variance
+        is the non-missing sum of squared deviations over the total number of rows.
+
+        Returns:
+            DataPreprocessor: self, ready for ``transform``.
+        """
+        running = self._running
+        if running is None:
+            raise ValueError("partial_fit must be called before finalize")
+        mean = np.where(running["count"] > 0, running["mean"], np.nan)
+        # Fitting on a single row of the means sets every fitted attribute, feature names included.
+        means = pd.DataFrame([mean], columns=running["columns"])
+        self.imputer.fit(means)
+        self.scaler.fit(means)
+        variance = running["m2"] / running["rows"]
+        self.scaler.mean_ = running["mean"]
+        self.scaler.var_ = variance
+        self.scaler.scale_ = np.where(variance > 0, np.sqrt(variance), 1.0)
+        self.scaler.n_samples_seen_ = running["rows"]
+        for col in self.columns_to_dummy:
+            categories = pd.Index(sorted(running["categories"][col]))
+            self._set_dummies(col, categories)
+        self._running = None
+        return self
 
     def transform(self, df):
         """
@@ -228,12 +673,17 @@ class DataPreprocessor:
             df (pandas.DataFrame): The new dataset to transform.
 
         Returns:
-            pandas.DataFrame: The transformed dataframe.
+            pandas.DataFrame or SparseDesign: The transformed data (a ``SparseDesign`` in sparse mode).
         """
+        if self.compact:
+            df = self._to_categories(df)
         df = self._convert_columns(df)
         columns_to_drop = self.columns_to_dummy[:]
         if self.target_column and self.target_column in df.columns:
             columns_to_drop.append(self.target_column)
+        if self.compact:
+            return self._compact_transform(df, df.columns.drop(columns_to_drop))
+
         df_imputed = pd.DataFrame(
             self.imputer.transform(df.drop(columns=columns_to_drop)),
             columns=df.drop(columns=columns_to_drop).columns,
@@ -245,11 +695,8 @@ class DataPreprocessor:
             index=df.index,
         )
 
-        for col in self.columns_to_dummy:
-            dummies = pd.get_dummies(
-                df[col], drop_first=True, prefix=col, prefix_sep="_", dummy_na=True
+        if self.sparse:
+            return SparseDesign(
+                df_imputed_std, self._sparse_dummies(df), self._dummy_names()
             )
-            dummies = dummies.reindex(columns=self.dummy_columns[col], fill_value=0)
-            df_imputed_std = pd.concat([df_imputed_std, dummies], axis=1, sort=False)
-
-        return df_imputed_std
+        return pd.concat([df_imputed_std, self._dummies_frame(df)], axis=1, sort=False)
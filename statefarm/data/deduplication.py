@@ -0,0 +1,78 @@
+__all__ = ["deduplicate_rows"]
+
+import numpy as np
+import pandas as pd
+
+
+def _group_in_input_order(codes):
+    """
+    Numbers the distinct values of ``codes`` by their first occurrence.
+
+    Args:
+        codes (numpy.ndarray): One group key per row.
+
+    Returns:
+        tuple: ``positions`` of the first row of each group and ``inverse`` group number per row.
+    """
+    _, first, inverse = np.unique(codes, return_index=True, return_inverse=True)
+    # np.unique sorts by key; reorder so the distinct rows keep their input order.
+    order = np.argsort(first, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return first[order], rank[inverse.ravel()]
+
+
+def _matches_representative(frame, representative):
+    """
+    Checks every row against the row it was merged into, treating missing values as equal.
+
+    Args:
+        frame (pandas.DataFrame): The compared columns.
+        representative (numpy.ndarray): Position of the row each row was merged into.
+
+    Returns:
+        bool: Whether all rows equal their representative.
+    """
+    for column in frame.columns:
+        values = frame[column].to_numpy()
+        merged = values[representative]
+        missing = pd.isna(values)
+        if (
+            not np.array_equal(missing, pd.isna(merged))
+            or not (values[~missing] == merged[~missing]).all()
+        ):
+            return False
+    return True
+
+
+def deduplicate_rows(df, columns=None):
+    """
+    Finds the distinct rows of a dataframe with a vectorized 64-bit row hash.
+
+    Rows are compared on ``columns`` only, so callers can restrict the comparison to the inputs a
+    model actually uses. Rows sharing a hash are checked against the row they are merged into; on
+    a hash collision the rows are grouped by their exact values instead, so distinct rows are never
+    merged. Scoring ``df.iloc[positions]`` and indexing the result with ``inverse`` reproduces one
+    score per original row.
+
+    Args:
+        df (pandas.DataFrame): The rows to deduplicate.
+        columns (list of str, optional): Columns to compare on. Defaults to all columns.
+
+    Returns:
+        tuple: ``positions`` of the first occurrence of each distinct row (in input order) and
+               ``inverse`` such that row ``i`` equals row ``positions[inverse[i]]``.
+    """
+    if len(df) < 2:
+        return np.arange(len(df)), np.arange(len(df))
+    frame = df if columns is None else df[columns]
+    hashes = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+    positions, inverse = _group_in_input_order(hashes)
+    if len(positions) == len(frame) or _matches_representative(
+        frame, positions[inverse]
+    ):
+        return positions, inverse
+    groups = frame.groupby(
+        list(frame.columns), dropna=False, sort=False, observed=True
+    ).ngroup()
+    return _group_in_input_order(groups.to_numpy())
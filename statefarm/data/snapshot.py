@@ -0,0 +1,157 @@
+__all__ = ["STRING_DTYPES", "load_csv", "snapshot_csv"]
+
+import glob
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+
+# String columns of the exercise data and the dtype they are loaded as. They are ``object``
+# like ``pd.read_csv`` returns them: a ``category`` column would carry the categories of the
+# whole file into every split of it. Pass ``dtypes`` to load some as ``category`` instead.
+STRING_DTYPES = {
+    "x5": "object",
+    "x12": "object",
+    "x31": "object",
+    "x63": "object",
+    "x81": "object",
+    "x82": "object",
+}
+SNAPSHOT_VERSION = 1
+
+
+def _snapshot_key(path, dtypes, cache_dir):
+    """
+    SHA-256 of the source file, the string dtypes and the snapshot format version.
+
+    The hash is remembered next to the snapshots together with the file's size and modification
+    time, and only recomputed when either changes.
+    """
+    stat = os.stat(path)
+    stamp = [stat.st_size, stat.st_mtime_ns, SNAPSHOT_VERSION, dtypes]
+    memo = os.path.join(
+        cache_dir, f"{os.path.splitext(os.path.basename(path))[0]}.source.json"
+    )
+    if os.path.exists(memo):
+        with open(memo) as handle:
+            known = json.load(handle)
+        if known["stamp"] == stamp:
+            return known["key"]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    digest.update(json.dumps([SNAPSHOT_VERSION, dtypes], sort_keys=True).encode())
+    key = digest.hexdigest()[:16]
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(memo, "w") as handle:
+        json.dump({"stamp": stamp, "key": key}, handle)
+    return key
+
+
+def _smallest_code_dtype(size):
+    for dtype in (np.int8, np.int16, np.int32):
+        if size < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def snapshot_csv(path, cache_dir=None, dtypes=None):
+    """
+    Converts a CSV file into a binary snapshot once and returns the snapshot's directory.
+
+    Each numeric column is saved as its own ``.npy`` file. Each string column is saved as integer
+    codes plus its sorted distinct values, with nulls coded ``-1``. The directory name carries a
+    hash of the source file, so an edited CSV gets a new snapshot and the stale ones are deleted.
+
+    Args:
+        path (str): The CSV file.
+        cache_dir (str, optional): Where snapshots live; ``.snapshots`` next to the CSV by default.
+        dtypes (dict, optional): String column to ``category`` or ``object``; ``STRING_DTYPES``
+            (all ``object``) by default. Other non-numeric columns are loaded as ``object``.
+            A ``category`` column keeps every category of the file, including in row subsets.
+
+    Returns:
+        str: The snapshot directory.
+    """
+    dtypes = STRING_DTYPES if dtypes is None else dtypes
+    cache_dir = cache_dir or os.path.join(os.path.dirname(path), ".snapshots")
+    stem = os.path.splitext(os.path.basename(path))[0]
+    key = _snapshot_key(path, dtypes, cache_dir)
+    directory = os.path.join(cache_dir, f"{stem}-{key}")
+    if os.path.exists(os.path.join(directory, "meta.json")):
+        return directory
+
+    df = pd.read_csv(path, dtype={column: str for column in dtypes})
+    staging = f"{directory}.tmp-{os.getpid()}"
+    os.makedirs(staging, exist_ok=True)
+    meta = {"rows": len(df), "columns": []}
+    for i, column in enumerate(df.columns):
+        values = df[column]
+        if pd.api.types.is_numeric_dtype(values.dtype) and column not in dtypes:
+            np.save(os.path.join(staging, f"{i}.npy"), values.to_numpy())
+            meta["columns"].append({"name": column, "kind": "numeric"})
+            continue
+        codes, categories = pd.factorize(values, sort=True)
+        np.save(
+            os.path.join(staging, f"{i}.npy"),
+            codes.astype(_smallest_code_dtype(len(categories))),
+        )
+        meta["columns"].append(
+            {
+                "name": column,
+                "kind": dtypes.get(column, "object"),
+                "categories": [str(category) for category in categories],
+            }
+        )
+    with open(os.path.join(staging, "meta.json"), "w") as handle:
+        json.dump(meta, handle)
+
+    for stale in glob.glob(os.path.join(cache_dir, f"{stem}-*")):
+        if (
+            os.path.isdir(stale)
+            and os.path.basename(stale).count("-") == stem.count("-") + 1
+        ):
+            shutil.rmtree(stale, ignore_errors=True)
+    os.replace(staging, directory)
+    return directory
+
+
+def load_csv(path, cache_dir=None, dtypes=None):
+    """
+    Loads a CSV file through its binary snapshot, creating the snapshot on first use.
+
+    Numeric columns and the codes of ``category`` columns are memory-mapped copy-on-write and
+    wrapped without copying, so repeated loads cost a few ``mmap`` calls instead of a CSV parse,
+    and writing to a column never touches the snapshot. ``object`` columns, the default for
+    strings, are rebuilt from their codes.
+
+    Args:
+        path (str): The CSV file.
+        cache_dir (str, optional): See ``snapshot_csv``.
+        dtypes (dict, optional): See ``snapshot_csv``.
+
+    Returns:
+        pandas.DataFrame: The same rows and columns as ``pd.read_csv(path)``, with the string
+        columns typed as requested.
+    """
+    directory = snapshot_csv(path, cache_dir, dtypes)
+    with open(os.path.join(directory, "meta.json")) as handle:
+        meta = json.load(handle)
+
+    columns = {}
+    for i, column in enumerate(meta["columns"]):
+        values = np.load(os.path.join(directory, f"{i}.npy"), mmap_mode="c")
+        if column["kind"] == "category":
+            values = pd.Categorical.from_codes(values, column["categories"])
+        elif column["kind"] == "object":
+            lookup = np.array(column["categories"] + [np.nan], dtype=object)
+            values = lookup[values]
+        columns[column["name"]] = values
+    # copy=False keeps one block per column, so no column is stacked into a new array.
+    return pd.DataFrame(columns, copy=False)
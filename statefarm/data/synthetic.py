@@ -0,0 +1,205 @@
+__all__ = ["SyntheticDataGenerator"]
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from statefarm.data.data_preparation import parse_formatted_numbers
+
+
+# Numeric columns with at most this many distinct values (e.g. the target) are sampled from
+# their value frequencies instead of their quantiles.
+MAX_DISCRETE_VALUES = 20
+QUANTILE_KNOTS = 1001
+# String columns of the exercise data: ``category`` ones are sampled from their category
+# frequencies, ``object`` ones are formatted numbers.
+STRING_DTYPES = {
+    "x5": "category",
+    "x12": "object",
+    "x31": "category",
+    "x63": "object",
+    "x81": "category",
+    "x82": "category",
+}
+
+
+def _number_format(values):
+    """Learns how a column of formatted numbers is written, e.g. ``$(1,234.50)`` or ``12.5%``."""
+    values = values.dropna().astype(str)
+    first = values.iloc[0] if len(values) else ""
+    negative = values[values.str.contains(r"[(-]", regex=True)]
+    decimals = values.str.extract(r"\.(\d+)", expand=False).str.len()
+    return {
+        "prefix": "$" if first.startswith(("$", "($", "-$")) else "",
+        "suffix": "%" if first.endswith("%") else "",
+        "thousands": bool(values.str.contains(",", regex=False).any()),
+        "decimals": int(decimals.mode().iloc[0]) if decimals.notna().any() else 0,
+        "negative": _negative_template(negative.iloc[0] if len(negative) else ""),
+    }
+
+
+def _negative_template(example):
+    """Where a negative number's sign goes: ``$(1.00)``, ``($1.00)`` or ``-$1.00``."""
+    if "(" not in example:
+        return "-{prefix}{number}"
+    return "({prefix}{number})" if example.startswith("(") else "{prefix}({number})"
+
+
+def _format_numbers(numbers, style):
+    """Writes numbers the way ``_number_format`` learnt."""
+    spec = f"{',' if style['thousands'] else ''}.{style['decimals']}f"
+    prefix, suffix = style["prefix"], style["suffix"]
+    negative = style["negative"]
+    return [
+        (
+            f"{prefix}{format(number, spec)}"
+            if number >= 0
+            else negative.format(prefix=prefix, number=format(-number, spec))
+        )
+        + suffix
+        for number in numbers
+    ]
+
+
+class SyntheticDataGenerator:
+    """
+    Samples synthetic rows that follow the column-wise distributions of a training frame.
+
+    Each column keeps its missing rate and marginal distribution: categorical columns their
+    category frequencies, numeric columns their quantiles (sampled by interpolating the inverse
+    CDF), columns with few distinct values such as the target their value frequencies, and
+    formatted columns such as ``x12`` and ``x63`` the quantiles of their values and how they are
+    written (currency sign, thousands separators, decimals, negatives). Columns are sampled
+    independently, so the data scales the pipeline's time and memory faithfully but carries no
+    signal between features and target.
+
+    Attributes:
+        columns (list of str): Column order of the training frame.
+        schema (dict): Per column its ``kind`` and what sampling it needs.
+    """
+
+    def __init__(self, columns, schema):
+        self.columns = columns
+        self.schema = schema
+
+    @classmethod
+    def fit(cls, df, string_dtypes=STRING_DTYPES):
+        """
+        Learns the distribution of every column of a frame.
+
+        Args:
+            df (pandas.DataFrame): The training data.
+            string_dtypes (dict): String columns, ``category`` for categoricals and ``object``
+                for formatted numbers.
+
+        Returns:
+            SyntheticDataGenerator: The fitted generator.
+        """
+        probabilities = np.linspace(0, 1, QUANTILE_KNOTS)
+        schema = {}
+        for column in df.columns:
+            values = df[column]
+            spec = {"missing": float(values.isna().mean())}
+            present = values.dropna()
+            if string_dtypes.get(column) == "category":
+                frequencies = present.astype(str).value_counts(normalize=True)
+                spec.update(
+                    kind="categorical",
+                    values=frequencies.index.tolist(),
+                    weights=frequencies.to_numpy(),
+                )
+            elif string_dtypes.get(column) == "object":
+                numbers = parse_formatted_numbers(present).dropna().to_numpy()
+                spec.update(
+                    kind="formatted",
+                    quantiles=np.quantile(numbers, probabilities),
+                    style=_number_format(present),
+                )
+            elif present.nunique() <= MAX_DISCRETE_VALUES:
+                frequencies = present.value_counts(normalize=True)
+                spec.update(
+                    kind="discrete",
+                    values=frequencies.index.to_numpy(),
+                    weights=frequencies.to_numpy(),
+                    dtype=values.dtype,
+                )
+            else:
+                spec.update(
+                    kind="numeric",
+                    quantiles=np.quantile(present.to_numpy(np.float64), probabilities),
+                )
+            schema[column] = spec
+        return cls(list(df.columns), schema)
+
+    @classmethod
+    def from_csv(cls, path, **kwargs):
+        """Fits a generator on a CSV file, see ``fit``."""
+        return cls.fit(pd.read_csv(path), **kwargs)
+
+    def sample(self, rows, rng):
+        """
+        Draws rows.
+
+        Args:
+            rows (int): Number of rows.
+            rng (numpy.random.Generator): Source of randomness.
+
+        Returns:
+            pandas.DataFrame: The rows, with the training frame's columns.
+        """
+        data = {}
+        for column in self.columns:
+            spec = self.schema[column]
+            if spec["kind"] in ("categorical", "discrete"):
+                picks = rng.choice(len(spec["values"]), rows, p=spec["weights"])
+                values = np.asarray(spec["values"], dtype=object)[picks]
+            else:
+                knots = np.linspace(0, 1, len(spec["quantiles"]))
+                values = np.interp(rng.random(rows), knots, spec["quantiles"])
+                if spec["kind"] == "formatted":
+                    values = np.asarray(
+                        _format_numbers(values, spec["style"]), dtype=object
+                    )
+            missing = rng.random(rows) < spec["missing"]
+            if spec["kind"] == "discrete" and not missing.any():
+                values = values.astype(spec["dtype"])
+            elif values.dtype != object:
+                values[missing] = np.nan
+            else:
+                values[missing] = None
+            data[column] = values
+        return pd.DataFrame(data, columns=self.columns)
+
+    def iter_chunks(self, rows, chunk_rows=100000, seed=13):
+        """
+        Draws ``rows`` rows as a stream of frames, so memory stays bounded by ``chunk_rows``.
+
+        Yields:
+            pandas.DataFrame: Consecutive chunks of at most ``chunk_rows`` rows.
+        """
+        rng = np.random.default_rng(seed)
+        for start in range(0, rows, chunk_rows):
+            yield self.sample(min(chunk_rows, rows - start), rng)
+
+    def write_csv(self, path, rows, chunk_rows=100000, seed=13):
+        """
+        Streams ``rows`` synthetic rows into a CSV file shaped like the training CSV.
+
+        Args:
+            path (str): Destination file; its directory is created if needed.
+            rows (int): Number of rows.
+            chunk_rows (int): Rows sampled and written at a time.
+            seed (int): Seed of the random generator.
+
+        Returns:
+            str: ``path``.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(f"{path}.tmp", "w", newline="") as handle:
+            for number, chunk in enumerate(self.iter_chunks(rows, chunk_rows, seed)):
+                chunk.to_csv(handle, header=number == 0, index=False)
+        os.replace(f"{path}.tmp", path)
+        return path
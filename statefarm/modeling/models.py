@@ -1,5 +1,8 @@
 __all__ = ["LogisticRegressionAnalysis"]
 
+import warnings
+
+import numpy as np
 import pandas as pd
 import statsmodels.api as sm
 from sklearn.linear_model import LogisticRegression
@@ -20,6 +23,12 @@ class LogisticRegressionAnalysis:
         variables (list): List of selected variables based on the model's coefficients.
         final_model (statsmodels.Logit): The final logistic regression model after variable selection.
         final_result (statsmodels.LogitResults): Results of the final logistic regression model.
+            After ``update_final_model`` its ``params`` are the updated coefficients, but its
+            standard errors, ``llf`` and ``summary()`` only describe the latest chunk.
+        cov_params (pandas.DataFrame): Covariance of the final coefficients, kept current by
+            ``update_final_model``.
+        information (numpy.ndarray): Information matrix (inverse covariance) of the final
+            coefficients after ``update_final_model``; None until the first update.
     """
 
     def __init__(self):
@@ -28,51 +37,150 @@ class LogisticRegressionAnalysis:
         self.variables = []
         self.final_model = None
         self.final_result = None
+        self.cov_params = None
+        self.information = None
 
-    def fit_exploratory_model(self, df, target_column):
+    def fit_exploratory_model(self, df, target_column, top_k=25):
         """
         Fits an exploratory logistic regression model to identify important variables.
 
         Args:
-            df (pandas.DataFrame): The dataset to fit the model on.
+            df (pandas.DataFrame or SparseDesign): The dataset to fit the model on; a
+                ``SparseDesign`` is passed to liblinear as a CSR matrix.
             target_column (str): The name of the target variable in the dataset.
+            top_k (int): Number of variables to select.
 
         Returns:
-            list: The list of top 25 variables selected based on the coefficients.
+            list: The list of top ``top_k`` variables selected based on the coefficients.
         """
         self.exploratory_LR = LogisticRegression(
             penalty="l1", fit_intercept=False, solver="liblinear"
         )
-        self.exploratory_LR.fit(df.drop(columns=[target_column]), df[target_column])
-
-        results = pd.DataFrame(df.drop(columns=[target_column]).columns).rename(
-            columns={0: "name"}
-        )
+        if hasattr(df, "to_csr"):
+            features, names = df.to_csr(exclude=[target_column])
+        else:
+            features = df.drop(columns=[target_column])
+            names = features.columns
+        self.exploratory_LR.fit(features, df[target_column])
+
+        results = pd.DataFrame({"name": list(names)})
         results["coefs"] = self.exploratory_LR.coef_[0]
         results["coefs_squared"] = results["coefs"] ** 2
 
-        self.variables = results.nlargest(25, "coefs_squared")["name"].tolist()
+        self.variables = results.nlargest(top_k, "coefs_squared")["name"].tolist()
 
         logging.info("Selected Variables: %s", self.variables)
         return self.variables
 
-    def fit_final_model(self, df, target_column):
+    def fit_final_model(self, df, target_column, disp=True):
         """
         Fits the final logistic regression model using selected variables.
 
         Args:
             df (pandas.DataFrame): The dataset to fit the model on.
             target_column (str): The name of the target variable in the dataset.
+            disp (bool): Print the optimizer's convergence messages.
 
         Returns:
             str: The summary of the final logistic regression model.
         """
         self.final_model = sm.Logit(df[target_column], df[self.variables])
-        self.final_result = self.final_model.fit()
+        self.final_result = self.final_model.fit(disp=disp)
+        # A refit starts over, so an earlier update's information must not act as its prior.
+        self.cov_params = self.final_result.cov_params()
+        self.information = None
 
         logging.info(self.final_result.summary())
         return self.final_result.summary()
 
+    def update_final_model(self, df, target_column, max_steps=5, tol=1e-8):
+        """
+        Updates the final model's coefficients with a new labelled chunk, without a full refit.
+
+        The data the model has already seen is summarised by its coefficients and their
+        information matrix (the inverse of ``cov_params``), which acts as a
+        quadratic prior. Newton-Raphson (IRLS) steps warm-started from the current coefficients
+        then maximise the new chunk's log-likelihood plus that prior, and the information matrix
+        grows by the chunk's Fisher information, so successive updates approximate a refit on
+        all chunks together at the cost of a few passes over the new one.
+
+        Args:
+            df (pandas.DataFrame): New transformed rows with the selected variables.
+            target_column (str): The name of the target variable in the dataset.
+            max_steps (int): Maximum Newton steps.
+            tol (float): Stops once no coefficient moves by more than this.
+
+        Returns:
+            pandas.Series: The updated coefficients.
+        """
+        X = df[self.variables].to_numpy(dtype=np.float64)
+        y = df[target_column].to_numpy(dtype=np.float64)
+        start = np.asarray(self.final_result.params, dtype=np.float64)
+        prior = getattr(self, "information", None)
+        if prior is None:
+            cov_params = getattr(self, "cov_params", None)
+            if cov_params is None:
+                cov_params = self.final_result.cov_params()
+            prior = np.linalg.inv(np.asarray(cov_params))
+
+        params = start.copy()
+        for _ in range(max_steps):
+            phat = 1 / (1 + np.exp(-X @ params))
+            gradient = X.T @ (y - phat) - prior @ (params - start)
+            hessian = (X * (phat * (1 - phat))[:, None]).T @ X + prior
+            step = np.linalg.solve(hessian, gradient)
+            params += step
+            if np.max(np.abs(step)) < tol:
+                break
+
+        phat = 1 / (1 + np.exp(-X @ params))
+        self.information = (X * (phat * (1 - phat))[:, None]).T @ X + prior
+        self.final_model = sm.Logit(df[target_column], df[self.variables])
+        with warnings.catch_warnings():
+            # maxiter=0 only wraps the updated coefficients in a results object.
+            warnings.simplefilter("ignore")
+            self.final_result = self.final_model.fit(
+                start_params=params, method="newton", maxiter=0, disp=0
+            )
+        self.cov_params = pd.DataFrame(
+            np.linalg.inv(self.information),
+            index=self.variables,
+            columns=self.variables,
+        )
+        logging.info(
+            "Updated final model on %s rows, max coefficient change %.4g",
+            len(df),
+            np.max(np.abs(params - start)),
+        )
+        return self.final_result.params
+
+    def coefficient_drift(self, df, target_column):
+        """
+        Compares the current (e.g. incrementally updated) coefficients with a full refit.
+
+        Args:
+            df (pandas.DataFrame): All transformed rows the model should reflect.
+            target_column (str): The name of the target variable in the dataset.
+
+        Returns:
+            pandas.DataFrame: Per variable the current and refit coefficients, their difference
+            and the difference in refit standard errors.
+        """
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            refit = sm.Logit(df[target_column], df[self.variables]).fit(disp=0)
+        drift = pd.DataFrame(
+            {"current": self.final_result.params, "refit": refit.params}
+        )
+        drift["difference"] = drift["current"] - drift["refit"]
+        drift["difference_se"] = drift["difference"] / refit.bse
+        logging.info(
+            "Coefficient drift versus a full refit: max %.4g (%.2f standard errors)",
+            drift["difference"].abs().max(),
+            drift["difference_se"].abs().max(),
+        )
+        return drift
+
     def evaluate_model(self, df, target_column):
         """
         Evaluates the model's performance using the C-statistic (ROC AUC score).
@@ -0,0 +1,292 @@
+__all__ = ["Scorer", "file_digest", "top_contributions"]
+
+import hashlib
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from statefarm.data.deduplication import deduplicate_rows
+
+
+def file_digest(path):
+    """Returns the first 12 hex characters of the SHA-256 of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+def top_contributions(contributions, top_k):
+    """
+    Picks the largest contributions of each row by absolute value.
+
+    Args:
+        contributions (numpy.ndarray): Rows by variables.
+        top_k (int): Contributions kept per row; at most the number of variables.
+
+    Returns:
+        tuple: Variable positions and contributions, both rows by ``top_k`` and ordered from the
+        largest absolute contribution down.
+    """
+    top_k = min(top_k, contributions.shape[1])
+    magnitude = np.abs(contributions)
+    top = np.argpartition(-magnitude, top_k - 1, axis=1)[:, :top_k]
+    order = np.argsort(-np.take_along_axis(magnitude, top, axis=1), axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+    return top, np.take_along_axis(contributions, top, axis=1)
+
+
+class Scorer:
+    """
+    Scores raw input rows with a trained model and its fitted preprocessor.
+
+    This is the one scoring path of the package: the API endpoints, background jobs and the
+    scoring socket all go through it, and other services can embed it to score in-process. A
+    ``Scorer`` holds no mutable state once built, so one instance can be shared by any number of
+    threads. The preprocessor only reads its fitted state, and the model's coefficients are
+    copied into an array at construction, so the linear predictor and the logistic link run as a
+    BLAS product and NumPy ufuncs, which release the GIL, instead of through statsmodels. The
+    preprocessor's pandas work still holds the GIL, so threads overlap scoring with I/O rather
+    than with each other's preprocessing.
+
+    Attributes:
+        model (LogisticRegressionAnalysis): The trained model.
+        preprocessor (DataPreprocessor): The fitted preprocessor.
+        variables (list of str): Model inputs, in coefficient order.
+        params (numpy.ndarray): Coefficients of ``variables``.
+        source_columns (list of str): Raw input columns the variables are computed from.
+        threshold (float): ``business_outcome`` is 1 when ``phat`` is at least this.
+        chunk_rows (int): Distinct rows preprocessed and scored at a time.
+        model_version (str or None): Version reported with the scores.
+        dedup_observer (callable, optional): Called with the share of duplicate rows of every
+            batch, e.g. a metric's ``observe``.
+        drift_monitor (DriftMonitor, optional): Fed every scored chunk, after preprocessing
+            has converted its columns, with the scores and the number of rows each distinct row
+            stands for. While it is set, rows are only merged when they also agree on every
+            profiled column.
+    """
+
+    def __init__(
+        self,
+        model,
+        preprocessor,
+        threshold=0.75,
+        chunk_rows=1000,
+        model_version=None,
+        dedup_observer=None,
+        drift_monitor=None,
+    ):
+        self.model = model
+        self.preprocessor = preprocessor
+        self.variables = list(model.variables)
+        self.params = np.asarray(model.final_result.params, dtype=np.float64)
+        self.source_columns = preprocessor.source_columns(self.variables)
+        self.threshold = threshold
+        self.chunk_rows = chunk_rows
+        self.model_version = model_version
+        self.dedup_observer = dedup_observer
+        self.drift_monitor = drift_monitor
+
+    @classmethod
+    def from_paths(cls, model_path, preprocessor_path, model_version=None, **kwargs):
+        """
+        Loads the pickled model and preprocessor once and builds a scorer.
+
+        Args:
+            model_path (str): Path to the trained model.
+            preprocessor_path (str): Path to the fitted preprocessor.
+            model_version (str, optional): Defaults to a digest of the model file.
+            **kwargs: Passed to ``Scorer``.
+
+        Returns:
+            Scorer: The scorer.
+        """
+        return cls(
+            joblib.load(model_path),
+            joblib.load(preprocessor_path),
+            model_version=model_version or file_digest(model_path),
+            **kwargs,
+        )
+
+    def _phat(self, chunk, top_k=None):
+        """
+        Preprocesses a frame the scorer owns (it is converted in place) and scores it.
+
+        With ``top_k`` the design matrix is also multiplied by the coefficients, and the
+        ``top_contributions`` of each row are returned after the phats.
+        """
+        design = self.preprocessor.transform(chunk)[self.variables]
+        design = np.asarray(design, dtype=np.float64)
+        phat = self._link(design)
+        if top_k is None:
+            return phat
+        return (phat,) + top_contributions(design * self.params, top_k)
+
+    def _link(self, design):
+        # Same link as statsmodels' Logit.cdf, so scores match ``final_result.predict``.
+        return 1 / (1 + np.exp(-(design @ self.params)))
+
+    def score_transformed(self, transformed):
+        """
+        Scores rows that were already transformed by this scorer's preprocessor or an identical
+        one, so scorers sharing a preprocessor transform each row only once.
+
+        Args:
+            transformed (pandas.DataFrame): Output of ``preprocessor.transform``.
+
+        Returns:
+            numpy.ndarray: ``phat`` of each row.
+        """
+        return self._link(np.asarray(transformed[self.variables], dtype=np.float64))
+
+    def outcomes(self, phat):
+        """``business_outcome`` of each phat."""
+        return np.where(phat >= self.threshold, 1, 0)
+
+    def score_batch(self, data, checkpoint=None, copy=True):
+        """
+        Scores many rows, preprocessing and scoring each distinct row only once.
+
+        Rows are compared on ``source_columns``, so duplicate customer records or retried rows in
+        the same batch are scored once and their phat is scattered back to every position.
+        Distinct rows are scored in chunks of ``chunk_rows``, and ``checkpoint`` may stop the
+        remaining work before each chunk.
+
+        Args:
+            data (pandas.DataFrame or dict): Raw input rows, or column name to array of values.
+            checkpoint (callable, optional): Called with the number of rows left before each
+                chunk; raises to drop them, e.g. the API's deadline check.
+            copy (bool): Whether ``data`` must be left untouched; pass False to hand the frame
+                over, the preprocessor then converts its columns in place.
+
+        Returns:
+            tuple: ``phat`` and ``business_outcome`` arrays, one value per row in input order.
+
+        Raises:
+            Exception: Whatever ``checkpoint`` raises.
+        """
+        phat = self._score(data, checkpoint, copy)[0]
+        return phat, self.outcomes(phat)
+
+    def explain_batch(self, data, top_k=3, checkpoint=None, copy=True):
+        """
+        Scores many rows like ``score_batch`` and explains each score in the same pass.
+
+        The model is linear in its variables, so a row's linear predictor is the sum of each
+        coefficient times the row's transformed value of that variable. Those products are the
+        contributions: positive ones raise ``phat``, negative ones lower it.
+
+        Args:
+            data (pandas.DataFrame or dict): See ``score_batch``.
+            top_k (int): Contributions reported per row.
+            checkpoint (callable, optional): See ``score_batch``.
+            copy (bool): See ``score_batch``.
+
+        Returns:
+            tuple: ``phat`` and ``business_outcome`` arrays, then the names and the contributions
+            of each row's ``top_k`` variables, rows by ``top_k``, largest absolute contribution
+            first.
+
+        Raises:
+            Exception: Whatever ``checkpoint`` raises.
+        """
+        phat, top, contributions = self._score(data, checkpoint, copy, top_k)
+        names = np.asarray(self.variables, dtype=object)[top]
+        return phat, self.outcomes(phat), names, contributions
+
+    def _dedup_columns(self, input_df):
+        """Columns on which rows must agree to be scored once, see ``score_batch``."""
+        if self.drift_monitor is None:
+            return self.source_columns
+        # The monitor sees one row per group, so the rows of a group must also agree on every
+        # profiled column, not only on the model's inputs.
+        profiled = (
+            self.drift_monitor.numeric_columns + self.drift_monitor.categorical_columns
+        )
+        return list(
+            dict.fromkeys(
+                self.source_columns
+                + [column for column in profiled if column in input_df.columns]
+            )
+        )
+
+    def _score(self, data, checkpoint, copy, top_k=None):
+        """Scores the distinct rows of ``data`` chunk by chunk, see ``score_batch``."""
+        input_df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+        positions, inverse = deduplicate_rows(input_df, self._dedup_columns(input_df))
+        if self.dedup_observer is not None and len(input_df):
+            self.dedup_observer(1 - len(positions) / len(input_df))
+        weights = np.bincount(inverse, minlength=len(positions))
+        if len(positions) < len(input_df):
+            # A copy, not a view: the preprocessor converts the chunk's columns in place.
+            input_df, copy = input_df.iloc[positions].copy(), False
+
+        phat = np.empty(len(input_df))
+        if top_k is not None:
+            top_k = min(top_k, len(self.variables))
+            top = np.empty((len(input_df), top_k), dtype=np.intp)
+            contributions = np.empty((len(input_df), top_k))
+        for start in range(0, len(input_df), self.chunk_rows):
+            if checkpoint is not None:
+                checkpoint(len(input_df) - start)
+            stop = start + self.chunk_rows
+            if len(input_df) <= self.chunk_rows:
+                chunk = input_df.copy() if copy else input_df
+            else:
+                chunk = input_df[start:stop].copy()
+            if top_k is None:
+                phat[start:stop] = self._phat(chunk)
+            else:
+                scored = self._phat(chunk, top_k)
+                phat[start:stop], top[start:stop], contributions[start:stop] = scored
+            if self.drift_monitor is not None:
+                self.drift_monitor.observe(chunk, phat[start:stop], weights[start:stop])
+        if top_k is None:
+            return (phat[inverse],)
+        return phat[inverse], top[inverse], contributions[inverse]
+
+    def score_one(self, row, top_k=None):
+        """
+        Scores a single row.
+
+        Args:
+            row (dict): Raw input field name to value.
+            top_k (int, optional): Also explain the score by this many contributions, see
+                ``explain_batch``.
+
+        Returns:
+            dict: ``phat`` (float) and ``business_outcome`` (int), with ``top_k`` also
+            ``explanation``, variable name to contribution, largest absolute value first.
+        """
+        frame = pd.DataFrame([row])
+        scored = self._phat(frame, top_k)
+        phat = scored if top_k is None else scored[0]
+        if self.drift_monitor is not None:
+            self.drift_monitor.observe(frame, phat)
+        phat = float(phat[0])
+        response = {"phat": phat, "business_outcome": int(phat >= self.threshold)}
+        if top_k is not None:
+            _, top, contributions = scored
+            response["explanation"] = {
+                self.variables[position]: contribution
+                for position, contribution in zip(
+                    top[0].tolist(), contributions[0].tolist()
+                )
+            }
+        return response
+
+    def score_iter(self, chunks, copy=True):
+        """
+        Scores a stream of batches, e.g. ``pd.read_csv(path, chunksize=...)``, one at a time.
+
+        Args:
+            chunks (iterable): DataFrames or dicts of arrays, see ``score_batch``.
+            copy (bool): See ``score_batch``.
+
+        Yields:
+            tuple: ``phat`` and ``business_outcome`` arrays of each chunk.
+        """
+        for chunk in chunks:
+            yield self.score_batch(chunk, copy=copy)
@@ -0,0 +1,221 @@
+__all__ = ["Stage", "StageCache"]
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import time
+import tracemalloc
+
+import joblib
+import pandas as pd
+
+
+def _restart_tracing():
+    """
+    Returns the peak traced memory since tracing (re)started and restarts it.
+
+    Python 3.8 has no ``tracemalloc.reset_peak``, so the peak is reset by restarting tracing,
+    which also forgets the blocks allocated so far: the next peak only counts new allocations.
+    """
+    _, peak = tracemalloc.get_traced_memory()
+    limit = tracemalloc.get_traceback_limit()
+    tracemalloc.stop()
+    tracemalloc.start(limit)
+    return peak
+
+
+class Stage:
+    """
+    One pipeline stage whose output is computed or loaded from the cache on first access.
+
+    Attributes:
+        name (str): Stage name, also the prefix of its cache files.
+        key (str): Hash of the stage's parameters and its upstream stages' keys.
+        status (str): ``pending`` until ``value`` is read, then ``hit`` or ``miss``.
+        seconds (float): Time spent computing or loading the output, excluding upstream stages
+            it triggered.
+        peak_bytes (int or None): Peak traced memory the stage allocated on top of what was
+            already allocated when it started (upstream stages excluded), when the cache traces
+            memory.
+    """
+
+    def __init__(self, cache, name, key, func):
+        self.cache = cache
+        self.name = name
+        self.key = key
+        self.status = "pending"
+        self.seconds = 0.0
+        self.peak_bytes = None
+        self._func = func
+        self._value = None
+        self._upstream_seconds = 0.0
+
+    @property
+    def path(self):
+        return os.path.join(self.cache.directory, f"{self.name}-{self.key}.pkl")
+
+    @property
+    def cached(self):
+        """Whether an output for this key is on disk."""
+        return self.cache.directory is not None and os.path.exists(self.path)
+
+    @property
+    def value(self):
+        """The stage's output, loaded from disk on a hit and computed and stored on a miss."""
+        if self.status != "pending":
+            return self._value
+        # Stages read their upstream stages lazily, so this one may run inside a consumer.
+        consumer = self.cache._running[-1] if self.cache._running else None
+        owner = consumer is None and self.cache._start_tracing()
+        if self.cache._tracing:
+            peak = _restart_tracing()
+            if consumer is not None:
+                consumer.peak_bytes = max(consumer.peak_bytes or 0, peak)
+        start = time.perf_counter()
+        self.cache._running.append(self)
+        try:
+            self._compute()
+        finally:
+            elapsed = time.perf_counter() - start
+            self.cache._running.pop()
+            if self.cache._tracing:
+                self.peak_bytes = max(self.peak_bytes or 0, _restart_tracing())
+            if owner:
+                self.cache._stop_tracing()
+        self.seconds = elapsed - self._upstream_seconds
+        if consumer is not None:
+            consumer._upstream_seconds += elapsed
+        return self._value
+
+    def _compute(self):
+        if self.cached:
+            self._value = joblib.load(self.path)
+            os.utime(self.path)
+            self.status = "hit"
+        else:
+            self._value = self._func()
+            self.status = "miss"
+            if self.cache.directory is not None:
+                self.cache.store(self)
+
+
+class StageCache:
+    """
+    On-disk memo of pipeline stage outputs.
+
+    A stage's key hashes its parameters, the keys of the stages it consumes and a ``salt`` (e.g. a
+    hash of the pipeline's source code), so changing an input or parameter recomputes that stage
+    and everything downstream of it, while unchanged stages are loaded instead. Outputs are read
+    lazily: a cached stage whose consumers are all cached is never loaded at all. Only the
+    ``max_entries`` most recently used outputs of each stage are kept.
+
+    Attributes:
+        directory (str or None): Cache directory; None disables caching (every stage runs).
+        max_entries (int): Outputs kept per stage.
+        salt (str): Mixed into every key.
+        trace_memory (bool): Record each stage's peak memory with ``tracemalloc``. The cache
+            starts the tracer itself and restarts it around every stage, so peaks are skipped
+            when something else (a profiler, ``python -X tracemalloc``) is already tracing.
+        stages (list of Stage): Stages declared so far, in pipeline order.
+    """
+
+    def __init__(self, directory=None, max_entries=2, salt="", trace_memory=False):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.salt = salt
+        self.trace_memory = trace_memory
+        self.stages = []
+        self._running = []
+        self._tracing = False
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def _start_tracing(self):
+        """Starts ``tracemalloc`` for a top-level stage; returns whether the cache started it."""
+        if not self.trace_memory:
+            return False
+        if tracemalloc.is_tracing():
+            logging.warning(
+                "tracemalloc is already tracing, stage peak memory is not recorded"
+            )
+            return False
+        tracemalloc.start()
+        self._tracing = True
+        return True
+
+    def _stop_tracing(self):
+        tracemalloc.stop()
+        self._tracing = False
+
+    def stage(self, name, func, params, upstream=()):
+        """
+        Declares a stage without running it.
+
+        Args:
+            name (str): Stage name.
+            func (callable): Computes the output with no arguments, reading ``upstream[i].value``.
+            params (dict): JSON-serialisable parameters that determine the output.
+            upstream (iterable of Stage or str): Stages, or keys of external inputs such as a data
+                file hash, that ``func`` consumes.
+
+        Returns:
+            Stage: Read ``.value`` to obtain the output.
+        """
+        payload = json.dumps(
+            {
+                "stage": name,
+                "params": params,
+                "upstream": [getattr(item, "key", item) for item in upstream],
+                "salt": self.salt,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        key = hashlib.sha256(payload.encode()).hexdigest()[:16]
+        stage = Stage(self, name, key, func)
+        self.stages.append(stage)
+        return stage
+
+    def store(self, stage):
+        """Writes a stage's output atomically and evicts its least recently used entries."""
+        joblib.dump(stage._value, f"{stage.path}.tmp")
+        os.replace(f"{stage.path}.tmp", stage.path)
+        keep = self.max_entries
+        entries = sorted(
+            glob.glob(os.path.join(self.directory, f"{stage.name}-*.pkl")),
+            key=os.path.getmtime,
+            reverse=True,
+        )
+        for stale in entries[keep:]:
+            os.remove(stale)
+
+    def report(self):
+        """
+        Logs and returns which stages hit, missed or were skipped.
+
+        Returns:
+            pandas.DataFrame: One row per stage with its status, key and seconds spent, plus its
+            peak traced memory in MB when the cache traced memory.
+        """
+        report = pd.DataFrame(
+            [
+                {
+                    "stage": stage.name,
+                    "status": "skipped" if stage.status == "pending" else stage.status,
+                    "key": stage.key,
+                    "seconds": round(stage.seconds, 3),
+                    "peak_mb": (
+                        None
+                        if stage.peak_bytes is None
+                        else round(stage.peak_bytes / 1e6, 1)
+                    ),
+                }
+                for stage in self.stages
+            ]
+        ).set_index("stage")
+        if report["peak_mb"].isna().all():
+            report = report.drop(columns="peak_mb")
+        logging.info("Pipeline stages:\n%s", report.to_string())
+        return report
@@ -0,0 +1,321 @@
+__all__ = [
+    "calibration_metrics",
+    "fit_pipeline",
+    "summarize_replicates",
+    "validate_pipeline",
+    "validation_tasks",
+]
+
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import StratifiedKFold
+from threadpoolctl import threadpool_limits
+
+from statefarm.data.data_preparation import DataPreprocessor
+from statefarm.data.snapshot import load_csv
+from statefarm.modeling.models import LogisticRegressionAnalysis
+
+
+COLUMNS_TO_CONVERT = ["x12", "x63"]
+COLUMNS_TO_DUMMY = ["x5", "x31", "x81", "x82"]
+CALIBRATION_BINS = 10
+METRICS = ("auc", "brier", "calibration_in_the_large", "calibration_slope", "ece")
+
+# Read-only data of a worker process, set once by ``_load_data``.
+_data = None
+_settings = None
+
+
+def fit_pipeline(
+    df,
+    columns_to_convert,
+    columns_to_impute,
+    columns_to_dummy,
+    target_column="y",
+    top_k=25,
+):
+    """
+    Fits the training pipeline of ``train_model`` on one frame: preprocess, select, fit.
+
+    Args:
+        df (pandas.DataFrame): Raw training rows including the target, with a unique index.
+        columns_to_convert (list of str): Formatted number columns.
+        columns_to_impute (list of str): Numeric columns imputed and standardized.
+        columns_to_dummy (list of str): Categorical columns one-hot encoded.
+        target_column (str): The target column.
+        top_k (int): Number of variables selected by the exploratory model.
+
+    Returns:
+        tuple: The fitted ``DataPreprocessor`` and ``LogisticRegressionAnalysis``.
+    """
+    preprocessor = DataPreprocessor(
+        columns_to_convert,
+        columns_to_impute,
+        columns_to_dummy,
+        target_column=target_column,
+    )
+    train = preprocessor.fit_transform(df.drop(columns=[target_column]))
+    train = train.join(df[target_column])
+    lr_analysis = LogisticRegressionAnalysis()
+    lr_analysis.fit_exploratory_model(train, target_column, top_k=top_k)
+    lr_analysis.fit_final_model(
+        train[lr_analysis.variables + [target_column]], target_column, disp=False
+    )
+    return preprocessor, lr_analysis
+
+
+def calibration_metrics(y, phat, bins=CALIBRATION_BINS):
+    """
+    Discrimination and calibration of scores against outcomes.
+
+    Args:
+        y (numpy.ndarray): Observed 0/1 outcomes.
+        phat (numpy.ndarray): Predicted probabilities.
+        bins (int): Equal-count bins of the expected calibration error.
+
+    Returns:
+        dict: ``auc``; ``brier`` score; ``calibration_in_the_large``, the mean outcome minus the
+        mean phat; ``calibration_slope``, the slope of a logistic regression of the outcomes on
+        the logit of phat (1 when calibrated, below 1 when scores are too extreme); and ``ece``,
+        the count-weighted mean gap between outcome rate and mean phat over the bins.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    phat = np.clip(np.asarray(phat, dtype=np.float64), 1e-12, 1 - 1e-12)
+    logit = np.log(phat / (1 - phat))
+    X = np.column_stack([np.ones_like(logit), logit])
+    params = np.array([0.0, 1.0])
+    for _ in range(25):
+        fitted = 1 / (1 + np.exp(-X @ params))
+        hessian = (X * (fitted * (1 - fitted))[:, None]).T @ X
+        step = np.linalg.lstsq(hessian, X.T @ (y - fitted), rcond=None)[0]
+        params += step
+        if np.max(np.abs(step)) < 1e-8:
+            break
+
+    order = np.argsort(phat, kind="stable")
+    gaps = [
+        len(rows) * abs(y[rows].mean() - phat[rows].mean())
+        for rows in np.array_split(order, min(bins, len(order)))
+        if len(rows)
+    ]
+    return {
+        "auc": roc_auc_score(y, phat),
+        "brier": float(np.mean((phat - y) ** 2)),
+        "calibration_in_the_large": float(y.mean() - phat.mean()),
+        "calibration_slope": float(params[1]),
+        "ece": float(np.sum(gaps) / len(y)),
+    }
+
+
+def validation_tasks(y, folds=5, bootstraps=100, seed=13):
+    """
+    Lists the fits of a validation run as train and evaluation row positions.
+
+    Folds are stratified on the target. Each bootstrap replicate trains on ``len(y)`` rows drawn
+    with replacement and is evaluated on the rows it did not draw (out of bag, about 37%).
+
+    Args:
+        y (numpy.ndarray): The target of every row.
+        folds (int): Cross-validation folds; 0 skips cross-validation.
+        bootstraps (int): Bootstrap replicates.
+        seed (int): Seed of the folds and draws.
+
+    Returns:
+        list of tuple: ``(method, replicate, train_rows, eval_rows)``, method ``cv`` or
+        ``bootstrap``.
+    """
+    tasks = []
+    if folds:
+        splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed)
+        for replicate, (train_rows, eval_rows) in enumerate(
+            splitter.split(np.zeros(len(y)), y)
+        ):
+            tasks.append(("cv", replicate, train_rows, eval_rows))
+    rng = np.random.default_rng(seed)
+    for replicate in range(bootstraps):
+        train_rows = rng.integers(0, len(y), len(y))
+        drawn = np.zeros(len(y), dtype=bool)
+        drawn[train_rows] = True
+        tasks.append(
+            ("bootstrap", replicate, np.sort(train_rows), np.flatnonzero(~drawn))
+        )
+    return tasks
+
+
+def _load_data(data_path, settings):
+    """Maps the data snapshot once per process; tasks then only carry row positions."""
+    global _data, _settings
+    _data = load_csv(data_path) if data_path else None
+    _settings = settings
+
+
+def _init_worker(data_path, settings):
+    """Worker initializer: loads the data and quietens the per-fit logging."""
+    _load_data(data_path, settings)
+    logging.getLogger().setLevel(logging.WARNING)
+    # One BLAS thread per process, so workers do not oversubscribe the cores.
+    threadpool_limits(1)
+
+
+def _run_task(task):
+    """Fits the pipeline on a task's train rows and scores its evaluation rows."""
+    method, replicate, train_rows, eval_rows = task
+    start = time.perf_counter()
+    target_column = _settings["target_column"]
+    # Bootstrap draws repeat rows; a fresh index keeps the target aligned with the features.
+    train = _data.iloc[train_rows].reset_index(drop=True)
+    evaluate = _data.iloc[eval_rows].reset_index(drop=True)
+    preprocessor, lr_analysis = fit_pipeline(
+        train,
+        _settings["columns_to_convert"],
+        _settings["columns_to_impute"],
+        _settings["columns_to_dummy"],
+        target_column,
+        _settings["top_k"],
+    )
+    features = preprocessor.transform(evaluate.drop(columns=[target_column]))
+    phat = lr_analysis.final_result.predict(features[lr_analysis.variables])
+    return {
+        "method": method,
+        "replicate": replicate,
+        "train_rows": len(train_rows),
+        "eval_rows": len(eval_rows),
+        **calibration_metrics(evaluate[target_column].to_numpy(), phat),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def summarize_replicates(replicates, confidence=0.95):
+    """
+    Confidence intervals of each metric from per-replicate results.
+
+    Cross-validation intervals are t intervals of the fold mean. Bootstrap intervals are the
+    percentiles of the out-of-bag replicates.
+
+    Args:
+        replicates (pandas.DataFrame): One row per fit, from ``validate_pipeline``.
+        confidence (float): Coverage of the intervals.
+
+    Returns:
+        pandas.DataFrame: ``estimate``, ``std``, ``lower``, ``upper`` and ``n`` per method and
+        metric.
+    """
+    alpha = 1 - confidence
+    summary = []
+    for method, group in replicates.groupby("method", sort=False):
+        for metric in METRICS:
+            values = group[metric].dropna().to_numpy()
+            estimate, std = (
+                values.mean(),
+                values.std(ddof=1) if len(values) > 1 else np.nan,
+            )
+            if method == "cv":
+                margin = (
+                    stats.t.ppf(1 - alpha / 2, len(values) - 1)
+                    * std
+                    / np.sqrt(len(values))
+                )
+                lower, upper = estimate - margin, estimate + margin
+            else:
+                lower, upper = np.quantile(values, [alpha / 2, 1 - alpha / 2])
+            summary.append(
+                {
+                    "method": method,
+                    "metric": metric,
+                    "estimate": estimate,
+                    "std": std,
+                    "lower": lower,
+                    "upper": upper,
+                    "n": len(values),
+                }
+            )
+    return pd.DataFrame(summary).set_index(["method", "metric"])
+
+
+def validate_pipeline(
+    data_path,
+    folds=5,
+    bootstraps=100,
+    workers=None,
+    top_k=25,
+    target_column="y",
+    seed=13,
+    confidence=0.95,
+):
+    """
+    Cross-validates and bootstraps the whole preprocess, select and fit pipeline in parallel.
+
+    Every fit refits the preprocessor, the exploratory selection and the final model on its
+    training rows and is scored on rows it never saw, so the metrics carry the variance of
+    variable selection too. Fits run on a process pool. Each worker memory-maps the CSV's binary
+    snapshot (see ``statefarm.data.snapshot.load_csv``), so the numeric columns are shared
+    through the page cache instead of copied per worker, and a task only carries its row
+    positions.
+
+    Args:
+        data_path (str): Path to the training data CSV file.
+        folds (int): Cross-validation folds; 0 skips cross-validation.
+        bootstraps (int): Bootstrap replicates.
+        workers (int, optional): Worker processes; defaults to the CPU count, ``1`` runs inline.
+        top_k (int): Number of variables selected by the exploratory model.
+        target_column (str): The target column.
+        seed (int): Seed of the folds and bootstrap draws.
+        confidence (float): Coverage of the intervals.
+
+    Returns:
+        tuple: The interval summary from ``summarize_replicates`` and a dataframe of the
+        metrics of every fit.
+    """
+    df = load_csv(data_path)
+    settings = {
+        "columns_to_convert": COLUMNS_TO_CONVERT,
+        "columns_to_impute": [
+            col
+            for col in df.columns
+            if col not in [target_column] + COLUMNS_TO_DUMMY + COLUMNS_TO_CONVERT
+        ],
+        "columns_to_dummy": COLUMNS_TO_DUMMY,
+        "target_column": target_column,
+        "top_k": top_k,
+    }
+    tasks = validation_tasks(df[target_column].to_numpy(), folds, bootstraps, seed)
+    del df
+
+    start = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        level = logging.getLogger().level
+        _load_data(data_path, settings)
+        logging.getLogger().setLevel(logging.WARNING)
+        try:
+            results = [_run_task(task) for task in tasks]
+        finally:
+            logging.getLogger().setLevel(level)
+            _load_data(None, None)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(data_path, settings),
+        ) as executor:
+            results = list(executor.map(_run_task, tasks))
+    wall_seconds = time.perf_counter() - start
+
+    replicates = pd.DataFrame(results)
+    summary = summarize_replicates(replicates, confidence)
+    logging.info(
+        "Validated the pipeline with %s fits on %s workers in %.1fs (%.1fs of fitting):\n%s",
+        len(tasks),
+        workers,
+        wall_seconds,
+        replicates["seconds"].sum(),
+        summary.round(4).to_string(),
+    )
+    return summary, replicates
@@ -0,0 +1,133 @@
+__all__ = ["benchmark_explain"]
+
+import argparse
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from statefarm.app.responses import explanation_records
+from statefarm.modeling.scorer import Scorer
+
+
+def _median_seconds(func, repeats):
+    """Runs ``func`` ``repeats`` times after one untimed call and returns the median wall time."""
+    func()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def benchmark_explain(
+    data_path, model_path, preprocessor_path, rows=10000, top_k=3, repeats=5
+):
+    """
+    Measures what ``explain=true`` adds to scoring a batch.
+
+    Both modes score the same distinct rows; ``scoring`` times ``score_batch`` against
+    ``explain_batch``, ``records`` adds building the ``/batch_predict`` records response.
+
+    Args:
+        data_path (str): CSV file of rows to score; it is tiled to reach ``rows``.
+        model_path (str): Path to the trained model.
+        preprocessor_path (str): Path to the fitted preprocessor.
+        rows (int): Rows per batch.
+        top_k (int): Contributions explained per row.
+        repeats (int): Timed runs per mode; the median is reported.
+
+    Returns:
+        pandas.DataFrame: Seconds without and with explanations and the relative overhead, per
+        stage.
+    """
+    logging.basicConfig(level=logging.INFO)
+    source = pd.read_csv(data_path).drop(columns=["y"], errors="ignore")
+    df = pd.concat([source] * int(np.ceil(rows / len(source))), ignore_index=True)
+    # Distinct rows, so deduplication does not hide the scoring work.
+    df = df.head(rows).assign(x0=np.arange(rows, dtype=np.float64))
+    scorer = Scorer.from_paths(model_path, preprocessor_path, chunk_rows=rows)
+
+    def records(phat, business_outcome):
+        return pd.DataFrame(
+            {
+                "timestamp": time.time(),
+                "phat": phat,
+                "business_outcome": business_outcome,
+            }
+        ).to_dict(orient="records")
+
+    def plain_records():
+        return records(*scorer.score_batch(df))
+
+    def explained_records():
+        phat, business_outcome, names, contributions = scorer.explain_batch(df, top_k)
+        responses = records(phat, business_outcome)
+        for response, explanation in zip(
+            responses, explanation_records(names, contributions)
+        ):
+            response["explanation"] = explanation
+        return responses
+
+    report = pd.DataFrame(
+        {
+            "plain_s": [
+                _median_seconds(lambda: scorer.score_batch(df), repeats),
+                _median_seconds(plain_records, repeats),
+            ],
+            "explain_s": [
+                _median_seconds(lambda: scorer.explain_batch(df, top_k), repeats),
+                _median_seconds(explained_records, repeats),
+            ],
+        },
+        index=pd.Index(["scoring", "records"], name="stage"),
+    )
+    report["overhead"] = report["explain_s"] / report["plain_s"] - 1
+    logging.info(
+        "Explanation benchmark (%s rows, top_k=%s):\n%s",
+        rows,
+        top_k,
+        report.round(4).to_string(),
+    )
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the overhead of explain=true on a batch."
+    )
+    parser.add_argument(
+        "--data_path",
+        type=str,
+        required=True,
+        help="CSV file of rows to score",
+    )
+    parser.add_argument(
+        "--model_path",
+        type=str,
+        required=True,
+        help="Path to the trained model",
+    )
+    parser.add_argument(
+        "--preprocessor_path",
+        type=str,
+        required=True,
+        help="Path to the fitted data preprocessor",
+    )
+    parser.add_argument("--rows", type=int, default=10000, help="Rows per batch")
+    parser.add_argument(
+        "--top_k", type=int, default=3, help="Contributions explained per row"
+    )
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per mode")
+
+    args = parser.parse_args()
+    benchmark_explain(
+        args.data_path,
+        args.model_path,
+        args.preprocessor_path,
+        args.rows,
+        args.top_k,
+        args.repeats,
+    )
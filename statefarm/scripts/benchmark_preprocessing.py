@@ -0,0 +1,137 @@
+__all__ = ["benchmark_preprocessing"]
+
+import argparse
+import logging
+import time
+import tracemalloc
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from statefarm.data.data_preparation import DataPreprocessor, COMPACT_PHAT_TOLERANCE
+
+
+def _measure(func, make_input):
+    """
+    Runs ``func`` on a fresh input untraced for the wall time, then on another with
+    ``tracemalloc`` for the peak memory.
+
+    Tracing slows every allocation, and the modes allocate differently (the compact mode casts
+    to ``category``), so timing a traced run distorts the comparison of their throughput.
+
+    Args:
+        func (callable): The preprocessing step, which may modify its input.
+        make_input (callable): Builds the input frame; called once per run.
+
+    Returns:
+        tuple: The result, the wall time in seconds and the traced peak in bytes.
+    """
+    df = make_input()
+    start = time.perf_counter()
+    result = func(df)
+    elapsed = time.perf_counter() - start
+    df = make_input()
+    tracemalloc.start()
+    try:
+        func(df)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def benchmark_preprocessing(data_path, preprocessor_path, model_path=None, rows=100000):
+    """
+    Compares the default and compact preprocessing modes on a replicated training frame.
+
+    Args:
+        data_path (str): Path to the training CSV file.
+        preprocessor_path (str): Path to a fitted preprocessor whose column lists are reused.
+        model_path (str, optional): Path to a trained model used to compare the scores.
+        rows (int): Number of rows to benchmark with; the CSV is tiled to reach it.
+
+    Returns:
+        pandas.DataFrame: One row per mode with timings, peak and output memory in MB.
+    """
+    logging.basicConfig(level=logging.INFO)
+    source = pd.read_csv(data_path)
+    df = pd.concat([source] * int(np.ceil(rows / len(source))), ignore_index=True)
+    df = df.head(rows)
+    fitted = joblib.load(preprocessor_path)
+    model = joblib.load(model_path) if model_path else None
+
+    report, scores = [], {}
+    for compact in (False, True):
+        preprocessor = DataPreprocessor(
+            fitted.columns_to_convert,
+            fitted.columns_to_impute,
+            fitted.columns_to_dummy,
+            target_column="y",
+            compact=compact,
+        )
+        train, fit_seconds, fit_peak = _measure(preprocessor.fit_transform, df.copy)
+        scored, transform_seconds, transform_peak = _measure(
+            preprocessor.transform, lambda: df.drop(columns=["y"])
+        )
+        if model is not None:
+            scores[compact] = np.asarray(
+                model.final_result.predict(scored[model.variables])
+            )
+        report.append(
+            {
+                "mode": "compact" if compact else "default",
+                "fit_transform_s": fit_seconds,
+                "transform_s": transform_seconds,
+                "transform_rows_per_s": rows / transform_seconds,
+                "fit_peak_mb": fit_peak / 1e6,
+                "transform_peak_mb": transform_peak / 1e6,
+                "output_mb": train.memory_usage(deep=True).sum() / 1e6,
+            }
+        )
+
+    report = pd.DataFrame(report).set_index("mode")
+    logging.info(
+        "Preprocessing benchmark (%s rows):\n%s", rows, report.round(3).to_string()
+    )
+    if scores:
+        max_delta = float(np.max(np.abs(scores[True] - scores[False])))
+        logging.info(
+            "Max |phat| delta %.2e (tolerance %.0e)", max_delta, COMPACT_PHAT_TOLERANCE
+        )
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark default versus compact preprocessing."
+    )
+    parser.add_argument(
+        "--data_path",
+        type=str,
+        required=True,
+        help="Path to the training data CSV file",
+    )
+    parser.add_argument(
+        "--preprocessor_path",
+        type=str,
+        required=True,
+        help="Path to a fitted data preprocessor",
+    )
+    parser.add_argument(
+        "--model_path",
+        type=str,
+        default=None,
+        help="Optional path to a trained model to compare scores",
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=100000,
+        help="Number of rows to benchmark with",
+    )
+
+    args = parser.parse_args()
+    benchmark_preprocessing(
+        args.data_path, args.preprocessor_path, args.model_path, args.rows
+    )
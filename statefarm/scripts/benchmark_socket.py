@@ -0,0 +1,123 @@
+__all__ = ["benchmark_socket"]
+
+import argparse
+import http.client
+import json
+import logging
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+import pandas as pd
+
+from statefarm.app.socket_transport import ScoringSocketClient
+
+
+def _latencies(call, payloads):
+    """Calls ``call`` once per payload and returns the latency of each call in milliseconds."""
+    latencies = []
+    for payload in payloads:
+        start = time.perf_counter()
+        call(payload)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return np.array(latencies)
+
+
+def benchmark_socket(data_path, url, socket_path, calls=1000, batch_rows=1, warmup=50):
+    """
+    Compares the per-call latency of ``/predict`` (or ``/batch_predict``) and the scoring socket.
+
+    Start the API with ``SCORING_SOCKET_PATH`` set first; both transports then score the same rows
+    with the same model. HTTP calls reuse one keep-alive connection, so the comparison measures
+    the transports and not connection setup.
+
+    Args:
+        data_path (str): CSV file of rows to send; the target column is dropped if present.
+        url (str): Base URL of the API, e.g. ``http://localhost:5000``.
+        socket_path (str): The API's ``SCORING_SOCKET_PATH``.
+        calls (int): Timed calls per transport.
+        batch_rows (int): Rows per call; ``1`` uses ``/predict``, more uses ``/batch_predict``.
+        warmup (int): Untimed calls per transport made first.
+
+    Returns:
+        pandas.DataFrame: Latency percentiles in milliseconds and rows per second per transport.
+    """
+    logging.basicConfig(level=logging.INFO)
+    rows = pd.read_csv(data_path).drop(columns=["y"], errors="ignore")
+    batches = [
+        rows.sample(batch_rows, replace=True, random_state=i)
+        for i in range(calls + warmup)
+    ]
+
+    endpoint = urlsplit(url)
+    connection = http.client.HTTPConnection(endpoint.hostname, endpoint.port or 80)
+    path = "/predict" if batch_rows == 1 else "/batch_predict"
+
+    def post(batch):
+        records = json.loads(batch.to_json(orient="records"))
+        body = json.dumps({"data": records[0] if batch_rows == 1 else records})
+        connection.request(
+            "POST", path, body, headers={"Content-Type": "application/json"}
+        )
+        response = connection.getresponse()
+        answer = response.read()
+        if response.status != 200:
+            raise RuntimeError(f"{path} returned {response.status}: {answer[:200]}")
+        return answer
+
+    client = ScoringSocketClient(socket_path)
+    scores, report = {}, []
+    for transport, call in (("http", post), ("socket", client.score)):
+        _latencies(call, batches[:warmup])
+        latencies = _latencies(call, batches[warmup:])
+        report.append(
+            {
+                "transport": transport,
+                "calls": calls,
+                "batch_rows": batch_rows,
+                "mean_ms": latencies.mean(),
+                "p50_ms": np.quantile(latencies, 0.5),
+                "p90_ms": np.quantile(latencies, 0.9),
+                "p99_ms": np.quantile(latencies, 0.99),
+                "rows_per_second": calls * batch_rows / latencies.sum() * 1000,
+            }
+        )
+        scores[transport] = call(batches[-1])
+    connection.close()
+    client.close()
+
+    answer = json.loads(scores["http"])
+    http_phat = [answer["phat"]] if batch_rows == 1 else [r["phat"] for r in answer]
+    np.testing.assert_allclose(scores["socket"][0], http_phat, rtol=1e-9)
+
+    report = pd.DataFrame(report).set_index("transport")
+    logging.info("Scoring transport latency:\n%s", report.round(3).to_string())
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare per-call latency of the HTTP API and the scoring socket."
+    )
+    parser.add_argument(
+        "--data_path", type=str, required=True, help="Path to a CSV file of rows"
+    )
+    parser.add_argument(
+        "--url", type=str, default="http://localhost:5000", help="Base URL of the API"
+    )
+    parser.add_argument(
+        "--socket_path", type=str, required=True, help="The API's SCORING_SOCKET_PATH"
+    )
+    parser.add_argument("--calls", type=int, default=1000, help="Timed calls")
+    parser.add_argument("--batch_rows", type=int, default=1, help="Rows per call")
+    parser.add_argument("--warmup", type=int, default=50, help="Untimed calls first")
+
+    args = parser.parse_args()
+    benchmark_socket(
+        args.data_path,
+        args.url,
+        args.socket_path,
+        args.calls,
+        args.batch_rows,
+        args.warmup,
+    )
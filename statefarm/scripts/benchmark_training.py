@@ -0,0 +1,131 @@
+__all__ = ["benchmark_training"]
+
+import argparse
+import logging
+import os
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from statefarm.data.snapshot import load_csv
+from statefarm.data.synthetic import SyntheticDataGenerator
+from statefarm.scripts.train_model import train_model
+
+
+def _traced(func, *args, **kwargs):
+    """Runs ``func`` with ``tracemalloc`` tracing and returns its result, wall time and peak."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def benchmark_training(data_path, sizes, out_dir, chunk_rows=100000, seed=13):
+    """
+    Runs the training pipeline on synthetic CSVs of increasing size.
+
+    A ``SyntheticDataGenerator`` is fitted on the training CSV and streams a CSV of each size into
+    ``out_dir``. For each size the generation is timed, and the first load (which writes the
+    binary ``.npy`` snapshot of the CSV) and every stage of ``train_model`` are timed with their peak traced memory.
+    Stage seconds exclude the upstream stages they trigger and include the overhead of
+    ``tracemalloc``; generation runs untraced, as tracing its many small strings slows it down
+    several times.
+
+    Args:
+        data_path (str): Path to the training data CSV file the generator learns from.
+        sizes (list of int): Numbers of rows to benchmark with.
+        out_dir (str): Directory of the synthetic CSVs, snapshots and trained artifacts.
+        chunk_rows (int): Rows generated and written at a time.
+        seed (int): Seed of the generator.
+
+    Returns:
+        pandas.DataFrame: ``status``, ``seconds`` and ``peak_mb`` per size and stage.
+    """
+    logging.basicConfig(level=logging.INFO)
+    generator = SyntheticDataGenerator.from_csv(data_path)
+    report = []
+    for rows in sizes:
+        path = os.path.join(out_dir, f"synthetic_{rows}.csv")
+        start = time.perf_counter()
+        generator.write_csv(path, rows, chunk_rows, seed)
+        generate_seconds = time.perf_counter() - start
+        _, load_seconds, load_peak = _traced(load_csv, path)
+        stages = train_model(
+            path,
+            os.path.join(out_dir, f"models_{rows}", "model.pkl"),
+            os.path.join(out_dir, f"models_{rows}", "preprocessor.pkl"),
+            trace_memory=True,
+        )
+        stages = stages[["status", "seconds", "peak_mb"]].reset_index()
+        stages = pd.concat(
+            [
+                pd.DataFrame(
+                    {
+                        "stage": ["generate", "load"],
+                        "status": "miss",
+                        "seconds": [generate_seconds, load_seconds],
+                        "peak_mb": [np.nan, load_peak / 1e6],
+                    }
+                ),
+                stages,
+            ],
+            ignore_index=True,
+        )
+        stages.insert(0, "rows", rows)
+        report.append(stages)
+        logging.info("Training benchmark (%s rows):\n%s", rows, stages.round(3))
+
+    order = report[0]["stage"].tolist()
+    report = pd.concat(report, ignore_index=True).set_index(["rows", "stage"])
+    for column, label, digits in (("seconds", "Seconds", 2), ("peak_mb", "Peak MB", 1)):
+        logging.info(
+            "%s per stage and size:\n%s",
+            label,
+            report[column].unstack("rows").reindex(order).round(digits).to_string(),
+        )
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the training pipeline on synthetic data of increasing size."
+    )
+    parser.add_argument(
+        "--data_path",
+        type=str,
+        required=True,
+        help="Path to the training data CSV file the synthetic data follows",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=str,
+        default="40000,400000",
+        help="Comma-separated numbers of rows to benchmark with",
+    )
+    parser.add_argument(
+        "--out_dir",
+        type=str,
+        required=True,
+        help="Directory for the synthetic CSVs and trained artifacts",
+    )
+    parser.add_argument(
+        "--chunk_rows",
+        type=int,
+        default=100000,
+        help="Rows generated and written at a time",
+    )
+
+    args = parser.parse_args()
+    benchmark_training(
+        args.data_path,
+        [int(size) for size in args.sizes.split(",")],
+        args.out_dir,
+        args.chunk_rows,
+    )
@@ -0,0 +1,215 @@
+__all__ = ["compare_scores", "load_traffic", "replay_traffic"]
+
+import argparse
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from statefarm import Scorer
+from statefarm.app.prediction_log import META_COLUMNS, read_predictions
+from statefarm.data.deduplication import deduplicate_rows
+
+
+_candidates = {}
+
+
+def load_traffic(source, start=None, end=None):
+    """
+    Loads recorded request rows from a prediction log directory or an NDJSON capture.
+
+    NDJSON lines may be raw rows or request payloads of the form ``{"data": {...}}`` (``/predict``)
+    or ``{"data": [...]}`` (batch endpoints).
+
+    Args:
+        source (str): Prediction log directory or ``.ndjson``/``.jsonl`` file.
+        start (float, optional): Earliest UNIX timestamp to replay (prediction logs only).
+        end (float, optional): Latest UNIX timestamp to replay (prediction logs only).
+
+    Returns:
+        pandas.DataFrame: One raw input row per recorded prediction.
+    """
+    if os.path.isdir(source):
+        traffic = read_predictions(source, start, end)
+        return traffic.drop(columns=META_COLUMNS)
+    traffic = pd.read_json(source, lines=True, dtype=False)
+    if "data" in traffic.columns:
+        rows = []
+        for data in traffic["data"]:
+            rows.extend(data if isinstance(data, list) else [data])
+        traffic = pd.DataFrame(rows)
+    return traffic
+
+
+def _load_candidates(candidates):
+    for name, model_path, preprocessor_path in candidates:
+        _candidates[name] = Scorer.from_paths(model_path, preprocessor_path)
+
+
+def _score_chunk(chunk):
+    """Scores one chunk with every loaded candidate; returns phats and seconds per candidate."""
+    results = {}
+    for name, scorer in _candidates.items():
+        start = time.perf_counter()
+        phat, _ = scorer.score_batch(chunk)
+        results[name] = (phat, time.perf_counter() - start)
+    return results
+
+
+def compare_scores(baseline, candidate, threshold=0.75):
+    """
+    Summarises how a candidate's scores differ from the baseline's on the same rows.
+
+    Args:
+        baseline (numpy.ndarray): Baseline phats.
+        candidate (numpy.ndarray): Candidate phats.
+        threshold (float): Decision threshold of ``business_outcome``.
+
+    Returns:
+        dict: Delta distribution (mean, std, quantiles of the absolute delta) and decision flips.
+    """
+    delta = candidate - baseline
+    abs_delta = np.abs(delta)
+    before, after = baseline >= threshold, candidate >= threshold
+    return {
+        "delta_mean": float(delta.mean()),
+        "delta_std": float(delta.std()),
+        "abs_delta_p50": float(np.quantile(abs_delta, 0.5)),
+        "abs_delta_p90": float(np.quantile(abs_delta, 0.9)),
+        "abs_delta_p99": float(np.quantile(abs_delta, 0.99)),
+        "abs_delta_max": float(abs_delta.max()),
+        "flips": int((before != after).sum()),
+        "flip_rate": float((before != after).mean()),
+        "flips_to_1": int((~before & after).sum()),
+        "flips_to_0": int((before & ~after).sum()),
+    }
+
+
+def replay_traffic(traffic, candidates, chunk_rows=20000, workers=None, threshold=0.75):
+    """
+    Scores recorded traffic with several model/preprocessor pairs in one pass and compares them.
+
+    The traffic is deduplicated on the inputs any candidate uses, split into chunks, and every
+    chunk is scored by all candidates in the same worker process, so the rows are read and shipped
+    once however many candidates there are.
+
+    Args:
+        traffic (pandas.DataFrame): Raw input rows, e.g. from ``load_traffic``.
+        candidates (list of tuple): ``(name, model_path, preprocessor_path)``; the first one is
+            the baseline the others are compared with.
+        chunk_rows (int): Distinct rows per chunk.
+        workers (int, optional): Worker processes; defaults to the CPU count, ``1`` scores inline.
+        threshold (float): Decision threshold of ``business_outcome``.
+
+    Returns:
+        tuple: A report dataframe with one row per candidate (throughput, delta distribution and
+               flips versus the baseline) and a dataframe of the phats of every candidate.
+    """
+    _load_candidates(candidates)
+    columns = []
+    for scorer in _candidates.values():
+        columns += scorer.source_columns
+    positions, inverse = deduplicate_rows(traffic, list(dict.fromkeys(columns)))
+    distinct = traffic.iloc[positions]
+    chunks = []
+    for offset in range(0, len(distinct), chunk_rows):
+        stop = offset + chunk_rows
+        chunks.append(distinct.iloc[offset:stop])
+
+    start = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        results = [_score_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_load_candidates, initargs=(candidates,)
+        ) as executor:
+            results = list(executor.map(_score_chunk, chunks))
+    wall_seconds = time.perf_counter() - start
+
+    names = [name for name, _, _ in candidates]
+    scores = pd.DataFrame(
+        {
+            name: np.concatenate([result[name][0] for result in results])[inverse]
+            for name in names
+        }
+    )
+    report = []
+    for name in names:
+        seconds = sum(result[name][1] for result in results)
+        report.append(
+            {
+                "candidate": name,
+                "rows": len(traffic),
+                "distinct_rows": len(distinct),
+                "score_seconds": seconds,
+                "rows_per_second": len(distinct) / seconds if seconds else np.inf,
+                **compare_scores(
+                    scores[names[0]].to_numpy(), scores[name].to_numpy(), threshold
+                ),
+            }
+        )
+    report = pd.DataFrame(report).set_index("candidate")
+    logging.info(
+        "Replayed %s rows (%s distinct) with %s candidates in %.2fs (%.0f rows/s)",
+        len(traffic),
+        len(distinct),
+        len(names),
+        wall_seconds,
+        len(traffic) / wall_seconds if wall_seconds else np.inf,
+    )
+    return report, scores
+
+
+def _candidate(value):
+    name, model_path, preprocessor_path = value.split(",")
+    return name, model_path, preprocessor_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Replay recorded traffic against several models and compare their scores."
+    )
+    parser.add_argument(
+        "--source",
+        type=str,
+        required=True,
+        help="Prediction log directory or NDJSON file of recorded requests",
+    )
+    parser.add_argument(
+        "--candidate",
+        type=_candidate,
+        action="append",
+        required=True,
+        help="name,model_path,preprocessor_path; repeat it, the first one is the baseline",
+    )
+    parser.add_argument(
+        "--start", type=float, default=None, help="Earliest UNIX timestamp to replay"
+    )
+    parser.add_argument(
+        "--end", type=float, default=None, help="Latest UNIX timestamp to replay"
+    )
+    parser.add_argument(
+        "--chunk_rows", type=int, default=20000, help="Distinct rows per chunk"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: CPUs)"
+    )
+    parser.add_argument(
+        "--output", type=str, default=None, help="Optional CSV path for the phats"
+    )
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    report, scores = replay_traffic(
+        load_traffic(args.source, args.start, args.end),
+        args.candidate,
+        args.chunk_rows,
+        args.workers,
+    )
+    logging.info("Replay report:\n%s", report.round(6).T.to_string())
+    if args.output:
+        scores.to_csv(args.output, index=False)
@@ -1,24 +1,110 @@
 __all__ = ["train_model"]
 
 import argparse
+import copy
+import hashlib
+import inspect
 import logging
 import os
+import sys
 import pandas as pd
 import joblib
 
+from statefarm import Scorer
+from statefarm.app import drift
+from statefarm.app.drift import build_profile, save_profile
+from statefarm.data import data_preparation
 from statefarm.data.data_preparation import DataSplitter, DataPreprocessor
+from statefarm.data.snapshot import load_csv, snapshot_csv
+from statefarm.modeling import models, scorer
 from statefarm.modeling.models import LogisticRegressionAnalysis
+from statefarm.modeling.stage_cache import StageCache
 
 
-def train_model(data_path, model_save_path, preprocessor_save_path):
+def _code_version():
+    """
+    Hash of the modules the pipeline stages run, this one included, so editing them invalidates
+    the cache.
+    """
+    digest = hashlib.sha256()
+    for module in (data_preparation, models, scorer, drift, sys.modules[__name__]):
+        digest.update(inspect.getsource(module).encode())
+    return digest.hexdigest()[:16]
+
+
+def train_model(
+    data_path,
+    model_save_path,
+    preprocessor_save_path,
+    compact=False,
+    sparse=False,
+    cache_dir=None,
+    max_cache_entries=2,
+    test_size=4000,
+    val_size=0.1,
+    random_state=13,
+    top_k=25,
+    profile_save_path=None,
+    trace_memory=False,
+):
+    """
+    Trains the model as a pipeline of cached stages: split, preprocess, explore, final, evaluate
+    and profile.
+
+    Each stage's output is stored in ``cache_dir`` under a key hashing the data file, the stage's
+    parameters, the keys of its upstream stages and the pipeline's source code. Re-runs load
+    unchanged stages instead of recomputing them, and a report of hits and misses is logged.
+
+    Args:
+        data_path (str): Path to the training data CSV file.
+        model_save_path (str): Path to save the trained model.
+        preprocessor_save_path (str): Path to save the data preprocessor.
+        compact (bool): Preprocess into a single float32 matrix to reduce memory.
+        sparse (bool): Keep the dummies in a CSR block and fit the exploratory model on it.
+        cache_dir (str, optional): Stage cache directory; every stage runs when it is None.
+        max_cache_entries (int): Cached outputs kept per stage.
+        test_size (int or float): Test split size, see ``DataSplitter.split_data``.
+        val_size (float): Validation split proportion.
+        random_state (int): Seed of the splits.
+        top_k (int): Number of variables selected by the exploratory model.
+        profile_save_path (str, optional): Where to save the reference profile the API compares
+            live traffic with; ``reference_profile.json`` next to the model by default.
+        trace_memory (bool): Add each stage's peak memory to the report, see ``StageCache``.
+
+    Returns:
+        pandas.DataFrame: The stage report.
+    """
     logging.basicConfig(level=logging.INFO)
     logging.info("Starting the data processing and model training pipeline.")
 
-    df = pd.read_csv(data_path)
+    df = load_csv(data_path)
+    cache = StageCache(
+        cache_dir, max_cache_entries, salt=_code_version(), trace_memory=trace_memory
+    )
+    data_key = os.path.basename(snapshot_csv(data_path))
+
+    def split():
+        data_splitter = DataSplitter(df=df, y_vars=["y"])
+        data_splitter.split_data(
+            test_size=test_size,
+            val_size=val_size,
+            random_state=random_state,
+            create_test_set=True,
+        )
+        return (
+            data_splitter.X_train,
+            data_splitter.X_valid,
+            data_splitter.X_test,
+            data_splitter.y_train,
+            data_splitter.y_valid,
+            data_splitter.y_test,
+        )
 
-    data_splitter = DataSplitter(df=df, y_vars=["y"])
-    data_splitter.split_data(
-        test_size=4000, val_size=0.1, random_state=13, create_test_set=True
+    split_stage = cache.stage(
+        "split",
+        split,
+        {"test_size": test_size, "val_size": val_size, "random_state": random_state},
+        [data_key],
     )
 
     columns_to_convert = ["x12", "x63"]
@@ -28,34 +114,100 @@ def train_model(data_path, model_save_path, preprocessor_save_path):
         if col not in ["y", "x5", "x31", "x81", "x82"] + columns_to_convert
     ]
     columns_to_dummy = ["x5", "x31", "x81", "x82"]
-    preprocessor = DataPreprocessor(
-        columns_to_convert, columns_to_impute, columns_to_dummy, target_column="y"
+
+    def preprocess():
+        X_train, X_valid, X_test, y_train, y_valid, y_test = split_stage.value
+        preprocessor = DataPreprocessor(
+            columns_to_convert,
+            columns_to_impute,
+            columns_to_dummy,
+            target_column="y",
+            compact=compact,
+            sparse=sparse,
+        )
+        frames = [
+            X.join(y).reset_index(drop=True)
+            for X, y in (
+                (preprocessor.fit_transform(X_train), y_train),
+                (preprocessor.transform(X_valid), y_valid),
+                (preprocessor.transform(X_test), y_test),
+            )
+        ]
+        return (preprocessor, *frames)
+
+    preprocess_stage = cache.stage(
+        "preprocess",
+        preprocess,
+        {
+            "columns_to_convert": columns_to_convert,
+            "columns_to_impute": columns_to_impute,
+            "columns_to_dummy": columns_to_dummy,
+            "compact": compact,
+            "sparse": sparse,
+        },
+        [split_stage],
     )
 
-    X_train = preprocessor.fit_transform(data_splitter.X_train)
-    X_valid = preprocessor.transform(data_splitter.X_valid)
-    X_test = preprocessor.transform(data_splitter.X_test)
+    def explore():
+        lr_analysis = LogisticRegressionAnalysis()
+        lr_analysis.fit_exploratory_model(preprocess_stage.value[1], "y", top_k=top_k)
+        return lr_analysis
 
-    train_df = pd.concat([X_train, data_splitter.y_train], axis=1).reset_index(
-        drop=True
+    explore_stage = cache.stage(
+        "explore", explore, {"top_k": top_k}, [preprocess_stage]
     )
-    valid_df = pd.concat([X_valid, data_splitter.y_valid], axis=1).reset_index(
-        drop=True
+
+    def combined():
+        columns = explore_stage.value.variables + ["y"]
+        return pd.concat([frame[columns] for frame in preprocess_stage.value[1:]])
+
+    def final():
+        # A copy, so the explore stage's output stays the exploratory result.
+        lr_analysis = copy.deepcopy(explore_stage.value)
+        lr_analysis.fit_final_model(combined(), "y")
+        return lr_analysis
+
+    final_stage = cache.stage("final", final, {}, [preprocess_stage, explore_stage])
+    evaluate_stage = cache.stage(
+        "evaluate",
+        lambda: final_stage.value.evaluate_model(combined(), "y"),
+        {},
+        [preprocess_stage, final_stage],
+    )
+
+    def profile():
+        preprocessor = preprocess_stage.value[0]
+        raw = df.drop(columns=["y"])
+        phat, _ = Scorer(final_stage.value, preprocessor).score_batch(raw)
+        return build_profile(
+            preprocessor._convert_columns(raw.copy()),
+            columns_to_impute + columns_to_convert,
+            columns_to_dummy,
+            phat,
+        )
+
+    profile_stage = cache.stage(
+        "profile", profile, {}, [data_key, preprocess_stage, final_stage]
     )
-    test_df = pd.concat([X_test, data_splitter.y_test], axis=1).reset_index(drop=True)
 
-    lr_analysis = LogisticRegressionAnalysis()
-    lr_analysis.fit_exploratory_model(train_df, "y")
-    combined_df = pd.concat([train_df, valid_df, test_df])
-    lr_analysis.fit_final_model(combined_df, "y")
-    lr_analysis.evaluate_model(combined_df, "y")
+    lr_analysis = final_stage.value
+    preprocessor = preprocess_stage.value[0]
+    if not evaluate_stage.cached:
+        evaluate_stage.value
 
     os.makedirs(os.path.dirname(model_save_path), exist_ok=True)
     os.makedirs(os.path.dirname(preprocessor_save_path), exist_ok=True)
     joblib.dump(lr_analysis, model_save_path)
     joblib.dump(preprocessor, preprocessor_save_path)
+    save_profile(
+        profile_stage.value,
+        profile_save_path
+        or os.path.join(os.path.dirname(model_save_path), "reference_profile.json"),
+    )
 
+    report = cache.report()
     logging.info("Data processing and model training pipeline completed.")
+    return report
 
 
 if __name__ == "__main__":
@@ -78,6 +230,51 @@ if __name__ == "__main__":
         required=True,
         help="Path to save the data preprocessor",
     )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Preprocess into a single float32 matrix to reduce memory",
+    )
+    parser.add_argument(
+        "--sparse",
+        action="store_true",
+        help="Keep the dummy columns sparse (CSR) for the exploratory fit",
+    )
+    parser.add_argument(
+        "--cache_dir",
+        type=str,
+        default=None,
+        help="Directory caching the pipeline stages; unchanged stages are skipped on re-runs",
+    )
+    parser.add_argument(
+        "--max_cache_entries",
+        type=int,
+        default=2,
+        help="Cached outputs kept per stage",
+    )
+    parser.add_argument(
+        "--random_state", type=int, default=13, help="Seed of the data splits"
+    )
+    parser.add_argument(
+        "--top_k", type=int, default=25, help="Number of variables to select"
+    )
+    parser.add_argument(
+        "--profile_save_path",
+        type=str,
+        default=None,
+        help="Path to save the reference profile for drift monitoring",
+    )
 
     args = parser.parse_args()
-    train_model(args.data_path, args.model_save_path, args.preprocessor_save_path)
+    train_model(
+        args.data_path,
+        args.model_save_path,
+        args.preprocessor_save_path,
+        compact=args.compact,
+        sparse=args.sparse,
+        cache_dir=args.cache_dir,
+        max_cache_entries=args.max_cache_entries,
+        random_state=args.random_state,
+        top_k=args.top_k,
+        profile_save_path=args.profile_save_path,
+    )
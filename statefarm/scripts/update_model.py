@@ -0,0 +1,109 @@
+__all__ = ["update_model"]
+
+import argparse
+import logging
+import os
+import time
+
+import joblib
+import pandas as pd
+
+
+def update_model(
+    model_path,
+    preprocessor_path,
+    data_path,
+    model_save_path,
+    reference_data_path=None,
+    chunk_rows=50000,
+):
+    """
+    Updates a trained model with newly labelled rows instead of rerunning ``train_model``.
+
+    The preprocessor and the selected variables are kept; only the final model's coefficients are
+    updated, chunk by chunk, with ``LogisticRegressionAnalysis.update_final_model``.
+
+    Args:
+        model_path (str): Path to the trained model.
+        preprocessor_path (str): Path to the fitted preprocessor.
+        data_path (str): CSV file of new labelled rows.
+        model_save_path (str): Path to save the updated model.
+        reference_data_path (str, optional): CSV file of every row the model should reflect
+            (history plus the new rows); when given, the drift of the updated coefficients
+            versus a full refit on it is reported.
+        chunk_rows (int): Rows read and applied per update.
+
+    Returns:
+        pandas.DataFrame or None: The coefficient drift report, if a reference was given.
+    """
+    logging.basicConfig(level=logging.INFO)
+    lr_analysis = joblib.load(model_path)
+    preprocessor = joblib.load(preprocessor_path)
+
+    start, rows = time.perf_counter(), 0
+    for chunk in pd.read_csv(data_path, chunksize=chunk_rows):
+        transformed = preprocessor.transform(chunk.drop(columns=["y"]))
+        transformed["y"] = chunk["y"].to_numpy()
+        lr_analysis.update_final_model(transformed, "y")
+        rows += len(chunk)
+    logging.info(
+        "Updated the model with %s rows in %.2fs", rows, time.perf_counter() - start
+    )
+
+    drift = None
+    if reference_data_path:
+        reference = pd.read_csv(reference_data_path)
+        transformed = preprocessor.transform(reference.drop(columns=["y"]))
+        transformed["y"] = reference["y"].to_numpy()
+        drift = lr_analysis.coefficient_drift(transformed, "y")
+        logging.info("Coefficient drift:\n%s", drift.round(4).to_string())
+
+    os.makedirs(os.path.dirname(model_save_path), exist_ok=True)
+    joblib.dump(lr_analysis, model_save_path)
+    return drift
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Update a trained model with new labelled data."
+    )
+    parser.add_argument(
+        "--model_path", type=str, required=True, help="Path to the trained model"
+    )
+    parser.add_argument(
+        "--preprocessor_path",
+        type=str,
+        required=True,
+        help="Path to the fitted data preprocessor",
+    )
+    parser.add_argument(
+        "--data_path",
+        type=str,
+        required=True,
+        help="Path to the CSV file of new labelled rows",
+    )
+    parser.add_argument(
+        "--model_save_path",
+        type=str,
+        required=True,
+        help="Path to save the updated model",
+    )
+    parser.add_argument(
+        "--reference_data_path",
+        type=str,
+        default=None,
+        help="Optional CSV of all rows to report coefficient drift versus a full refit",
+    )
+    parser.add_argument(
+        "--chunk_rows", type=int, default=50000, help="Rows applied per update"
+    )
+
+    args = parser.parse_args()
+    update_model(
+        args.model_path,
+        args.preprocessor_path,
+        args.data_path,
+        args.model_save_path,
+        args.reference_data_path,
+        args.chunk_rows,
+    )
@@ -0,0 +1,107 @@
+__all__ = ["validate_model"]
+
+import argparse
+import logging
+
+from statefarm.modeling.validation import validate_pipeline
+
+
+def validate_model(
+    data_path,
+    folds=5,
+    bootstraps=100,
+    workers=None,
+    top_k=25,
+    confidence=0.95,
+    replicates_save_path=None,
+):
+    """
+    Estimates the pipeline's out-of-sample AUC and calibration with confidence intervals.
+
+    ``evaluate_model`` scores the rows the final model was fitted on. This refits the whole
+    pipeline per cross-validation fold and bootstrap replicate in a process pool, see
+    ``statefarm.modeling.validation.validate_pipeline``.
+
+    Args:
+        data_path (str): Path to the training data CSV file.
+        folds (int): Cross-validation folds; 0 skips cross-validation.
+        bootstraps (int): Bootstrap replicates.
+        workers (int, optional): Worker processes; defaults to the CPU count.
+        top_k (int): Number of variables selected by the exploratory model.
+        confidence (float): Coverage of the intervals.
+        replicates_save_path (str, optional): CSV file for the metrics of every fit.
+
+    Returns:
+        pandas.DataFrame: Estimate, standard deviation and interval per method and metric.
+    """
+    logging.basicConfig(level=logging.INFO)
+    summary, replicates = validate_pipeline(
+        data_path,
+        folds=folds,
+        bootstraps=bootstraps,
+        workers=workers,
+        top_k=top_k,
+        confidence=confidence,
+    )
+    if replicates_save_path:
+        replicates.to_csv(replicates_save_path, index=False)
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Cross-validate and bootstrap the training pipeline in parallel."
+    )
+    parser.add_argument(
+        "--data_path",
+        type=str,
+        required=True,
+        help="Path to the training data CSV file",
+    )
+    parser.add_argument(
+        "--folds",
+        type=int,
+        default=5,
+        help="Number of cross-validation folds (0 to skip)",
+    )
+    parser.add_argument(
+        "--bootstraps",
+        type=int,
+        default=100,
+        help="Number of bootstrap replicates",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes; defaults to the CPU count",
+    )
+    parser.add_argument(
+        "--top_k",
+        type=int,
+        default=25,
+        help="Number of variables selected by the exploratory model",
+    )
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=0.95,
+        help="Coverage of the confidence intervals",
+    )
+    parser.add_argument(
+        "--replicates_save_path",
+        type=str,
+        default=None,
+        help="Optional CSV file for the metrics of every fit",
+    )
+
+    args = parser.parse_args()
+    validate_model(
+        args.data_path,
+        args.folds,
+        args.bootstraps,
+        args.workers,
+        args.top_k,
+        args.confidence,
+        args.replicates_save_path,
+    )
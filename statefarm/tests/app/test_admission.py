@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+from statefarm.app.admission import AdmissionController, AdmissionRejected
+
+
+def test_admission_caps_inflight_rows():
+    async def scenario():
+        controller = AdmissionController(
+            max_inflight_rows=100, max_queue=1, queue_timeout=1.0, retry_after=2
+        )
+        first = await controller.acquire(80)
+        waiter = asyncio.ensure_future(controller.acquire(50))
+        await asyncio.sleep(0)
+        assert controller.queue_depth == 1
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire(10)
+        assert rejected.value.reason == "queue_full"
+        assert rejected.value.retry_after == 2
+
+        controller.release(first)
+        second = await waiter
+        assert controller.inflight_rows == 50
+        controller.release(second)
+        assert controller.inflight_rows == 0
+
+    asyncio.run(scenario())
+
+
+def test_admission_times_out_and_clamps_oversized_batches():
+    async def scenario():
+        controller = AdmissionController(
+            max_inflight_rows=100, max_queue=4, queue_timeout=0.01, retry_after=1
+        )
+        async with controller.admit(5000):
+            assert controller.inflight_rows == 100
+            with pytest.raises(AdmissionRejected) as rejected:
+                await controller.acquire(1)
+            assert rejected.value.reason == "timeout"
+            assert controller.queue_depth == 0
+        assert controller.inflight_rows == 0
+
+    asyncio.run(scenario())
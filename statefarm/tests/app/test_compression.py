@@ -0,0 +1,100 @@
+import gzip
+import zlib
+
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from statefarm.app import compression
+from statefarm.app.compression import CompressionMiddleware, negotiate_encoding
+
+
+def make_client(monkeypatch, **kwargs):
+    # Small chunks exercise the incremental paths with small bodies.
+    monkeypatch.setattr(compression, "INFLATE_CHUNK_BYTES", 1000)
+    monkeypatch.setattr(compression, "OFFLOAD_BYTES", 4000)
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, paths=("/bulk",), **kwargs)
+    received = []
+
+    @app.post("/bulk/echo")
+    async def echo(request: Request):
+        sizes = [len(chunk) async for chunk in request.stream()]
+        received.extend(sizes)
+        return PlainTextResponse(b"x" * sum(sizes))
+
+    @app.get("/bulk/stream")
+    async def stream():
+        return StreamingResponse(iter([b"a,b\n"] * 3000), media_type="text/csv")
+
+    @app.post("/other")
+    async def other(request: Request):
+        return PlainTextResponse(await request.body())
+
+    return TestClient(app), received
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0.5, deflate") == "deflate"
+    assert negotiate_encoding("gzip;q=0, *") == "deflate"
+    assert negotiate_encoding("br") is None
+    assert negotiate_encoding("") is None
+
+
+def test_request_bodies_are_inflated_incrementally(monkeypatch):
+    client, received = make_client(monkeypatch, min_bytes=100)
+    body = b"0123456789" * 2000
+    response = client.post(
+        "/bulk/echo",
+        content=gzip.compress(body) + gzip.compress(body),
+        headers={"Content-Encoding": "gzip", "Accept-Encoding": "identity"},
+    )
+    assert response.status_code == 200
+    assert len(response.content) == 2 * len(body)
+    assert max(received) <= 1000
+
+    response = client.post(
+        "/bulk/echo",
+        content=zlib.compress(body),
+        headers={"Content-Encoding": "deflate", "Accept-Encoding": "deflate"},
+    )
+    assert response.headers["content-encoding"] == "deflate"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert len(response.content) == len(body)
+
+
+def test_bad_bodies_are_rejected(monkeypatch):
+    client, _ = make_client(monkeypatch, max_bytes=5000)
+    body = gzip.compress(b"0" * 20000)
+    headers = {"Content-Encoding": "gzip"}
+
+    assert client.post("/bulk/echo", content=body, headers=headers).status_code == 413
+    body = gzip.compress(b"0" * 3000)
+    assert client.post("/bulk/echo", content=body, headers=headers).status_code == 200
+    truncated = client.post("/bulk/echo", content=body[:-10], headers=headers)
+    assert truncated.status_code == 400
+    garbage = client.post("/bulk/echo", content=b"garbage", headers=headers)
+    assert garbage.status_code == 400
+    unsupported = {"Content-Encoding": "br"}
+    assert (
+        client.post("/bulk/echo", content=b"{}", headers=unsupported).status_code == 415
+    )
+
+
+def test_responses_are_compressed_above_the_threshold(monkeypatch):
+    client, _ = make_client(monkeypatch, min_bytes=1000)
+    gzip_only = {"Accept-Encoding": "gzip"}
+
+    small = client.post("/bulk/echo", content=b"0" * 500, headers=gzip_only)
+    assert "content-encoding" not in small.headers
+    large = client.post("/bulk/echo", content=b"0" * 5000, headers=gzip_only)
+    assert large.headers["content-encoding"] == "gzip"
+    assert int(large.headers["content-length"]) < 100
+    assert large.content == b"x" * 5000
+
+    streamed = client.get("/bulk/stream", headers=gzip_only)
+    assert streamed.headers["content-encoding"] == "gzip"
+    assert streamed.text == "a,b\n" * 3000
+
+    other = client.post("/other", content=b"0" * 5000, headers=gzip_only)
+    assert "content-encoding" not in other.headers
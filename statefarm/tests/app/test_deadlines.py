@@ -0,0 +1,43 @@
+import asyncio
+import time
+
+import pytest
+from statefarm.app.deadlines import (
+    DeadlineExceeded,
+    check_deadline,
+    earliest_deadline,
+)
+from statefarm.app.lanes import Lane
+
+
+def test_earliest_deadline():
+    assert earliest_deadline(None, None) is None
+    assert earliest_deadline(None, 20.0) == 20.0
+    assert earliest_deadline(30.0, 20.0) == 20.0
+
+
+def test_check_deadline():
+    check_deadline(None, "chunk", 10)
+    check_deadline(time.time() + 60, "chunk", 10)
+    with pytest.raises(DeadlineExceeded) as expired:
+        check_deadline(time.time() - 1, "chunk", 10)
+    assert expired.value.stage == "chunk"
+    assert expired.value.rows_skipped == 10
+
+
+def test_lane_drops_expired_requests_before_queueing():
+    lane = Lane("deadline_test", 1, 10, 4, 1.0, 1)
+
+    async def scenario():
+        with pytest.raises(DeadlineExceeded) as expired:
+            await lane.run(5, sum, [1], deadline=time.time() - 1)
+        assert expired.value.stage == "queue"
+        assert lane.admission.inflight_rows == 0
+
+        async with lane.admit(10):
+            with pytest.raises(DeadlineExceeded):
+                await lane.run(5, sum, [1], deadline=time.time() + 0.01)
+        assert lane.admission.queue_depth == 0
+
+    asyncio.run(scenario())
+    lane.shutdown()
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+from prometheus_client import REGISTRY
+from statefarm.app.drift import (
+    DriftMonitor,
+    build_profile,
+    expose_drift,
+    load_profile,
+    population_stability_index,
+    save_profile,
+)
+
+
+@pytest.fixture
+def reference():
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame(
+        {
+            "a": rng.normal(size=5000),
+            "b": rng.exponential(size=5000),
+            "day": rng.choice(["mon", "tue", "wed"], 5000).astype(object),
+        }
+    )
+    frame.loc[::50, "a"] = np.nan
+    frame.loc[::40, "day"] = None
+    phat = rng.beta(2, 5, 5000)
+    return frame, phat
+
+
+def test_build_profile_round_trips(reference, tmp_path):
+    frame, phat = reference
+    profile = build_profile(frame, ["a", "b"], ["day"], phat)
+
+    assert len(profile["numeric"]["a"]["edges"]) == 9
+    assert sum(profile["numeric"]["a"]["counts"]) == 5000
+    assert profile["numeric"]["a"]["counts"][-1] == 100
+    assert profile["categorical"]["day"]["categories"] == ["mon", "tue", "wed"]
+    assert profile["categorical"]["day"]["counts"][-2:] == [0, 125]
+    assert sum(profile["score"]["counts"]) == 5000
+
+    save_profile(profile, str(tmp_path / "models" / "profile.json"))
+    assert load_profile(str(tmp_path / "models" / "profile.json")) == profile
+
+
+def test_monitor_is_quiet_on_the_reference_and_flags_shifts(reference):
+    frame, phat = reference
+    monitor = DriftMonitor(build_profile(frame, ["a", "b"], ["day"], phat))
+    monitor.observe(frame, phat)
+
+    report = monitor.report()
+    assert list(report.index) == ["a", "b", "day", "phat"]
+    assert (report["psi"] < 1e-9).all()
+    assert report.loc[["a", "b", "phat"], "ks"].max() < 1e-9
+    assert np.isnan(report.loc["day", "ks"])
+    assert monitor.score_quantile(0.5) == pytest.approx(np.median(phat), abs=0.02)
+
+    shifted = frame.assign(a=frame["a"] + 2, day="thu")
+    monitor = DriftMonitor(monitor.profile)
+    monitor.observe(shifted, np.clip(phat + 0.3, 0, 1))
+    assert monitor.psi("a") > 0.25
+    assert monitor.ks("a") > 0.5
+    assert monitor.psi("b") < 1e-9
+    live, _ = monitor.counts("day")
+    np.testing.assert_array_equal(live, [0, 0, 0, 5000, 0])
+    assert monitor.psi("phat") > 0.25
+
+
+def test_monitor_weights_rows_and_decays(reference):
+    frame, phat = reference
+    monitor = DriftMonitor(build_profile(frame, ["a", "b"], ["day"], phat), 1000)
+    rows = frame.iloc[:3]
+
+    monitor.observe(rows, phat[:3], np.array([2, 1, 1]))
+    assert monitor.rows == 4
+    live, _ = monitor.counts("b")
+    assert live.sum() == 4
+
+    monitor.observe(frame.iloc[:996], phat[:996])
+    assert monitor.rows == 500
+    live, _ = monitor.counts("phat")
+    assert live.sum() == 500
+
+
+def test_expose_drift_publishes_gauges(reference):
+    frame, phat = reference
+    monitor = DriftMonitor(build_profile(frame, ["a", "b"], ["day"], phat))
+    expose_drift(monitor)
+    assert np.isnan(REGISTRY.get_sample_value("drift_psi", {"feature": "a"}))
+
+    monitor.observe(frame.assign(a=frame["a"] + 2), phat)
+    assert REGISTRY.get_sample_value("drift_rows") == 5000
+    assert REGISTRY.get_sample_value("drift_psi", {"feature": "a"}) == pytest.approx(
+        monitor.psi("a")
+    )
+    assert REGISTRY.get_sample_value(
+        "drift_score_quantile", {"quantile": "0.5"}
+    ) == pytest.approx(monitor.score_quantile(0.5))
+    assert population_stability_index([1, 1], [1, 1]) == 0
@@ -0,0 +1,54 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from statefarm.app.jobs import JobManager, JobQueueFull
+
+
+def wait_for(manager, job_id):
+    for _ in range(200):
+        if manager.get(job_id).status not in ("queued", "running"):
+            break
+        time.sleep(0.01)
+    return manager.get(job_id)
+
+
+def test_job_scores_csv_in_pages(tmp_path):
+    inputs = tmp_path / "inputs"
+    inputs.mkdir()
+    pd.DataFrame({"x0": np.arange(25, dtype=float)}).to_csv(
+        inputs / "rows.csv", index=False
+    )
+    manager = JobManager(
+        str(tmp_path / "jobs"), lambda df: df["x0"] / 100, str(inputs), chunk_rows=10
+    )
+    manager.recover()
+
+    job = wait_for(manager, manager.submit_csv("rows.csv").job_id)
+    assert job.status == "completed"
+    assert job.rows_done == 25
+    assert job.pages == 3
+    np.testing.assert_allclose(
+        manager.read_page(job.job_id, 2), [0.2, 0.21, 0.22, 0.23, 0.24]
+    )
+    lines = "".join(manager.iter_csv(job.job_id, 0.2)).splitlines()
+    assert lines[0] == "phat,business_outcome"
+    assert lines[21] == "0.2,1"
+
+    restarted = JobManager(str(tmp_path / "jobs"), None, str(inputs))
+    restarted.recover()
+    assert restarted.get(job.job_id).status == "completed"
+    manager.shutdown()
+
+
+def test_job_rejects_escaping_paths_and_full_queue(tmp_path):
+    manager = JobManager(
+        str(tmp_path / "jobs"), lambda df: df["x0"], str(tmp_path), max_pending=0
+    )
+    manager.recover()
+    with pytest.raises(ValueError):
+        manager.resolve_input("../outside.csv")
+    with pytest.raises(JobQueueFull):
+        manager.submit_frame(pd.DataFrame({"x0": [1.0]}))
+    manager.shutdown()
@@ -0,0 +1,36 @@
+import asyncio
+import threading
+
+import pytest
+from statefarm.app.admission import AdmissionRejected
+from statefarm.app.lanes import Lane
+
+
+def test_lane_runs_on_its_own_pool(monkeypatch):
+    monkeypatch.setenv("TESTLANE_WORKERS", "3")
+    lane = Lane.from_env("testlane", max_workers=1, max_inflight_rows=10, max_queue=2)
+    assert lane.max_workers == 3
+    assert lane.admission.max_inflight_rows == 10
+
+    async def scenario():
+        thread_name = await lane.run(1, lambda: threading.current_thread().name)
+        assert thread_name.startswith("testlane-lane")
+        assert lane.admission.inflight_rows == 0
+
+    asyncio.run(scenario())
+    lane.shutdown()
+
+
+def test_lanes_have_independent_budgets():
+    bulk = Lane("bulk_test", 1, 100, 0, 0.01, 1)
+    interactive = Lane("interactive_test", 1, 10, 0, 0.01, 1)
+
+    async def scenario():
+        async with bulk.admission.admit(100):
+            with pytest.raises(AdmissionRejected):
+                await bulk.run(1, sum, [1, 2])
+            assert await interactive.run(1, sum, [1, 2]) == 3
+
+    asyncio.run(scenario())
+    bulk.shutdown()
+    interactive.shutdown()
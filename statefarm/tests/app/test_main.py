@@ -1,4 +1,7 @@
 import pytest
+from fastapi.testclient import TestClient
+from statefarm.app import main
+from statefarm.app.jobs import JobManager
 
 
 @pytest.mark.asyncio
@@ -33,3 +36,33 @@ async def test_business_logic(client, sample_data):
         key for key in response_data.keys() if key not in ["phat", "business_outcome"]
     ]
     assert input_variables == sorted(input_variables)
+
+
+def test_batch_predict_columns(scorer, sample_data, monkeypatch, tmp_path):
+    # The test scorer stands in for the trained model the startup loads.
+    monkeypatch.setattr(main, "load_scorer", lambda: scorer)
+    monkeypatch.setattr(
+        main, "jobs", JobManager(str(tmp_path / "jobs"), main.jobs.score, str(tmp_path))
+    )
+    monkeypatch.setattr(main, "prediction_log", None)
+    with TestClient(main.app) as client:
+        response = client.post("/batch_predict?orient=columns", json=sample_data)
+    assert response.status_code == 200
+    response_data = response.json()
+    assert len(response_data["phat"]) == len(sample_data["data"])
+    assert len(response_data["business_outcome"]) == len(sample_data["data"])
+    assert response_data["model_version"] == scorer.model_version
+
+
+def test_app_logger_does_not_repeat_records_on_the_root_logger():
+    records = []
+    handler = main.logging.Handler()
+    handler.emit = records.append
+    root = main.logging.getLogger()
+    root.addHandler(handler)
+    try:
+        main.logger.info("warmup report")
+    finally:
+        root.removeHandler(handler)
+    assert main.logger.handlers
+    assert records == []
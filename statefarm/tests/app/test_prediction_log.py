@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from statefarm.app.prediction_log import PredictionLog, read_predictions, segment_paths
+
+
+def test_prediction_log_round_trip(tmp_path):
+    log = PredictionLog(str(tmp_path), max_segment_rows=3, max_segment_seconds=60)
+    log.append(
+        {"x0": np.array([1.0, np.nan]), "x5": np.array(["monday", None], dtype=object)},
+        np.array([0.8, 0.1]),
+        np.array([1, 0]),
+        "v1",
+    )
+    log.append_row({"x0": 2.0, "x5": "friday"}, 0.5, 0, "v1")
+    log.append_row({"x0": 3.0, "x5": "sunday"}, 0.9, 1, "v2")
+    log.close()
+
+    assert len(segment_paths(str(tmp_path))) == 2
+    df = read_predictions(str(tmp_path))
+    assert df["x5"].tolist() == ["monday", None, "friday", "sunday"]
+    np.testing.assert_array_equal(df["x0"], [1.0, np.nan, 2.0, 3.0])
+    assert df["phat"].tolist() == [0.8, 0.1, 0.5, 0.9]
+    assert df["model_version"].tolist() == ["v1", "v1", "v1", "v2"]
+
+    only_x0 = read_predictions(str(tmp_path), columns=["x0"])
+    assert "x5" not in only_x0.columns
+    assert read_predictions(str(tmp_path), start=df["timestamp"].max() + 1).empty
+
+
+def test_prediction_log_rolls_over_on_age(tmp_path):
+    log = PredictionLog(str(tmp_path), max_segment_seconds=0.05)
+    log.append_row({"x0": 1.0}, 0.2, 0, "v1")
+    for _ in range(100):
+        if segment_paths(str(tmp_path)):
+            break
+        log._thread.join(0.01)
+    assert len(segment_paths(str(tmp_path))) == 1
+    log.close()
+    assert read_predictions(str(tmp_path))["phat"].tolist() == pytest.approx([0.2])
+
+
+def test_prediction_log_stores_missing_numeric_inputs_as_numbers(tmp_path):
+    log = PredictionLog(str(tmp_path), max_segment_rows=1, numeric_columns=["x0"])
+    log.append_row({"x0": None, "x5": "monday"}, 0.2, 0, "v1")
+    log.append_row({"x0": 2.0, "x5": "friday"}, 0.5, 0, "v1")
+    log.close()
+
+    assert len(segment_paths(str(tmp_path))) == 2
+    df = read_predictions(str(tmp_path))
+    assert df["x0"].dtype == np.float64
+    np.testing.assert_array_equal(df["x0"], [np.nan, 2.0])
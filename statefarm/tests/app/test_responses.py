@@ -0,0 +1,37 @@
+import json
+
+import numpy as np
+from statefarm.app.responses import ColumnarJSONResponse, explanation_records
+
+
+def test_columnar_response_encodes_arrays():
+    response = ColumnarJSONResponse(
+        {
+            "phat": np.array([0.25, 0.8]),
+            "business_outcome": np.array([0, 1]),
+            "model_version": "abc123",
+        }
+    )
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == {
+        "phat": [0.25, 0.8],
+        "business_outcome": [0, 1],
+        "model_version": "abc123",
+    }
+
+
+def test_explanations_encode_per_row_and_per_column():
+    names = np.array([["x3", "x0"], ["x0", "x12"]], dtype=object)
+    contributions = np.array([[1.5, -0.5], [-2.0, 0.25]])
+
+    assert explanation_records(names, contributions) == [
+        {"x3": 1.5, "x0": -0.5},
+        {"x0": -2.0, "x12": 0.25},
+    ]
+    response = ColumnarJSONResponse(
+        {"explanation_variable": names, "explanation_contribution": contributions}
+    )
+    assert json.loads(response.body) == {
+        "explanation_variable": [["x3", "x0"], ["x0", "x12"]],
+        "explanation_contribution": [[1.5, -0.5], [-2.0, 0.25]],
+    }
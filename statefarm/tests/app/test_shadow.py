@@ -0,0 +1,113 @@
+import copy
+import threading
+
+import numpy as np
+import pytest
+
+from statefarm.app.shadow import ShadowPool, parse_shadow_models
+
+
+@pytest.fixture
+def rows(sample_dataframe):
+    raw = sample_dataframe.drop(columns=["y"]).head(300)
+    return {column: raw[column].to_numpy() for column in raw}
+
+
+@pytest.fixture
+def shadows(scorer):
+    scaled = copy.copy(scorer)
+    scaled.params = scorer.params * 1.5
+    return {"same": copy.copy(scorer), "scaled": scaled}
+
+
+def test_parse_shadow_models():
+    assert parse_shadow_models("") == []
+    models = parse_shadow_models(" a=m.pkl:p.pkl, b=/x/m.pkl:/x/p.pkl ", "/srv")
+    assert models == [
+        ("a", "/srv/m.pkl", "/srv/p.pkl"),
+        ("b", "/x/m.pkl", "/x/p.pkl"),
+    ]
+    with pytest.raises(ValueError):
+        parse_shadow_models("a=m.pkl")
+    with pytest.raises(ValueError):
+        parse_shadow_models("a=m.pkl:p.pkl,a=n.pkl:q.pkl")
+
+
+def test_shadows_share_preprocessing_and_count_disagreements(
+    scorer, shadows, rows, monkeypatch
+):
+    primary, _ = scorer.score_batch(dict(rows))
+    pool = ShadowPool(shadows, threshold=scorer.threshold)
+    assert pool.groups == [["same", "scaled"]]
+
+    transform = scorer.preprocessor.transform
+    calls = []
+    monkeypatch.setattr(
+        scorer.preprocessor,
+        "transform",
+        lambda df: calls.append(len(df)) or transform(df),
+    )
+    scores = pool.score(rows, primary)
+    assert calls == [len(primary)]
+    pool.shutdown()
+
+    np.testing.assert_allclose(scores["same"], primary)
+    same = pool.comparisons["same"].report()
+    assert same["rows"] == len(primary) and same["disagreement_rate"] == 0
+    assert abs(same["delta_mean"]) < 1e-12 and same["abs_delta_p99"] < 1e-12
+
+    scaled = pool.comparisons["scaled"]
+    before, after = primary >= scorer.threshold, scores["scaled"] >= scorer.threshold
+    assert scaled.disagreements == {
+        "shadow_positive": int(np.sum(after & ~before)),
+        "shadow_negative": int(np.sum(before & ~after)),
+    }
+    assert scaled.disagreement_rate() > 0
+    abs_delta = np.abs(scores["scaled"] - primary)
+    assert scaled.abs_delta_quantile(0.99) >= scaled.abs_delta_quantile(0.5) > 0
+    assert scaled.report()["abs_delta_mean"] == pytest.approx(abs_delta.mean())
+
+
+def test_shadow_work_is_dropped_under_load(scorer, shadows, rows, monkeypatch):
+    primary, _ = scorer.score_batch(dict(rows))
+    busy = [True]
+    pool = ShadowPool(shadows, max_pending_rows=len(primary), busy=lambda: busy[0])
+    assert not pool.submit(rows, primary)
+
+    busy[0] = False
+    release = threading.Event()
+    # Holds the only worker, so submitted rows stay pending.
+    pool.executor.submit(release.wait)
+    assert pool.submit(rows, primary)
+    assert pool.pending_rows == len(primary)
+    row = {column: values[0] for column, values in rows.items()}
+    assert not pool.submit_row(row, primary[0])
+
+    release.set()
+    pool.executor.shutdown(wait=True)
+    assert pool.pending_rows == 0
+    assert pool.comparisons["same"].rows == len(primary)
+
+    pool = ShadowPool(shadows)
+    shutdown = pool.executor.shutdown
+    # Python 3.8's signature, which has no ``cancel_futures``.
+    monkeypatch.setattr(pool.executor, "shutdown", lambda wait=True: shutdown(wait))
+    release = threading.Event()
+    pool.executor.submit(release.wait)
+    assert pool.submit(rows, primary)
+    assert pool.submit(rows, primary)
+    # Queued work cancelled by the shutdown no longer counts as pending.
+    pool.shutdown()
+    release.set()
+    shutdown(wait=True)
+    assert pool.pending_rows == 0
+    assert pool.comparisons["same"].rows == 0
+
+    pool = ShadowPool(shadows)
+    assert pool.submit_row(row, primary[0])
+    pool.executor.shutdown(wait=True)
+    assert pool.comparisons["same"].rows == 1
+    assert abs(pool.comparisons["same"].delta_mean()) < 1e-12
+    pool.shutdown()
+    assert not pool.submit_row(row, primary[0])
+    assert pool.pending_rows == 0
@@ -0,0 +1,135 @@
+import asyncio
+import socket
+
+import numpy as np
+import pandas as pd
+import pytest
+from statefarm.app.admission import AdmissionRejected
+from statefarm.app.socket_transport import (
+    FIELDS,
+    STRING_FIELDS,
+    ScoringSocketClient,
+    ScoringSocketServer,
+    SocketScoringError,
+    decode_rows,
+    encode_rows,
+)
+
+
+def test_rows_round_trip():
+    frame = pd.DataFrame(
+        {
+            "x0": [0.5, np.nan, -2.0],
+            "x5": ["monday", None, "sunday"],
+            "x12": ["$1,234.50", "($3.00)", None],
+            "x31": ["germany", "日本", ""],
+        }
+    )
+    decoded = decode_rows(encode_rows(frame))
+
+    assert list(decoded.columns) == FIELDS
+    assert len(decoded) == 3
+    np.testing.assert_array_equal(decoded["x0"], [0.5, np.nan, -2.0])
+    assert decoded["x1"].isna().all()
+    assert decoded["x5"].tolist() == ["monday", None, "sunday"]
+    assert decoded["x12"].tolist() == ["$1,234.50", "($3.00)", None]
+    assert decoded["x31"].tolist() == ["germany", "日本", ""]
+    assert decoded[STRING_FIELDS[-1]].isna().all()
+    decoded.loc[0, "x0"] = 1.0
+
+
+def test_truncated_payload_is_rejected():
+    payload = encode_rows(pd.DataFrame({"x0": [1.0, 2.0]}))
+    with pytest.raises(ValueError):
+        decode_rows(payload[:-1])
+    with pytest.raises(ValueError):
+        decode_rows(payload + b"\0")
+    assert len(decode_rows(encode_rows(pd.DataFrame(columns=["x0"])))) == 0
+
+
+def test_server_scores_frames_and_reports_errors(tmp_path):
+    path = str(tmp_path / "scoring.sock")
+
+    async def score(frame):
+        if frame["x0"].isna().any():
+            raise AdmissionRejected("queue_full", 2)
+        phat = frame["x0"].to_numpy() / 10
+        return phat, (phat >= 0.75).astype(int)
+
+    def calls():
+        with ScoringSocketClient(path) as client:
+            phat, outcome = client.score(pd.DataFrame({"x0": [1.0, 8.0, 9.0]}))
+            np.testing.assert_allclose(phat, [0.1, 0.8, 0.9])
+            assert outcome.tolist() == [0, 1, 1]
+            phat, outcome = client.score({"x0": 2.0, "x5": "monday"})
+            np.testing.assert_allclose(phat, [0.2])
+            with pytest.raises(SocketScoringError) as rejected:
+                client.score({"x0": None})
+            assert "retry after 2s" in rejected.value.message
+            phat, _ = client.score({"x0": 3.0})
+            np.testing.assert_allclose(phat, [0.3])
+
+    async def scenario():
+        server = ScoringSocketServer(path, score)
+        await server.start()
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, calls)
+        finally:
+            await server.close()
+
+    asyncio.run(scenario())
+    assert not (tmp_path / "scoring.sock").exists()
+
+
+def test_server_rejects_oversized_frames(tmp_path):
+    path = str(tmp_path / "scoring.sock")
+
+    async def score(frame):
+        return np.zeros(len(frame)), np.zeros(len(frame))
+
+    def call():
+        with ScoringSocketClient(path) as client:
+            with pytest.raises(SocketScoringError) as rejected:
+                client.score(pd.DataFrame({"x0": np.arange(10.0)}))
+            assert "exceeds" in rejected.value.message
+
+    async def scenario():
+        server = ScoringSocketServer(path, score, max_frame_bytes=1000)
+        await server.start()
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, call)
+        finally:
+            await server.close()
+
+    asyncio.run(scenario())
+
+
+def test_server_keeps_live_sockets_and_replaces_stale_ones(tmp_path):
+    path = str(tmp_path / "scoring.sock")
+
+    async def score(frame):
+        phat = frame["x0"].to_numpy() / 10
+        return phat, (phat >= 0.75).astype(int)
+
+    def call():
+        with ScoringSocketClient(path) as client:
+            phat, _ = client.score({"x0": 2.0})
+            np.testing.assert_allclose(phat, [0.2])
+
+    async def scenario():
+        first, second = ScoringSocketServer(path, score), ScoringSocketServer(
+            path, score
+        )
+        assert await first.start()
+        # Another worker must neither take over nor, on close, remove the live socket.
+        assert not await second.start()
+        await second.close()
+        await asyncio.get_running_loop().run_in_executor(None, call)
+        await first.close()
+
+    # A socket file nobody listens on, as left by a killed process.
+    stale = socket.socket(socket.AF_UNIX)
+    stale.bind(path)
+    stale.close()
+    asyncio.run(scenario())
+    assert not (tmp_path / "scoring.sock").exists()
@@ -0,0 +1,36 @@
+import numpy as np
+from statefarm.app.socket_transport import FIELDS
+from statefarm.app.validation import validate_rows
+
+
+def test_validate_rows_masks_bad_rows(sample_dataframe):
+    df = sample_dataframe.drop(columns=["y"]).head(20)
+    records = [
+        {key: None if value != value else value for key, value in row.items()}
+        for row in df.to_dict(orient="records")
+    ]
+    records[2]["x5"] = "funday"
+    records[5]["x12"] = "$12x"
+    records[5]["x0"] = "abc"
+    del records[7]["x99"]
+    records[9]["x31"] = 5
+    records[11]["x1"] = "2.5"
+
+    frame, valid, errors = validate_rows(records, ["x12", "x63"])
+
+    assert list(frame.columns) == FIELDS
+    assert list(errors) == [2, 5, 7, 9]
+    assert [error["field"] for error in errors[5]] == ["x0", "x12"]
+    assert errors[7] == [{"field": "x99", "message": "Field required"}]
+    np.testing.assert_array_equal(np.flatnonzero(~valid), [2, 5, 7, 9])
+    assert frame["x1"].dtype == np.float64
+    assert frame.loc[11, "x1"] == 2.5
+
+
+def test_validate_rows_accepts_clean_and_empty_batches():
+    records = [dict.fromkeys(FIELDS)]
+    frame, valid, errors = validate_rows(records, ["x12", "x63"])
+    assert valid.tolist() == [True] and errors == {}
+
+    frame, valid, errors = validate_rows([], ["x12", "x63"])
+    assert len(frame) == 0 and len(valid) == 0 and errors == {}
@@ -0,0 +1,43 @@
+import asyncio
+
+import pandas as pd
+from statefarm.app.models import BatchPredictionRequest
+from statefarm.app.warmup import run_warmup, synthetic_rows, warmup_plan
+
+
+def test_synthetic_rows_are_valid_and_distinct(scorer):
+    rows = synthetic_rows(scorer.preprocessor, 200)
+
+    request = BatchPredictionRequest(data=rows)
+    frame = pd.DataFrame([item.dict() for item in request.data])
+    assert len(frame.drop_duplicates()) == 200
+    assert frame["x12"].dropna().str.startswith(("$", "($")).all()
+    assert frame["x63"].dropna().str.endswith("%").all()
+    assert frame["x12"].isna().any()
+    assert set(frame["x5"].dropna()) <= set(scorer.preprocessor.dummy_lookup["x5"][0])
+    assert frame["x0"].isna().any()
+    phat, _ = scorer.score_batch(frame)
+    assert phat.shape == (200,)
+
+
+def test_warmup_runs_every_path_and_reports_latency(scorer):
+    plan = warmup_plan(scorer, [1, 20])
+    assert [(path, rows) for path, rows, _ in plan] == [
+        ("/predict", 1),
+        ("/batch_predict_simple", 1),
+        ("/batch_predict", 1),
+        ("socket", 1),
+        ("/batch_predict", 20),
+        ("socket", 20),
+    ]
+    submitted = []
+
+    async def submit(path, rows, call):
+        submitted.append(path)
+        return call()
+
+    report = asyncio.run(run_warmup(plan, submit, repeats=2))
+
+    assert len(submitted) == 3 * len(plan)
+    assert list(report.columns) == ["cold_ms", "warm_ms"]
+    assert (report > 0).all().all()
@@ -2,14 +2,16 @@ import httpx
 import pytest
 
 import numpy as np
-import pandas as pd
 from statefarm.data.data_preparation import DataSplitter, DataPreprocessor
+from statefarm.data.snapshot import load_csv
+from statefarm.modeling.models import LogisticRegressionAnalysis
+from statefarm import Scorer
 from statefarm import app
 
 
 @pytest.fixture(scope="module")
 def sample_dataframe():
-    return pd.read_csv("statefarm/files/data/exercise_26_train.csv").head(1000)
+    return load_csv("statefarm/files/data/exercise_26_train.csv").head(1000)
 
 
 @pytest.fixture(scope="function")
@@ -121,6 +123,16 @@ def data_preprocessor():
     return DataPreprocessor(columns_to_convert, columns_to_impute, columns_to_dummy)
 
 
+@pytest.fixture(scope="module")
+def scorer(sample_dataframe, data_preprocessor):
+    train = data_preprocessor.fit_transform(sample_dataframe.drop(columns=["y"]))
+    train["y"] = sample_dataframe["y"].to_numpy()
+    model = LogisticRegressionAnalysis()
+    model.variables = ["x1", "x12", "x63", "x5_monday", "x31_germany"]
+    model.fit_final_model(train, "y")
+    return Scorer(model, data_preprocessor, chunk_rows=300, model_version="test")
+
+
 @pytest.fixture
 async def client():
     async with httpx.AsyncClient(app=app, base_url="http://test") as test_client:
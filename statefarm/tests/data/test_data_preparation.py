@@ -1,3 +1,16 @@
+import numpy as np
+import pandas as pd
+
+import pytest
+from statefarm.data.data_preparation import (
+    COMPACT_PHAT_TOLERANCE,
+    DataPreprocessor,
+    SparseDesign,
+    parse_formatted_numbers,
+)
+from statefarm.modeling.models import LogisticRegressionAnalysis
+
+
 def test_data_splitting(data_splitter):
     data_splitter.split_data(
         test_size=0.2, val_size=0.1, random_state=42, create_test_set=True
@@ -31,3 +44,171 @@ def test_transform(data_preprocessor, data_splitter):
     assert (
         transformed_valid["x63"].dtype != object
     )  # Assuming x63 was a column to convert
+
+
+def test_compact_transform(data_preprocessor, data_splitter):
+    data_splitter.split_data(create_test_set=True)
+    compact = DataPreprocessor(
+        data_preprocessor.columns_to_convert,
+        data_preprocessor.columns_to_impute,
+        data_preprocessor.columns_to_dummy,
+        compact=True,
+    )
+    default = DataPreprocessor(
+        data_preprocessor.columns_to_convert,
+        data_preprocessor.columns_to_impute,
+        data_preprocessor.columns_to_dummy,
+    )
+    compact_train = compact.fit_transform(data_splitter.X_train.copy())
+    default_train = default.fit_transform(data_splitter.X_train.copy())
+    compact_valid = compact.transform(data_splitter.X_valid.copy())
+    default_valid = default.transform(data_splitter.X_valid.copy())
+
+    assert list(compact_train.columns) == list(default_train.columns)
+    assert list(compact_valid.columns) == list(default_valid.columns)
+    assert set(compact_valid.dtypes) == {np.dtype(np.float32)}
+
+    model = LogisticRegressionAnalysis()
+    model.variables = ["x1", "x12", "x63", "x5_monday", "x31_germany"]
+    model.fit_final_model(
+        default_train.assign(y=data_splitter.y_train.to_numpy()), "y", disp=False
+    )
+    default_phat = model.final_result.predict(default_valid[model.variables])
+    compact_phat = model.final_result.predict(compact_valid[model.variables])
+    assert np.max(np.abs(compact_phat - default_phat)) <= COMPACT_PHAT_TOLERANCE
+
+
+def test_partial_fit_matches_fit_transform(data_preprocessor, data_splitter):
+    data_splitter.split_data(create_test_set=True)
+    columns = (
+        data_preprocessor.columns_to_convert,
+        data_preprocessor.columns_to_impute,
+        data_preprocessor.columns_to_dummy,
+    )
+    full = DataPreprocessor(*columns)
+    full.fit_transform(data_splitter.X_train.copy())
+    streamed = DataPreprocessor(*columns)
+    X_train = data_splitter.X_train.astype({"x5": object, "x31": object})
+    for start in range(0, len(X_train), 150):
+        streamed.partial_fit(X_train.iloc[start:][:150].copy())
+    streamed.finalize()
+
+    assert streamed.dummy_columns == full.dummy_columns
+    np.testing.assert_allclose(streamed.imputer.statistics_, full.imputer.statistics_)
+    np.testing.assert_allclose(streamed.scaler.scale_, full.scaler.scale_)
+    pd.testing.assert_frame_equal(
+        streamed.transform(data_splitter.X_valid.copy()),
+        full.transform(data_splitter.X_valid.copy()),
+    )
+
+
+def test_sparse_transform(data_preprocessor, data_splitter):
+    data_splitter.split_data(create_test_set=True)
+    columns = (
+        data_preprocessor.columns_to_convert,
+        data_preprocessor.columns_to_impute,
+        data_preprocessor.columns_to_dummy,
+    )
+    sparse = DataPreprocessor(*columns, sparse=True)
+    default = DataPreprocessor(*columns)
+    sparse.fit_transform(data_splitter.X_train.copy())
+    default.fit_transform(data_splitter.X_train.copy())
+    design = sparse.transform(data_splitter.X_valid.copy())
+    expected = default.transform(data_splitter.X_valid.copy())
+
+    assert isinstance(design, SparseDesign)
+    assert design.columns == list(expected.columns)
+    selected = ["x5_monday", "x0", "x81_March"]
+    np.testing.assert_allclose(design[selected], expected[selected])
+    matrix, names = design.to_csr()
+    assert names == list(expected.columns)
+    np.testing.assert_allclose(matrix.toarray(), expected.to_numpy(dtype=float))
+
+
+def test_lookup_encoding_matches_get_dummies(data_preprocessor, data_splitter):
+    data_splitter.split_data(create_test_set=True)
+    preprocessor = DataPreprocessor(
+        data_preprocessor.columns_to_convert,
+        data_preprocessor.columns_to_impute,
+        data_preprocessor.columns_to_dummy,
+    )
+    train = data_splitter.X_train.copy()
+    transformed = preprocessor.fit_transform(train)
+    for col in preprocessor.columns_to_dummy:
+        expected = pd.get_dummies(
+            train[col], drop_first=True, prefix=col, prefix_sep="_", dummy_na=True
+        )
+        assert preprocessor.dummy_columns[col] == expected.columns.tolist()
+        np.testing.assert_array_equal(
+            transformed[expected.columns].to_numpy(), expected.to_numpy()
+        )
+
+
+def test_lookup_encoding_single_row(data_preprocessor, data_splitter):
+    data_splitter.split_data(create_test_set=True)
+    preprocessor = DataPreprocessor(
+        data_preprocessor.columns_to_convert,
+        data_preprocessor.columns_to_impute,
+        data_preprocessor.columns_to_dummy,
+    )
+    preprocessor.fit_transform(data_splitter.X_train.copy())
+    batch = preprocessor.transform(data_splitter.X_valid.copy())
+    single = preprocessor.transform(data_splitter.X_valid.head(1).copy())
+    pd.testing.assert_frame_equal(single, batch.head(1))
+
+    unseen = data_splitter.X_valid.head(1).copy()
+    unseen["x31"] = "atlantis"
+    encoded = preprocessor.transform(unseen)
+    assert encoded[preprocessor.dummy_columns["x31"]].to_numpy().sum() == 0
+
+
+def test_parse_formatted_numbers():
+    values = pd.Series(["$1,234.50", "($3.00)", "12.5%", None, np.nan, 7.0, "abc"])
+    parsed = parse_formatted_numbers(values)
+    np.testing.assert_array_equal(
+        parsed.to_numpy(), [1234.5, -3.0, 12.5, np.nan, np.nan, 7.0, np.nan]
+    )
+    assert parse_formatted_numbers(pd.Series([None], dtype=object)).isna().all()
+    assert parse_formatted_numbers(pd.Series([1.5, None], dtype=object))[0] == 1.5
+
+
+def test_convert_columns_handles_null_rows_and_rejects_garbage(data_preprocessor):
+    single = pd.DataFrame({"x12": [None], "x63": [None]}, dtype=object)
+    converted = data_preprocessor._convert_columns(single)
+    assert converted.dtypes.tolist() == [np.float64, np.float64]
+    assert converted.isna().all().all()
+
+    with pytest.raises(ValueError, match="x12"):
+        data_preprocessor._convert_columns(
+            pd.DataFrame({"x12": ["$1.00", "$1x"], "x63": ["1%", "2%"]})
+        )
+
+
+def test_lookup_rebuilt_for_old_pickles(data_preprocessor):
+    preprocessor = DataPreprocessor(
+        data_preprocessor.columns_to_convert,
+        data_preprocessor.columns_to_impute,
+        data_preprocessor.columns_to_dummy,
+    )
+    preprocessor.dummy_columns = {"x82": ["x82_Male", "x82_nan"]}
+    state = preprocessor.__dict__.copy()
+    del state["dummy_lookup"]
+    restored = DataPreprocessor.__new__(DataPreprocessor)
+    restored.__setstate__(state)
+    categories, nan_position = restored.dummy_lookup["x82"]
+    assert categories.tolist() == ["Male"]
+    assert nan_position == 1
+
+
+def test_source_columns(data_preprocessor):
+    preprocessor = DataPreprocessor(
+        data_preprocessor.columns_to_convert,
+        data_preprocessor.columns_to_impute,
+        data_preprocessor.columns_to_dummy,
+    )
+    preprocessor.dummy_columns = {"x5": ["x5_monday", "x5_nan"], "x82": ["x82_Male"]}
+    assert preprocessor.source_columns(["x5_nan", "x12", "x5_monday", "x82_Male"]) == [
+        "x5",
+        "x12",
+        "x82",
+    ]
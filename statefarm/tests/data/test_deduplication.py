@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+from statefarm.data.deduplication import deduplicate_rows
+
+
+def test_deduplicate_rows_scatters_back():
+    df = pd.DataFrame(
+        {
+            "x0": [1.0, 2.0, 1.0, 3.0, 2.0],
+            "x5": ["monday", None, "monday", "friday", None],
+            "x7": [9.0, 8.0, 7.0, 6.0, 5.0],
+        }
+    )
+    positions, inverse = deduplicate_rows(df, ["x0", "x5"])
+    np.testing.assert_array_equal(positions, [0, 1, 3])
+    np.testing.assert_array_equal(inverse, [0, 1, 0, 2, 1])
+    scores = df["x0"].to_numpy()[positions] * 10
+    np.testing.assert_array_equal(scores[inverse], df["x0"].to_numpy() * 10)
+
+
+def test_deduplicate_rows_all_distinct():
+    df = pd.DataFrame({"x0": [3.0, 1.0, 2.0]})
+    positions, inverse = deduplicate_rows(df)
+    np.testing.assert_array_equal(positions, [0, 1, 2])
+    np.testing.assert_array_equal(inverse, [0, 1, 2])
+
+
+def test_deduplicate_rows_survives_hash_collisions(monkeypatch):
+    df = pd.DataFrame(
+        {
+            "x0": [1.0, 2.0, 1.0, np.nan, 2.0, np.nan],
+            "x5": ["monday", "monday", "monday", None, "friday", None],
+        }
+    )
+    monkeypatch.setattr(
+        pd.util,
+        "hash_pandas_object",
+        lambda frame, index: pd.Series(np.zeros(len(frame), dtype="uint64")),
+    )
+    positions, inverse = deduplicate_rows(df)
+    np.testing.assert_array_equal(positions, [0, 1, 3, 4])
+    np.testing.assert_array_equal(inverse, [0, 1, 0, 2, 3, 2])
@@ -0,0 +1,67 @@
+import os
+
+import numpy as np
+import pandas as pd
+from statefarm.data.data_preparation import DataPreprocessor
+from statefarm.data.snapshot import load_csv, snapshot_csv
+
+
+def test_load_csv_matches_read_csv(tmp_path):
+    path = tmp_path / "rows.csv"
+    pd.DataFrame(
+        {
+            "x0": [0.5, np.nan, 2.0],
+            "x5": ["monday", None, "friday"],
+            "x12": ["$1,000.00", "$(5.00)", None],
+            "y": [1, 0, 1],
+        }
+    ).to_csv(path, index=False)
+
+    df = load_csv(str(path))
+    expected = pd.read_csv(path)
+    assert list(df.columns) == list(expected.columns)
+    pd.testing.assert_series_equal(df["x5"], expected["x5"])
+    pd.testing.assert_series_equal(df["x12"], expected["x12"])
+    pd.testing.assert_series_equal(df["x0"], expected["x0"])
+    pd.testing.assert_series_equal(df["y"], expected["y"])
+
+    df.loc[0, "x0"] = 99.0
+    assert load_csv(str(path))["x0"][0] == 0.5
+
+    categorical = load_csv(str(path), dtypes={"x5": "category", "x12": "object"})
+    assert categorical["x5"].dtype == "category"
+    assert categorical["x5"].tolist()[::2] == ["monday", "friday"]
+    assert pd.isna(categorical["x5"][1])
+
+
+def test_split_frames_encode_like_read_csv(tmp_path):
+    path = tmp_path / "rows.csv"
+    pd.DataFrame(
+        {
+            "x0": [0.5, 1.5, 2.5, 3.5],
+            "x5": ["monday", "friday", "sunday", None],
+            "x12": ["$1.00", "$2.00", "$3.00", "$4.00"],
+        }
+    ).to_csv(path, index=False)
+
+    def dummies(df):
+        # Only the first rows, so "sunday" is a value outside the split.
+        preprocessor = DataPreprocessor(["x12"], ["x0"], ["x5"])
+        return preprocessor.fit_transform(df.head(2).copy())
+
+    pd.testing.assert_frame_equal(
+        dummies(load_csv(str(path))), dummies(pd.read_csv(path))
+    )
+
+
+def test_snapshot_is_replaced_when_the_csv_changes(tmp_path):
+    path = tmp_path / "rows.csv"
+    pd.DataFrame({"x0": [1.0]}).to_csv(path, index=False)
+    first = snapshot_csv(str(path))
+    assert snapshot_csv(str(path)) == first
+
+    pd.DataFrame({"x0": [1.0, 2.0]}).to_csv(path, index=False)
+    second = snapshot_csv(str(path))
+    assert second != first
+    assert not os.path.exists(first)
+    assert load_csv(str(path))["x0"].tolist() == [1.0, 2.0]
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from statefarm.data.data_preparation import parse_formatted_numbers
+from statefarm.data.snapshot import load_csv
+from statefarm.data.synthetic import SyntheticDataGenerator
+
+
+def test_sample_follows_training_schema(sample_dataframe):
+    generator = SyntheticDataGenerator.fit(sample_dataframe)
+    synthetic = generator.sample(20000, np.random.default_rng(0))
+
+    assert list(synthetic.columns) == list(sample_dataframe.columns)
+    for column in ("x5", "x31", "x81", "x82"):
+        seen = set(sample_dataframe[column].dropna().astype(str))
+        assert set(synthetic[column].dropna()) <= seen
+    assert (
+        synthetic["x12"]
+        .dropna()
+        .str.match(r"^\$(\(\d{1,3}(,\d{3})*\.\d{2}\)|\d{1,3}(,\d{3})*\.\d{2})$")
+        .all()
+    )
+    assert synthetic["x63"].dropna().str.match(r"^-?\d+\.\d{2}%$").all()
+    for column in ("x12", "x63"):
+        present = synthetic[column].dropna()
+        assert parse_formatted_numbers(present).notna().all()
+
+    missing = synthetic.isna().mean() - sample_dataframe.isna().mean()
+    assert missing.abs().max() < 0.01
+    assert set(synthetic["y"].unique()) <= {0, 1}
+    assert abs(synthetic["y"].mean() - sample_dataframe["y"].mean()) < 0.02
+    assert abs(synthetic["x0"].median() - sample_dataframe["x0"].median()) < 0.1
+
+
+def test_write_csv_streams_chunks(sample_dataframe, tmp_path):
+    generator = SyntheticDataGenerator.fit(sample_dataframe)
+    path = generator.write_csv(str(tmp_path / "synthetic.csv"), 2500, chunk_rows=1000)
+
+    written = load_csv(path)
+    assert written.shape == (2500, sample_dataframe.shape[1])
+    assert written.dtypes.equals(sample_dataframe.dtypes)
+    assert not (tmp_path / "synthetic.csv.tmp").exists()
+
+    # Chunking does not change the rows drawn for a seed.
+    chunks = list(generator.iter_chunks(2500, chunk_rows=1000))
+    assert [len(chunk) for chunk in chunks] == [1000, 1000, 500]
+    again = pd.concat(generator.iter_chunks(2500, chunk_rows=1000), ignore_index=True)
+    pd.testing.assert_frame_equal(again, pd.concat(chunks, ignore_index=True))
@@ -1,6 +1,10 @@
 import unittest
 from unittest.mock import patch, MagicMock
+import numpy as np
 import pandas as pd
+import scipy.sparse as sp
+import statsmodels.api as sm
+from statefarm.data.data_preparation import SparseDesign
 from statefarm.modeling.models import (
     LogisticRegressionAnalysis,
 )  # Replace with the actual import
@@ -20,6 +24,23 @@ class TestLogisticRegressionAnalysis(unittest.TestCase):
         MockLR.assert_called_once()
         mock_lr_instance.fit.assert_called_once()
 
+    def test_fit_exploratory_model_sparse(self):
+        rng = np.random.default_rng(13)
+        numeric = pd.DataFrame({"x1": rng.normal(size=200)})
+        dummies = sp.csr_matrix(np.eye(4)[rng.integers(0, 4, 200)])
+        numeric["y"] = (numeric["x1"] + dummies.toarray()[:, 0] > 0.5).astype(int)
+        design = SparseDesign(numeric, dummies, ["d_a", "d_b", "d_c", "d_d"])
+        dense = design[["x1", "d_a", "d_b", "d_c", "d_d", "y"]]
+
+        sparse_variables = LogisticRegressionAnalysis().fit_exploratory_model(
+            design, "y", top_k=3
+        )
+        dense_variables = LogisticRegressionAnalysis().fit_exploratory_model(
+            dense, "y", top_k=3
+        )
+
+        self.assertEqual(sparse_variables, dense_variables)
+
     @patch("statefarm.modeling.models.sm.Logit")
     def test_fit_final_model(self, MockLogit):
         analysis = LogisticRegressionAnalysis()
@@ -47,6 +68,45 @@ class TestLogisticRegressionAnalysis(unittest.TestCase):
         self.assertTrue("prob_bin" in outcomes.columns)
         self.assertEqual(len(grouped_outcomes), 20)
 
+    def test_update_final_model_tracks_refit(self):
+        rng = np.random.default_rng(13)
+        df = pd.DataFrame(rng.normal(size=(6000, 3)), columns=["x1", "x2", "x3"])
+        logits = df.to_numpy() @ np.array([0.8, -0.5, 0.2])
+        df["y"] = (rng.random(len(df)) < 1 / (1 + np.exp(-logits))).astype(int)
+
+        analysis = LogisticRegressionAnalysis()
+        analysis.variables = ["x1", "x2", "x3"]
+        history = df.iloc[:3000]
+        analysis.final_result = sm.Logit(history["y"], history[analysis.variables]).fit(
+            disp=0
+        )
+        for start in range(3000, len(df), 1000):
+            analysis.update_final_model(df.iloc[start:][:1000], "y")
+
+        drift = analysis.coefficient_drift(df, "y")
+        self.assertLess(drift["difference_se"].abs().max(), 0.1)
+        self.assertEqual(analysis.information.shape, (3, 3))
+        np.testing.assert_allclose(
+            analysis.cov_params, np.linalg.inv(analysis.information)
+        )
+        np.testing.assert_allclose(
+            analysis.final_result.predict(df[analysis.variables].head(2)),
+            1 / (1 + np.exp(-df[analysis.variables].head(2) @ drift["current"])),
+        )
+
+        # A refit starts from its own covariance, not the updates' information.
+        analysis.fit_final_model(history, "y", disp=False)
+        self.assertIsNone(analysis.information)
+        analysis.update_final_model(df.iloc[3000:4000], "y")
+        refit = sm.Logit(history["y"], history[analysis.variables]).fit(disp=0)
+        chunk = df.iloc[3000:4000][analysis.variables].to_numpy()
+        phat = 1 / (1 + np.exp(-chunk @ analysis.final_result.params.to_numpy()))
+        np.testing.assert_allclose(
+            analysis.information,
+            np.linalg.inv(refit.cov_params())
+            + (chunk * (phat * (1 - phat))[:, None]).T @ chunk,
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
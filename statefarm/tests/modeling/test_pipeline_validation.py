@@ -0,0 +1,61 @@
+import numpy as np
+
+from statefarm.modeling.validation import (
+    calibration_metrics,
+    validate_pipeline,
+    validation_tasks,
+)
+
+
+def test_calibration_metrics():
+    rng = np.random.default_rng(0)
+    phat = rng.uniform(0.01, 0.99, 200000)
+    y = rng.random(len(phat)) < phat
+
+    calibrated = calibration_metrics(y, phat)
+    assert abs(calibrated["calibration_slope"] - 1) < 0.03
+    assert abs(calibrated["calibration_in_the_large"]) < 0.01
+    assert calibrated["ece"] < 0.01
+    assert 0.5 < calibrated["auc"] < 1
+
+    # Scores pushed towards 0 and 1 are overconfident: the slope drops below 1.
+    logit = np.log(phat / (1 - phat))
+    extreme = calibration_metrics(y, 1 / (1 + np.exp(-2 * logit)))
+    assert abs(extreme["calibration_slope"] - 0.5) < 0.03
+    assert extreme["ece"] > calibrated["ece"]
+
+
+def test_validation_tasks():
+    y = np.array([0, 1] * 50)
+    tasks = validation_tasks(y, folds=5, bootstraps=3, seed=1)
+    cv = [task for task in tasks if task[0] == "cv"]
+    bootstrap = [task for task in tasks if task[0] == "bootstrap"]
+    assert len(cv) == 5 and len(bootstrap) == 3
+
+    held_out = np.sort(np.concatenate([task[3] for task in cv]))
+    np.testing.assert_array_equal(held_out, np.arange(len(y)))
+    for _, _, train_rows, eval_rows in cv:
+        assert not set(train_rows) & set(eval_rows)
+        assert y[eval_rows].mean() == 0.5
+    for _, _, train_rows, eval_rows in bootstrap:
+        assert len(train_rows) == len(y)
+        assert not set(train_rows) & set(eval_rows) and len(eval_rows)
+
+
+def test_validate_pipeline_in_parallel(sample_dataframe, tmp_path):
+    path = str(tmp_path / "train.csv")
+    sample_dataframe.to_csv(path, index=False)
+
+    summary, replicates = validate_pipeline(
+        path, folds=3, bootstraps=2, workers=2, top_k=10
+    )
+    assert len(replicates) == 5
+    assert set(summary.index.get_level_values("method")) == {"cv", "bootstrap"}
+    auc = summary.xs("auc", level="metric")
+    assert (auc["lower"] <= auc["estimate"]).all()
+    assert (auc["estimate"] <= auc["upper"]).all()
+    assert (auc["estimate"] > 0.6).all()
+
+    _, inline = validate_pipeline(path, folds=3, bootstraps=2, workers=1, top_k=10)
+    metrics = ["auc", "brier", "calibration_slope"]
+    np.testing.assert_allclose(inline[metrics], replicates[metrics])
@@ -0,0 +1,159 @@
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+from statefarm.app.drift import DriftMonitor, build_profile
+
+
+def reference(scorer, df):
+    design = scorer.preprocessor.transform(df.copy())[scorer.variables]
+    return np.asarray(scorer.model.final_result.predict(design))
+
+
+def test_score_batch_matches_model_predict(scorer, sample_dataframe):
+    df = sample_dataframe.drop(columns=["y"])
+    before = df.copy()
+    ratios = []
+    scorer.dedup_observer = ratios.append
+
+    phat, business_outcome = scorer.score_batch(df)
+
+    np.testing.assert_allclose(phat, reference(scorer, df), rtol=1e-12)
+    np.testing.assert_array_equal(business_outcome, (phat >= 0.75).astype(int))
+    pd.testing.assert_frame_equal(df, before)
+    assert ratios == [0]
+    scorer.dedup_observer = None
+
+
+def test_score_batch_scores_duplicates_once(scorer, sample_dataframe):
+    df = sample_dataframe.drop(columns=["y"]).head(50)
+    doubled = pd.concat([df, df.iloc[::-1]], ignore_index=True)
+    ratios = []
+    scorer.dedup_observer = ratios.append
+
+    phat, _ = scorer.score_batch({column: doubled[column] for column in doubled})
+
+    np.testing.assert_allclose(phat[:50], phat[50:][::-1])
+    assert ratios == [0.5]
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        np.testing.assert_allclose(scorer.score_batch(doubled, copy=False)[0], phat)
+    # The distinct rows are a copy the preprocessor may convert in place.
+    assert not [w for w in caught if w.category.__name__ == "SettingWithCopyWarning"]
+    scorer.dedup_observer = None
+
+
+def test_score_batch_checkpoint_can_stop_between_chunks(scorer, sample_dataframe):
+    df = sample_dataframe.drop(columns=["y"])
+    left = []
+
+    def checkpoint(rows):
+        left.append(rows)
+        if len(left) == 2:
+            raise TimeoutError(rows)
+
+    with pytest.raises(TimeoutError):
+        scorer.score_batch(df, checkpoint)
+    assert left == [len(df), len(df) - scorer.chunk_rows]
+
+
+def test_score_one_and_score_iter(scorer, sample_dataframe):
+    df = sample_dataframe.drop(columns=["y"])
+    expected = reference(scorer, df)
+
+    for position in [0, int(np.flatnonzero(df["x12"].isna())[0])]:
+        row = scorer.score_one(df.iloc[position].to_dict())
+        assert row["phat"] == pytest.approx(expected[position], rel=1e-9)
+        assert row["business_outcome"] == int(expected[position] >= 0.75)
+
+    chunks = [df.iloc[:100], df.iloc[100:250], df.iloc[250:]]
+    phat = np.concatenate([phat for phat, _ in scorer.score_iter(chunks)])
+    np.testing.assert_allclose(phat, expected, rtol=1e-12)
+
+
+def test_scorer_is_safe_to_share_between_threads(scorer, sample_dataframe):
+    df = sample_dataframe.drop(columns=["y"])
+    expected = reference(scorer, df)
+    slices = [df.iloc[offset:][:150] for offset in range(0, len(df), 50)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda part: scorer.score_batch(part)[0], slices))
+
+    for offset, phat in zip(range(0, len(df), 50), results):
+        np.testing.assert_allclose(phat, expected[offset:][:150], rtol=1e-12)
+
+
+def test_score_batch_feeds_drift_monitor_once_per_request_row(scorer, sample_dataframe):
+    df = sample_dataframe.drop(columns=["y"]).head(50)
+    doubled = pd.concat([df, df], ignore_index=True)
+    converted = scorer.preprocessor._convert_columns(df.copy())
+    phat, _ = scorer.score_batch(df)
+    monitor = DriftMonitor(build_profile(converted, ["x1", "x12"], ["x5"], phat))
+    scorer.drift_monitor = monitor
+
+    scorer.score_batch(doubled)
+
+    assert monitor.rows == 100
+    assert monitor.psi("x12") < 1e-9
+    assert monitor.psi("phat") < 1e-9
+    scorer.drift_monitor = None
+
+
+def test_drift_monitor_sees_rows_that_differ_outside_the_model(
+    scorer, sample_dataframe
+):
+    df = sample_dataframe.drop(columns=["y"])
+    assert "x0" not in scorer.source_columns
+    converted = scorer.preprocessor._convert_columns(df.copy())
+    phat, _ = scorer.score_batch(df)
+    monitor = DriftMonitor(build_profile(converted, ["x0"], [], phat))
+    # Identical on the model's inputs, different on a profiled column it does not use.
+    same_inputs = pd.concat([df.head(1)] * len(df), ignore_index=True)
+    same_inputs["x0"] = df["x0"].to_numpy()
+    scorer.drift_monitor = monitor
+
+    scorer.score_batch(same_inputs)
+
+    assert monitor.rows == len(df)
+    assert monitor.psi("x0") < 1e-9
+    scorer.drift_monitor = None
+
+
+def test_explain_batch_returns_top_contributions(scorer, sample_dataframe):
+    df = sample_dataframe.drop(columns=["y"]).head(200)
+    doubled = pd.concat([df, df], ignore_index=True)
+    design = scorer.preprocessor.transform(df.copy())[scorer.variables]
+    contributions = np.asarray(design, dtype=np.float64) * scorer.params
+
+    phat, business_outcome, names, top = scorer.explain_batch(doubled, top_k=2)
+
+    np.testing.assert_allclose(phat, scorer.score_batch(doubled)[0], rtol=1e-12)
+    np.testing.assert_array_equal(business_outcome, (phat >= 0.75).astype(int))
+    assert names.shape == top.shape == (400, 2)
+    expected = -np.sort(-np.abs(contributions), axis=1)[:, :2]
+    np.testing.assert_allclose(np.abs(top[:200]), expected, rtol=1e-12)
+    np.testing.assert_array_equal(names[:200], names[200:])
+    positions = [scorer.variables.index(name) for name in names[:200, 0]]
+    np.testing.assert_allclose(
+        top[:200, 0], contributions[np.arange(200), positions], rtol=1e-12
+    )
+
+    everything = scorer.explain_batch(df, top_k=100)[3]
+    np.testing.assert_allclose(
+        1 / (1 + np.exp(-everything.sum(axis=1))), phat[:200], rtol=1e-9
+    )
+
+
+def test_score_one_explains_on_request(scorer, sample_dataframe):
+    row = sample_dataframe.drop(columns=["y"]).dropna(subset=["x12", "x63"]).iloc[0]
+
+    plain = scorer.score_one(row.to_dict())
+    explained = scorer.score_one(row.to_dict(), top_k=3)
+
+    assert "explanation" not in plain
+    assert explained["phat"] == plain["phat"]
+    assert len(explained["explanation"]) == 3
+    magnitudes = [abs(value) for value in explained["explanation"].values()]
+    assert magnitudes == sorted(magnitudes, reverse=True)
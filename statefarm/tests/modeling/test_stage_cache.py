@@ -0,0 +1,98 @@
+import os
+import time
+import tracemalloc
+
+import numpy as np
+
+from statefarm.modeling.stage_cache import StageCache
+
+
+def build(directory, calls, scale, max_entries=2):
+    cache = StageCache(directory and str(directory), max_entries=max_entries)
+
+    def load():
+        calls.append("load")
+        return [1, 2, 3]
+
+    def scaled():
+        values = load_stage.value
+        calls.append("scale")
+        return [value * scale for value in values]
+
+    load_stage = cache.stage("load", load, {}, ["data-v1"])
+    scale_stage = cache.stage("scale", scaled, {"scale": scale}, [load_stage])
+    return cache, scale_stage
+
+
+def test_unchanged_stages_are_skipped(tmp_path):
+    calls = []
+    cache, stage = build(tmp_path, calls, 2)
+    assert stage.value == [2, 4, 6]
+    assert calls == ["load", "scale"]
+    assert cache.report()["status"].tolist() == ["miss", "miss"]
+
+    calls.clear()
+    cache, stage = build(tmp_path, calls, 2)
+    assert stage.value == [2, 4, 6]
+    assert calls == []
+    assert cache.report()["status"].tolist() == ["skipped", "hit"]
+
+    cache, stage = build(tmp_path, calls, 3)
+    assert stage.value == [3, 6, 9]
+    assert calls == ["scale"]
+    assert cache.report()["status"].tolist() == ["hit", "miss"]
+
+
+def test_stale_entries_are_evicted(tmp_path):
+    for scale in (1, 2, 3):
+        build(tmp_path, [], scale, max_entries=2)[1].value
+    entries = [name for name in os.listdir(tmp_path) if name.startswith("scale-")]
+    assert len(entries) == 2
+
+
+def test_no_directory_runs_every_stage():
+    calls = []
+    cache, stage = build(None, calls, 2)
+    assert stage.value == [2, 4, 6]
+    assert calls == ["load", "scale"]
+
+
+def test_stages_report_their_own_time_and_peak_memory():
+    cache = StageCache(trace_memory=True)
+
+    def load():
+        time.sleep(0.05)
+        return np.ones(2_000_000)
+
+    def total():
+        values = load_stage.value
+        time.sleep(0.02)
+        return float(np.ones(500_000).sum() + values.sum())
+
+    load_stage = cache.stage("load", load, {})
+    total_stage = cache.stage("total", total, {}, [load_stage])
+    assert total_stage.value == 2_500_000
+    assert not tracemalloc.is_tracing()
+
+    report = cache.report()
+    assert report.loc["load", "seconds"] >= 0.05
+    assert 0.02 <= report.loc["total", "seconds"] < 0.05
+    assert report.loc["load", "peak_mb"] >= 16
+    # The loaded array was allocated by the upstream stage, not by ``total``.
+    assert 4 <= report.loc["total", "peak_mb"] < 16
+    untraced, _ = build(None, [], 2)
+    untraced.stages[-1].value
+    assert "peak_mb" not in untraced.report().columns
+
+    # A tracer started by someone else is left alone, and no peaks are recorded.
+    traced, _ = build(None, [], 2)
+    traced.trace_memory = True
+    tracemalloc.start()
+    try:
+        kept = np.ones(1_000_000)
+        traced.stages[-1].value
+        # Restarting the tracer would have forgotten the array allocated before the stages.
+        assert tracemalloc.get_traced_memory()[0] >= kept.nbytes
+    finally:
+        tracemalloc.stop()
+    assert "peak_mb" not in traced.report().columns